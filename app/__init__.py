@@ -4,147 +4,51 @@ from flask_migrate import Migrate
 from flask_jwt_extended import JWTManager
 from flask_cors import CORS
 from config import Config
-from flasgger import Swagger
+from app.utils.json_provider import FastJSONProvider
+from app.utils.database import configure_engine_options, install_sqlite_pragmas
+from app.utils.replicas import RoutingSession, configure_replica_binds, init_replica_routing
+from app.utils.compression import init_compression
+from app.utils.http_cache import init_cache_control
+from app.utils.metrics import init_metrics
+from app.utils.profiling import init_profiling
+from app.utils.query_counter import init_query_counter
+from app.utils.wsgi import SlashNormalizer
 
 # Initialize extensions
-db = SQLAlchemy()
+db = SQLAlchemy(session_options={'class_': RoutingSession})
 migrate = Migrate()
 jwt = JWTManager()
 
 def create_app(config_class=Config):
     app = Flask(__name__)
     app.config.from_object(config_class)
+    app.json = FastJSONProvider(app)
     
     # Initialize extensions with app
+    configure_engine_options(app)
+    configure_replica_binds(app)
     db.init_app(app)
+    with app.app_context():
+        for engine in db.engines.values():
+            install_sqlite_pragmas(app, engine)
     migrate.init_app(app, db)
     jwt.init_app(app)
     CORS(app)
+    init_compression(app)
+    init_metrics(app)
+    init_query_counter(app)
+    init_profiling(app)
+    # after_request hooks run in reverse order: registering Cache-Control first
+    # lets it see the sticky-primary cookie set by replica routing
+    init_cache_control(app)
+    init_replica_routing(app)
     
-    @app.before_request
-    def remove_double_slashes():
-        from flask import request, redirect
-        import re
-        # Normalize URL path by replacing multiple slashes with a single slash
-        normalized_path = re.sub(r'/{2,}', '/', request.path)
-        if normalized_path != request.path:
-            # Preserve query string if present
-            query_string = request.query_string.decode('utf-8')
-            new_url = normalized_path
-            if query_string:
-                new_url += '?' + query_string
-            return redirect(new_url, code=301)
+    app.wsgi_app = SlashNormalizer(app.wsgi_app)
     
-    # Configure Swagger
-    swagger_config = {
-        "headers": [],
-        "specs": [
-            {
-                "endpoint": 'apispec',
-                "route": '/apispec.json',
-                "rule_filter": lambda rule: True,  # all in
-                "model_filter": lambda tag: True,  # all in
-            }
-        ],
-        "static_url_path": "/flasgger_static",
-        "swagger_ui": True,
-        "specs_route": "/docs"
-    }
-    
-    swagger_template = {
-        "swagger": "2.0",
-        "info": {
-            "title": "Spacer API",
-            "description": "API for managing space bookings",
-            "version": "1.0.0"
-        },
-        "securityDefinitions": {
-            "BearerAuth": {
-                "type": "apiKey",
-                "name": "Authorization",
-                "in": "header"
-            }
-        },
-        "components": {
-            "schemas": {
-                "User": {
-                    "type": "object",
-                    "properties": {
-                        "id": {"type": "integer", "example": 1},
-                        "email": {"type": "string", "example": "user@example.com"},
-                        "first_name": {"type": "string", "example": "John"},
-                        "last_name": {"type": "string", "example": "Doe"},
-                        "name": {"type": "string", "example": "John Doe"},
-                        "role": {"type": "string", "enum": ["admin", "owner", "client"], "example": "client"},
-                        "phone": {"type": "string", "example": "254712345678"},
-                        "bio": {"type": "string", "example": "Software developer"},
-                        "avatar_url": {"type": "string", "example": "https://example.com/avatar.jpg"},
-                        "is_verified": {"type": "boolean", "example": True},
-                        "created_at": {"type": "string", "format": "date-time"},
-                        "updated_at": {"type": "string", "format": "date-time"}
-                    }
-                },
-                "Space": {
-                    "type": "object",
-                    "properties": {
-                        "id": {"type": "integer", "example": 1},
-                        "name": {"type": "string", "example": "Conference Room"},
-                        "description": {"type": "string", "example": "Spacious room for meetings"},
-                        "address": {"type": "string", "example": "123 Main St"},
-                        "city": {"type": "string", "example": "Nairobi"},
-                        "price_per_hour": {"type": "number", "example": 100.0},
-                        "capacity": {"type": "integer", "example": 20},
-                        "is_available": {"type": "boolean", "example": True},
-                        "owner_id": {"type": "integer", "example": 1},
-                        "images": {
-                            "type": "array",
-                            "items": {
-                                "type": "object",
-                                "properties": {
-                                    "id": {"type": "integer", "example": 1},
-                                    "image_url": {"type": "string", "example": "https://example.com/space.jpg"},
-                                    "is_primary": {"type": "boolean", "example": True}
-                                }
-                            }
-                        },
-                        "created_at": {"type": "string", "format": "date-time"},
-                        "updated_at": {"type": "string", "format": "date-time"}
-                    }
-                },
-                "Booking": {
-                    "type": "object",
-                    "properties": {
-                        "id": {"type": "integer", "example": 1},
-                        "space_id": {"type": "integer", "example": 1},
-                        "user_id": {"type": "integer", "example": 1},
-                        "start_time": {"type": "string", "format": "date-time"},
-                        "end_time": {"type": "string", "format": "date-time"},
-                        "total_price": {"type": "number", "example": 200.0},
-                        "purpose": {"type": "string", "example": "Team meeting"},
-                        "status": {"type": "string", "enum": ["pending", "confirmed", "cancelled", "completed"], "example": "pending"},
-                        "payment_status": {"type": "string", "enum": ["pending", "paid", "refunded"], "example": "pending"},
-                        "created_at": {"type": "string", "format": "date-time"},
-                        "updated_at": {"type": "string", "format": "date-time"}
-                    }
-                },
-                "Payment": {
-                    "type": "object",
-                    "properties": {
-                        "id": {"type": "integer", "example": 1},
-                        "booking_id": {"type": "integer", "example": 1},
-                        "amount": {"type": "number", "example": 200.0},
-                        "payment_method": {"type": "string", "enum": ["mpesa", "card", "cash"], "example": "mpesa"},
-                        "transaction_id": {"type": "string", "example": "MPESA123456789"},
-                        "status": {"type": "string", "enum": ["pending", "completed", "failed", "refunded"], "example": "completed"},
-                        "created_at": {"type": "string", "format": "date-time"},
-                        "updated_at": {"type": "string", "format": "date-time"}
-                    }
-                }
-            }
-        }
-    }
-    
-    Swagger(app, config=swagger_config, template=swagger_template)
+    # API docs; flasgger is only imported when they are enabled
+    if app.config['SWAGGER_ENABLED']:
+        from app.swagger import init_swagger
+        init_swagger(app)
     
     # Register blueprints
     from app.routes.main import main_bp
@@ -168,5 +72,16 @@ def create_app(config_class=Config):
     app.register_blueprint(reviews_bp, url_prefix='/api/reviews')
     app.register_blueprint(admin_bp, url_prefix='/api/admin')
     app.register_blueprint(emails_bp, url_prefix='/api/emails')
+    
+    if app.config['IMAGE_STORAGE_BACKEND'] == 'local':
+        from app.routes.media import media_bp
+        app.register_blueprint(media_bp, url_prefix='/media')
+    
+    from app.utils.delta_sync import init_delta_sync
+    init_delta_sync(app)
+    
+    if app.config['ASYNC_IMAGE_PROCESSING']:
+        from app.utils.image_worker import init_image_worker
+        init_image_worker(app)
 
     return app 
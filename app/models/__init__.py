@@ -1,4 +1,5 @@
 from .user import User
 from .space import Space, SpaceImage
 from .booking import Booking
-from .review import Review
\ No newline at end of file
+from .review import Review
+from .deletion_log import DeletionLog
\ No newline at end of file
@@ -6,7 +6,7 @@ class Booking(db.Model):
     
     id = db.Column(db.Integer, primary_key=True)
     space_id = db.Column(db.Integer, db.ForeignKey('spaces.id'), nullable=False)
-    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False, index=True)
     start_time = db.Column(db.DateTime, nullable=False)
     end_time = db.Column(db.DateTime, nullable=False)
     total_price = db.Column(db.Float, nullable=False)
@@ -14,7 +14,13 @@ class Booking(db.Model):
     status = db.Column(db.String(20), default='pending')  # pending, confirmed, cancelled, completed
     payment_status = db.Column(db.String(20), default='pending')  
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
-    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, index=True)
+    
+    __table_args__ = (
+        # Overlap check in create_booking; also serves lookups by space_id alone
+        db.Index('ix_bookings_space_status_time', space_id, status, start_time, end_time),
+        db.Index('ix_bookings_created_at', created_at.desc()),
+    )
     
     # Relationships
     payment = db.relationship('Payment', backref='booking', uselist=False, cascade='all, delete-orphan')
@@ -28,22 +34,22 @@ class Booking(db.Model):
             'id': self.id,
             'space_id': self.space_id,
             'user_id': self.user_id,
-            'start_time': self.start_time.isoformat(),
-            'end_time': self.end_time.isoformat(),
+            'start_time': self.start_time,
+            'end_time': self.end_time,
             'total_price': self.total_price,
             'purpose': self.purpose,
             'status': self.status,
             'payment_status': self.payment_status,
             'duration_hours': self.calculate_duration_hours(),
-            'created_at': self.created_at.isoformat(),
-            'updated_at': self.updated_at.isoformat()
+            'created_at': self.created_at,
+            'updated_at': self.updated_at
         }
 
 class Payment(db.Model):
     __tablename__ = 'payments'
     
     id = db.Column(db.Integer, primary_key=True)
-    booking_id = db.Column(db.Integer, db.ForeignKey('bookings.id'), nullable=False)
+    booking_id = db.Column(db.Integer, db.ForeignKey('bookings.id'), nullable=False, index=True)
     amount = db.Column(db.Float, nullable=False)
     payment_method = db.Column(db.String(50), nullable=False)  # mpesa, card
     transaction_id = db.Column(db.String(100), unique=True)
@@ -59,6 +65,6 @@ class Payment(db.Model):
             'payment_method': self.payment_method,
             'transaction_id': self.transaction_id,
             'status': self.status,
-            'created_at': self.created_at.isoformat(),
-            'updated_at': self.updated_at.isoformat()
+            'created_at': self.created_at,
+            'updated_at': self.updated_at
         } 
\ No newline at end of file
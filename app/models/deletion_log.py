@@ -0,0 +1,54 @@
+from datetime import datetime
+from sqlalchemy import event, insert, select
+from app import db
+from app.models.booking import Booking
+from app.models.review import Review
+from app.models.space import Space
+
+class DeletionLog(db.Model):
+    """
+    Tombstone for a deleted row, so delta sync clients can drop their copy.
+    
+    ``owner_id`` is the owner of the space the row belonged to and ``user_id``
+    the user who created it, which is what the delta endpoints scope by.
+    """
+    __tablename__ = 'deletion_log'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    table_name = db.Column(db.String(50), nullable=False)
+    row_id = db.Column(db.Integer, nullable=False)
+    owner_id = db.Column(db.Integer)
+    user_id = db.Column(db.Integer)
+    deleted_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    
+    __table_args__ = (
+        db.Index('ix_deletion_log_table_deleted_at', table_name, deleted_at),
+    )
+
+def _space_owner_id(connection, space_id):
+    spaces = Space.__table__
+    return connection.execute(select(spaces.c.owner_id).where(spaces.c.id == space_id)).scalar()
+
+def _log_deletion(connection, table_name, row_id, owner_id=None, user_id=None):
+    connection.execute(insert(DeletionLog.__table__).values(
+        table_name=table_name, row_id=row_id, owner_id=owner_id, user_id=user_id,
+        deleted_at=datetime.utcnow()
+    ))
+
+# Mapper events also see rows removed by cascade, such as the bookings of a
+# deleted space. Children are deleted before their parent, so the space row
+# is still there to look up.
+
+@event.listens_for(Space, 'after_delete')
+def log_space_deletion(mapper, connection, target):
+    _log_deletion(connection, 'spaces', target.id, owner_id=target.owner_id)
+
+@event.listens_for(Booking, 'after_delete')
+def log_booking_deletion(mapper, connection, target):
+    _log_deletion(connection, 'bookings', target.id,
+                  owner_id=_space_owner_id(connection, target.space_id), user_id=target.user_id)
+
+@event.listens_for(Review, 'after_delete')
+def log_review_deletion(mapper, connection, target):
+    _log_deletion(connection, 'reviews', target.id,
+                  owner_id=_space_owner_id(connection, target.space_id), user_id=target.user_id)
@@ -5,8 +5,8 @@ class Review(db.Model):
     __tablename__ = 'reviews'
 
     id = db.Column(db.Integer, primary_key=True)
-    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
-    space_id = db.Column(db.Integer, db.ForeignKey('spaces.id'), nullable=False)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False, index=True)
+    space_id = db.Column(db.Integer, db.ForeignKey('spaces.id'), nullable=False, index=True)
     rating = db.Column(db.Integer, nullable=False)  # Rating from 1-5
     comment = db.Column(db.Text)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
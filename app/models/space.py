@@ -1,5 +1,7 @@
 from app import db
 from datetime import datetime
+from sqlalchemy import event, select, update
+from sqlalchemy.orm import Session, load_only, selectinload
 
 class Space(db.Model):
     __tablename__ = 'spaces'
@@ -11,16 +13,53 @@ class Space(db.Model):
     city = db.Column(db.String(100), nullable=False)
     price_per_hour = db.Column(db.Float, nullable=False)
     capacity = db.Column(db.Integer, nullable=False)
-    owner_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
+    owner_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False, index=True)
     is_available = db.Column(db.Boolean, default=True)
+    # Copy of the primary image's URL, kept in sync by the SpaceImage events below
+    primary_image_url = db.Column(db.String(255))
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
-    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, index=True)
     
     # Relationships
     images = db.relationship('SpaceImage', backref='space', lazy=True, cascade='all, delete-orphan')
     bookings = db.relationship('Booking', backref='space', lazy=True, cascade='all, delete-orphan')
     
-    def to_dict(self):
+    # Fields that can be requested with ?fields=, mapped to the columns they need
+    FIELD_COLUMNS = {
+        'id': ['id'],
+        'name': ['name'],
+        'description': ['description'],
+        'address': ['address'],
+        'city': ['city'],
+        'price_per_hour': ['price_per_hour'],
+        'capacity': ['capacity'],
+        'owner_id': ['owner_id'],
+        'is_available': ['is_available'],
+        'status': ['is_available'],
+        'images': [],
+        'primary_image_url': ['primary_image_url'],
+        'created_at': ['created_at'],
+        'updated_at': ['updated_at']
+    }
+    CARD_FIELDS = ['id', 'name', 'city', 'price_per_hour', 'capacity', 'primary_image_url']
+    
+    @classmethod
+    def load_options(cls, fields):
+        """Query options that load only what ``to_dict(fields)`` needs."""
+        if fields is None:
+            # The full view lists every image
+            return [selectinload(cls.images)]
+        columns = {'id'}
+        for field in fields:
+            columns.update(cls.FIELD_COLUMNS[field])
+        options = [load_only(*[getattr(cls, column) for column in sorted(columns)])]
+        if 'images' in fields:
+            options.append(selectinload(cls.images))
+        return options
+    
+    def to_dict(self, fields=None):
+        if fields is not None:
+            return {field: self._field_value(field) for field in fields}
         return {
             'id': self.id,
             'name': self.name,
@@ -33,16 +72,26 @@ class Space(db.Model):
             'is_available': self.is_available,
             'status': 'AVAILABLE' if self.is_available else 'UNAVAILABLE',
             'images': [image.to_dict() for image in self.images],
-            'created_at': self.created_at.isoformat(),
-            'updated_at': self.updated_at.isoformat()
+            'primary_image_url': self.primary_image_url,
+            'created_at': self.created_at,
+            'updated_at': self.updated_at
         }
+    
+    def _field_value(self, field):
+        if field == 'status':
+            return 'AVAILABLE' if self.is_available else 'UNAVAILABLE'
+        if field == 'images':
+            return [image.to_dict() for image in self.images]
+        return getattr(self, field)
 
 class SpaceImage(db.Model):
     __tablename__ = 'space_images'
     
     id = db.Column(db.Integer, primary_key=True)
-    space_id = db.Column(db.Integer, db.ForeignKey('spaces.id'), nullable=False)
-    image_url = db.Column(db.String(255), nullable=False)
+    space_id = db.Column(db.Integer, db.ForeignKey('spaces.id'), nullable=False, index=True)
+    image_url = db.Column(db.String(255))  # None while the upload is processing
+    content_hash = db.Column(db.String(64), index=True)  # SHA-256 of the uploaded file
+    status = db.Column(db.String(20), nullable=False, default='ready')  # processing, ready, failed
     is_primary = db.Column(db.Boolean, default=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     
@@ -51,8 +100,64 @@ class SpaceImage(db.Model):
             'id': self.id,
             'space_id': self.space_id,
             'image_url': self.image_url,
+            'status': self.status,
             'is_primary': self.is_primary,
-            'created_at': self.created_at.isoformat()
-        } 
+            'created_at': self.created_at
+        }
+
+def primary_image_url_subquery(space_id_column):
+    """URL of the first ready primary image of the space in ``space_id_column``."""
+    images = SpaceImage.__table__
+    return (
+        select(images.c.image_url)
+        .where(
+            images.c.space_id == space_id_column,
+            images.c.is_primary.is_(True),
+            images.c.image_url.isnot(None)
+        )
+        .order_by(images.c.id)
+        .limit(1)
+        .scalar_subquery()
+    )
+
+@event.listens_for(SpaceImage, 'after_insert')
+@event.listens_for(SpaceImage, 'after_update')
+@event.listens_for(SpaceImage, 'after_delete')
+def sync_primary_image_url(mapper, connection, target):
+    """Recompute Space.primary_image_url in the database after any image row changes."""
+    history = db.inspect(target).attrs.space_id.history
+    space_ids = {target.space_id, *history.deleted} - {None}
+    if not space_ids:
+        return
+    spaces = Space.__table__
+    connection.execute(
+        update(spaces)
+        .where(spaces.c.id.in_(space_ids))
+        .values(primary_image_url=primary_image_url_subquery(spaces.c.id))
+    )
+    session = db.inspect(target).session
+    if session is not None:
+        session.info.setdefault('stale_primary_images', set()).update(space_ids)
+
+@event.listens_for(Session, 'after_flush_postexec')
+def expire_primary_image_urls(session, flush_context):
+    # The column was changed behind the ORM's back; reload it on next access
+    for space_id in session.info.pop('stale_primary_images', ()):
+        space = session.identity_map.get(db.inspect(Space).identity_key_from_primary_key([space_id]))
+        if space is not None:
+            session.expire(space, ['primary_image_url'])
 
-        
\ No newline at end of file
+@event.listens_for(Session, 'before_flush')
+def touch_spaces_with_changed_images(session, flush_context, instances):
+    """Bump Space.updated_at when its images change so ETags and caches see it."""
+    now = datetime.utcnow()
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        if not isinstance(obj, SpaceImage):
+            continue
+        space = obj.space or (obj.space_id and session.get(Space, obj.space_id))
+        if space is None:
+            # Removed from space.images; the old parent is in the attribute history
+            removed = db.inspect(obj).attrs.space.history.deleted
+            space = removed[0] if removed else None
+        if space is not None and space not in session.deleted:
+            space.updated_at = now
@@ -15,6 +15,6 @@ class Testimonial(db.Model):
             'id': self.id,
             'user_name': self.user_name,
             'content': self.content,
-            'created_at': self.created_at.isoformat(),
-            'updated_at': self.updated_at.isoformat()
+            'created_at': self.created_at,
+            'updated_at': self.updated_at
         }
@@ -19,6 +19,11 @@ class User(db.Model):
     phone = db.Column(db.String(20))
     bio = db.Column(db.Text)
     avatar_url = db.Column(db.String(255))
+    avatar_hash = db.Column(db.String(64), index=True)  # SHA-256 of the uploaded avatar
+    
+    __table_args__ = (
+        db.Index('ix_users_created_at', created_at.desc()),
+    )
     
     # Relationships
     spaces = db.relationship('Space', backref='owner', lazy=True)
@@ -74,8 +79,8 @@ class User(db.Model):
             'bio': self.bio,
             'avatar_url': self.avatar_url,
             'is_verified': self.is_verified,
-            'created_at': self.created_at.isoformat(),
-            'updated_at': self.updated_at.isoformat()
+            'created_at': self.created_at,
+            'updated_at': self.updated_at
         }
 
     def __repr__(self):
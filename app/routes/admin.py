@@ -1,9 +1,13 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, current_app, send_from_directory
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from app.models.user import User
 from app.models.space import Space
 from app.models.booking import Booking, Payment
 from app import db
+from app.utils.cache import get_cache
+from app.utils.exports import EXPORTS, FORMATS, export_response
+from app.utils.validators import parse_timestamp
+from app.utils.profiling import list_profiles, load_profile
 
 admin_bp = Blueprint('admin', __name__)
 
@@ -35,6 +39,15 @@ def get_stats():
       403:
         description: Admin privileges required
     """
+    stats = get_cache().get_or_set(
+        'admin-stats',
+        load_admin_stats,
+        tags=['users', 'spaces', 'bookings', 'payments'],
+        ttl=current_app.config['CACHE_STATS_TTL']
+    )
+    return jsonify(stats), 200
+
+def load_admin_stats():
     # Get user count
     total_users = User.query.count()
     
@@ -48,12 +61,12 @@ def get_stats():
     completed_payments = Payment.query.filter_by(status='completed').all()
     total_revenue = sum(payment.amount for payment in completed_payments)
     
-    return jsonify({
+    return {
         'totalUsers': total_users,
         'totalSpaces': total_spaces,
         'totalBookings': total_bookings,
         'totalRevenue': float(total_revenue) if total_revenue else 0
-    }), 200
+    }
 
 @admin_bp.route('/users', methods=['GET'])
 @admin_required
@@ -82,7 +95,7 @@ def get_users():
             'last_name': user.last_name,
             'role': user.role,
             'is_verified': user.is_verified,
-            'created_at': user.created_at.isoformat() if user.created_at else None
+            'created_at': user.created_at
         })
     
     return jsonify(users_data), 200
@@ -116,12 +129,12 @@ def get_bookings():
             'user_name': f"{user.first_name} {user.last_name}" if user else "Unknown",
             'space_id': booking.space_id,
             'space_name': space.name if space else "Unknown",
-            'start_time': booking.start_time.isoformat() if booking.start_time else None,
-            'end_time': booking.end_time.isoformat() if booking.end_time else None,
+            'start_time': booking.start_time,
+            'end_time': booking.end_time,
             'total_price': float(booking.total_price) if booking.total_price else 0,
             'status': booking.status,
             'payment_status': booking.payment_status,
-            'created_at': booking.created_at.isoformat() if booking.created_at else None
+            'created_at': booking.created_at
         })
     
     return jsonify(bookings_data), 200
@@ -153,7 +166,7 @@ def get_recent_users():
             'last_name': user.last_name,
             'role': user.role,
             'is_verified': user.is_verified,
-            'created_at': user.created_at.isoformat() if user.created_at else None
+            'created_at': user.created_at
         })
     
     return jsonify(users_data), 200
@@ -187,12 +200,144 @@ def get_recent_bookings():
             'user_name': f"{user.first_name} {user.last_name}" if user else "Unknown",
             'space_id': booking.space_id,
             'space_name': space.name if space else "Unknown",
-            'start_time': booking.start_time.isoformat() if booking.start_time else None,
-            'end_time': booking.end_time.isoformat() if booking.end_time else None,
+            'start_time': booking.start_time,
+            'end_time': booking.end_time,
             'total_price': float(booking.total_price) if booking.total_price else 0,
             'status': booking.status,
             'payment_status': booking.payment_status,
-            'created_at': booking.created_at.isoformat() if booking.created_at else None
+            'created_at': booking.created_at
         })
     
-    return jsonify(bookings_data), 200 
\ No newline at end of file
+    return jsonify(bookings_data), 200
+
+@admin_bp.route('/export/<dataset>', methods=['GET'])
+@admin_required
+def export_data(dataset):
+    """
+    Stream a full export of bookings, payments or users (admin only)
+    ---
+    tags:
+      - Admin
+    security:
+      - bearerAuth: []
+    parameters:
+      - name: dataset
+        in: path
+        type: string
+        enum: [bookings, payments, users]
+        required: true
+      - name: format
+        in: query
+        type: string
+        enum: [ndjson, csv]
+        default: ndjson
+      - name: from
+        in: query
+        type: string
+        format: date-time
+        description: Only rows created at or after this date or datetime
+      - name: to
+        in: query
+        type: string
+        format: date-time
+        description: Only rows created before this date or datetime
+    responses:
+      200:
+        description: NDJSON (one object per line) or CSV attachment, streamed in id order
+      400:
+        description: Invalid format or date
+      403:
+        description: Admin privileges required
+      404:
+        description: Unknown dataset
+      503:
+        description: Exports are disabled on this deployment
+    """
+    if not current_app.config['EXPORTS_ENABLED']:
+        return jsonify({'error': 'Exports are disabled: they need the gevent worker profile '
+                                 'or a raised GUNICORN_TIMEOUT'}), 503
+    if dataset not in EXPORTS:
+        return jsonify({'error': f"Unknown dataset. Must be one of: {', '.join(EXPORTS)}"}), 404
+    export_format = request.args.get('format', 'ndjson')
+    if export_format not in FORMATS:
+        return jsonify({'error': f"Invalid format. Must be one of: {', '.join(FORMATS)}"}), 400
+    try:
+        created_from = parse_timestamp(request.args.get('from'), 'from')
+        created_to = parse_timestamp(request.args.get('to'), 'to')
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    return export_response(dataset, export_format, created_from, created_to)
+
+@admin_bp.route('/profiles', methods=['GET'])
+@admin_required
+def get_profiles():
+    """
+    List stored request profiles, newest first (admin only)
+    ---
+    tags:
+      - Admin
+    security:
+      - bearerAuth: []
+    responses:
+      200:
+        description: Profile summaries with request, status, duration and SQL totals
+      403:
+        description: Admin privileges required
+    """
+    return jsonify(list_profiles(current_app.config['PROFILE_DIR'])), 200
+
+@admin_bp.route('/profiles/<profile_id>', methods=['GET'])
+@admin_required
+def get_profile(profile_id):
+    """
+    Get a request profile with its hottest functions and SQL timeline (admin only)
+    ---
+    tags:
+      - Admin
+    security:
+      - bearerAuth: []
+    parameters:
+      - name: profile_id
+        in: path
+        type: string
+        required: true
+    responses:
+      200:
+        description: Profile details
+      403:
+        description: Admin privileges required
+      404:
+        description: Profile not found
+    """
+    profile = load_profile(current_app.config['PROFILE_DIR'], profile_id)
+    if profile is None:
+        return jsonify({'error': 'Profile not found'}), 404
+    return jsonify(profile), 200
+
+@admin_bp.route('/profiles/<profile_id>/download', methods=['GET'])
+@admin_required
+def download_profile(profile_id):
+    """
+    Download the raw profile: cProfile stats (.prof) or folded stacks (.folded) (admin only)
+    ---
+    tags:
+      - Admin
+    security:
+      - bearerAuth: []
+    parameters:
+      - name: profile_id
+        in: path
+        type: string
+        required: true
+    responses:
+      200:
+        description: Profile file
+      403:
+        description: Admin privileges required
+      404:
+        description: Profile not found
+    """
+    profile = load_profile(current_app.config['PROFILE_DIR'], profile_id)
+    if profile is None:
+        return jsonify({'error': 'Profile not found'}), 404
+    return send_from_directory(current_app.config['PROFILE_DIR'], profile['file'], as_attachment=True)
@@ -2,6 +2,7 @@ from flask import Blueprint, request, jsonify, current_app
 from flask_jwt_extended import create_access_token, create_refresh_token, jwt_required, get_jwt_identity
 from app.models.user import User
 from app import db
+from app.utils.http_cache import conditional_get, make_etag
 from app.utils.email import send_verification_email
 from app.utils.validators import validate_email, validate_password
 
@@ -194,8 +195,16 @@ def verify_email(token):
     # This would typically involve decoding the token and updating the user's verification status
     pass
 
+def current_user_validators():
+    current_user_id = get_jwt_identity()
+    updated_at = db.session.query(User.updated_at).filter_by(id=current_user_id).scalar()
+    if updated_at is None:
+        return None
+    return make_etag('user', current_user_id, updated_at.isoformat()), updated_at
+
 @auth_bp.route('/me', methods=['GET'])
 @jwt_required()
+@conditional_get(current_user_validators)
 def get_current_user():
     """
     Get current user profile
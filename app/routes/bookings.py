@@ -1,4 +1,4 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, current_app
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from app.models.booking import Booking, Payment
 from app.models.space import Space
@@ -7,6 +7,11 @@ from app import db
 from app.utils.validators import validate_booking_dates
 from app.utils.email import send_booking_confirmation_email
 from app.utils.auth import role_required
+from app.utils.cache import get_cache
+from app.utils.delta_sync import (
+    FULL_SYNC_REQUIRED, database_now, deleted_ids, deletions_expired, delta_since, high_water_mark
+)
+from app.utils.replicas import primary_reads
 from datetime import datetime
 
 bookings_bp = Blueprint('bookings', __name__)
@@ -14,21 +19,41 @@ bookings_bp = Blueprint('bookings', __name__)
 @bookings_bp.route('/', methods=['GET'])
 @jwt_required()
 def get_bookings():
-    """Get bookings based on user role"""
+    """Get bookings based on user role, or the changes since ?updated_since"""
     current_user_id = get_jwt_identity()
     user = User.query.get(current_user_id)
+    try:
+        since = delta_since()
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     
     if user.role == 'admin':
         # Admin can see all bookings
-        bookings = Booking.query.all()
+        query = Booking.query
+        scope = {}
     elif user.role == 'owner':
         # Owner can see bookings for their spaces
-        bookings = Booking.query.join(Space).filter(Space.owner_id == current_user_id).all()
+        query = Booking.query.join(Space).filter(Space.owner_id == current_user_id)
+        scope = {'owner_id': user.id}
     else:
         # Client can only see their own bookings
-        bookings = Booking.query.filter_by(user_id=current_user_id).all()
-    
-    return jsonify([booking.to_dict() for booking in bookings]), 200
+        query = Booking.query.filter_by(user_id=current_user_id)
+        scope = {'user_id': user.id}
+    
+    if since is None:
+        return jsonify([booking.to_dict() for booking in query.all()]), 200
+    
+    with primary_reads():
+        now = database_now()
+        if deletions_expired(since, now):
+            return jsonify({'error': FULL_SYNC_REQUIRED}), 410
+        mark = high_water_mark(now)
+        bookings = query.filter(Booking.updated_at >= since).order_by(Booking.updated_at, Booking.id)
+        return jsonify({
+            'bookings': [booking.to_dict() for booking in bookings],
+            'deleted': deleted_ids('bookings', since, **scope),
+            'high_water_mark': mark
+        }), 200
 
 @bookings_bp.route('/<int:booking_id>', methods=['GET'])
 @jwt_required()
@@ -261,7 +286,7 @@ def process_payment(booking_id):
     current_user_id = get_jwt_identity()
     booking = Booking.query.get_or_404(booking_id)
     
-    if booking.user_id != current_user_id:
+    if booking.user_id != int(current_user_id):
         return jsonify({'error': 'Unauthorized'}), 403
     
     if booking.status != 'confirmed':
@@ -326,6 +351,15 @@ def get_my_bookings():
 def get_booking_stats():
     """Get booking statistics based on user role"""
     current_user_id = get_jwt_identity()
+    stats = get_cache().get_or_set(
+        f'booking-stats:{current_user_id}',
+        lambda: load_booking_stats(current_user_id),
+        tags=['users', 'spaces', 'bookings'],
+        ttl=current_app.config['CACHE_STATS_TTL']
+    )
+    return jsonify(stats), 200
+
+def load_booking_stats(current_user_id):
     user = User.query.get(current_user_id)
     
     if user.role == 'admin':
@@ -349,5 +383,4 @@ def get_booking_stats():
         'total_value': sum(b.total_price for b in bookings),
         'paid_value': sum(b.total_price for b in bookings if b.payment_status == 'paid')
     }
-    
-    return jsonify(stats), 200
\ No newline at end of file
+    return stats
\ No newline at end of file
@@ -73,7 +73,7 @@ def send_invoice():
         return jsonify({'error': 'Booking not found'}), 404
     
     # Verify the booking belongs to the user
-    if booking.user_id != current_user_id:
+    if booking.user_id != int(current_user_id):
         return jsonify({'error': 'You do not have permission to access this booking'}), 403
     
     # Send the invoice email
@@ -0,0 +1,20 @@
+from flask import Blueprint, current_app, send_from_directory
+from app.utils.storage import get_storage
+
+media_bp = Blueprint('media', __name__)
+
+@media_bp.route('/<path:filename>', methods=['GET'])
+def get_media(filename):
+    """Serve an image stored by the local storage backend"""
+    storage = get_storage()
+    # Paths are content-hashed, so files never change and can be cached forever.
+    # send_from_directory streams through wsgi.file_wrapper (sendfile under
+    # gunicorn) and answers Range and conditional requests.
+    response = send_from_directory(
+        storage.root,
+        filename,
+        max_age=current_app.config['IMAGE_CACHE_MAX_AGE'],
+        conditional=True
+    )
+    response.cache_control.immutable = True
+    return response
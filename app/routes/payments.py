@@ -84,7 +84,7 @@ def initiate_mpesa_payment(booking_id):
     booking = Booking.query.get_or_404(booking_id)
     
     # Check if user owns the booking
-    if booking.user_id != current_user_id:
+    if booking.user_id != int(current_user_id):
         return jsonify({'error': 'Unauthorized'}), 403
     
     # Check if booking can be paid for
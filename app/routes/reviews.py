@@ -1,13 +1,31 @@
 from flask import Blueprint, request, jsonify
+from sqlalchemy import func
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from app.models.user import User
 from app.models.space import Space
 from app.models.review import Review
 from app import db
+from app.utils.cache import get_cache
+from app.utils.http_cache import conditional_get, current_etag, make_etag
 
 reviews_bp = Blueprint('reviews', __name__)
 
+def reviews_validators():
+    space_id = request.args.get('space_id', type=int)
+    space_updated_at = db.session.query(Space.updated_at).filter_by(id=space_id).scalar() if space_id else None
+    if space_updated_at is None:
+        return None
+    
+    # The count catches deletions, the reviewer timestamps catch renamed users
+    count, reviews_updated_at, users_updated_at = db.session.query(
+        func.count(Review.id), func.max(Review.updated_at), func.max(User.updated_at)
+    ).outerjoin(User, User.id == Review.user_id).filter(Review.space_id == space_id).one()
+    last_modified = max(t for t in (space_updated_at, reviews_updated_at, users_updated_at) if t)
+    etag = make_etag('reviews', space_id, count, space_updated_at, reviews_updated_at, users_updated_at)
+    return etag, last_modified
+
 @reviews_bp.route('', methods=['GET'])
+@conditional_get(reviews_validators)
 def get_reviews():
     """
     Get all reviews for a space
@@ -30,9 +48,19 @@ def get_reviews():
     if not space_id:
         return jsonify({'error': 'Space ID is required'}), 400
     
+    data = get_cache().get_or_set(
+        f'reviews:{space_id}:{current_etag()}',
+        lambda: load_space_reviews(space_id),
+        tags=[f'space:{space_id}', 'users']
+    )
+    if data is None:
+        return jsonify({'error': 'Space not found'}), 404
+    return jsonify(data), 200
+
+def load_space_reviews(space_id):
     space = Space.query.get(space_id)
     if not space:
-        return jsonify({'error': 'Space not found'}), 404
+        return None
     
     reviews = Review.query.filter_by(space_id=space_id).all()
     reviews_data = []
@@ -45,14 +73,14 @@ def get_reviews():
             'user_name': f"{user.first_name} {user.last_name}" if user else "Unknown User",
             'rating': review.rating,
             'comment': review.comment,
-            'created_at': review.created_at.isoformat() if review.created_at else None
+            'created_at': review.created_at
         })
     
-    return jsonify({
+    return {
         'space_id': space_id,
         'space_name': space.name,
         'reviews': reviews_data
-    }), 200
+    }
 
 @reviews_bp.route('', methods=['POST'])
 @jwt_required()
@@ -127,7 +155,7 @@ def create_review():
         'space_id': review.space_id,
         'rating': review.rating,
         'comment': review.comment,
-        'created_at': review.created_at.isoformat() if review.created_at else None
+        'created_at': review.created_at
     }), 201
 
 @reviews_bp.route('/<int:review_id>', methods=['PUT'])
@@ -173,7 +201,7 @@ def update_review(review_id):
     if not review:
         return jsonify({'error': 'Review not found'}), 404
     
-    if review.user_id != current_user_id:
+    if review.user_id != int(current_user_id):
         return jsonify({'error': 'You do not have permission to update this review'}), 403
     
     data = request.get_json()
@@ -199,7 +227,7 @@ def update_review(review_id):
         'space_id': review.space_id,
         'rating': review.rating,
         'comment': review.comment,
-        'created_at': review.created_at.isoformat() if review.created_at else None
+        'created_at': review.created_at
     }), 200
 
 @reviews_bp.route('/<int:review_id>', methods=['DELETE'])
@@ -232,7 +260,7 @@ def delete_review(review_id):
     if not review:
         return jsonify({'error': 'Review not found'}), 404
     
-    if review.user_id != current_user_id:
+    if review.user_id != int(current_user_id):
         return jsonify({'error': 'You do not have permission to delete this review'}), 403
     
     db.session.delete(review)
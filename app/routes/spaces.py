@@ -4,18 +4,76 @@ from app.models.space import Space, SpaceImage
 from app.models.user import User
 from app import db
 from app.utils.validators import validate_space_data
-from app.utils.cloudinary import upload_image
+from app.utils.images import hash_image, find_uploaded_image, upload_image_deduplicated
+from app.utils.image_worker import spool_images, enqueue_images
 from app.utils.auth import role_required
+from app.utils.cache import get_cache
+from app.utils.http_cache import cache_control, conditional_get, current_etag, make_etag
+from app.utils.delta_sync import (
+    FULL_SYNC_REQUIRED, database_now, deleted_ids, deletions_expired, delta_since, high_water_mark
+)
+from app.utils.replicas import primary_reads
 from datetime import datetime
 
 spaces_bp = Blueprint('spaces', __name__)
 
+def requested_space_fields():
+    """Fields asked for with ?fields=a,b or ?view=card; None means the full space."""
+    fields = request.args.get('fields')
+    if fields:
+        fields = [field.strip() for field in fields.split(',') if field.strip()]
+        unknown = [field for field in fields if field not in Space.FIELD_COLUMNS]
+        if unknown:
+            raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+        return fields
+    view = request.args.get('view')
+    if view == 'card':
+        return Space.CARD_FIELDS
+    if view and view != 'full':
+        raise ValueError(f'Unknown view: {view}')
+    return None
+
+def build_space_image(image, content_hash, spooled_images):
+    """
+    Create a SpaceImage for an uploaded file.
+    
+    With ASYNC_IMAGE_PROCESSING enabled, new images are left in the
+    'processing' state and added to ``spooled_images`` for the image worker
+    instead of being resized and uploaded during the request.
+    """
+    if current_app.config['ASYNC_IMAGE_PROCESSING']:
+        image_url = find_uploaded_image(content_hash)
+        if image_url is None:
+            space_image = SpaceImage(content_hash=content_hash, status='processing')
+            spooled_images.append((space_image, image))
+            return space_image
+        return SpaceImage(image_url=image_url, content_hash=content_hash)
+    
+    image_url, content_hash = upload_image_deduplicated(image, content_hash=content_hash)
+    return SpaceImage(image_url=image_url, content_hash=content_hash)
+
 @spaces_bp.route('/', methods=['GET'])
+@cache_control(max_age=30, stale_while_revalidate=120)
 def get_spaces():
     """
     List all available spaces
+    
+    With ?updated_since=<timestamp>, only the spaces changed since then are
+    returned, with the ids of deleted spaces and a new high-water mark.
     """
     current_app.logger.info(f"GET /api/spaces called with args: {request.args}")
+    try:
+        fields = requested_space_fields()
+        since = delta_since()
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    if since is not None:
+        # Deltas keep a full local copy in sync; filtering happens on the client
+        if any(arg in request.args for arg in ('city', 'min_price', 'max_price', 'status')):
+            return jsonify({'error': 'updated_since cannot be combined with filters'}), 400
+        return space_delta(since, fields)
+    
     try:
         page = request.args.get('page', 1, type=int)
         per_page = request.args.get('per_page', 10, type=int)
@@ -25,6 +83,7 @@ def get_spaces():
         status = request.args.get('status')
         
         query = Space.query
+        query = query.options(*Space.load_options(fields))
         
         if status == 'available':
             query = query.filter_by(is_available=True)
@@ -41,7 +100,7 @@ def get_spaces():
         spaces = query.paginate(page=page, per_page=per_page)
         
         response = {
-            'spaces': [space.to_dict() for space in spaces.items],
+            'spaces': [space.to_dict(fields) for space in spaces.items],
             'total': spaces.total,
             'pages': spaces.pages,
             'current_page': spaces.page
@@ -52,7 +111,32 @@ def get_spaces():
         # current_app.logger.error(f"Error in GET /api/spaces: {str(e)}")
         return jsonify({'error': 'Failed to fetch spaces'}), 500
 
+def space_delta(since, fields, **scope):
+    """Response with the spaces updated since ``since`` plus tombstones, optionally scoped by owner_id."""
+    with primary_reads():
+        now = database_now()
+        if deletions_expired(since, now):
+            return jsonify({'error': FULL_SYNC_REQUIRED}), 410
+        mark = high_water_mark(now)
+        query = Space.query.filter(Space.updated_at >= since).order_by(Space.updated_at, Space.id)
+        if 'owner_id' in scope:
+            query = query.filter(Space.owner_id == scope['owner_id'])
+        query = query.options(*Space.load_options(fields))
+        return jsonify({
+            'spaces': [space.to_dict(fields) for space in query],
+            'deleted': deleted_ids('spaces', since, **scope),
+            'high_water_mark': mark
+        }), 200
+
+def space_validators(space_id):
+    updated_at = db.session.query(Space.updated_at).filter_by(id=space_id).scalar()
+    if updated_at is None:
+        return None
+    return make_etag('space', space_id, updated_at.isoformat()), updated_at
+
 @spaces_bp.route('/<int:space_id>', methods=['GET'])
+@cache_control(max_age=60, stale_while_revalidate=300)
+@conditional_get(space_validators)
 def get_space(space_id):
     """
     Get a space by ID
@@ -74,8 +158,12 @@ def get_space(space_id):
       404:
         description: Not found
     """
-    space = Space.query.get_or_404(space_id)
-    return jsonify(space.to_dict()), 200
+    data = get_cache().get_or_set(
+        f'space:{space_id}:{current_etag()}',
+        lambda: Space.query.get_or_404(space_id).to_dict(),
+        tags=[f'space:{space_id}']
+    )
+    return jsonify(data), 200
 
 @spaces_bp.route('/', methods=['POST'])
 @role_required('admin', 'owner')
@@ -139,6 +227,12 @@ def create_space():
           application/json:
             schema:
               $ref: '#/components/schemas/Space'
+      202:
+        description: Space created, images are still processing (async image mode)
+        content:
+          application/json:
+            schema:
+              $ref: '#/components/schemas/Space'
       400:
         description: Invalid input
         content:
@@ -181,20 +275,28 @@ def create_space():
     db.session.flush()  # Get space ID without committing
     
     # Handles image uploads
+    spooled_images = []
     if 'images' in request.files:
         images = request.files.getlist('images')
+        seen_hashes = set()
         for i, image in enumerate(images):
             if image:
-                image_url = upload_image(image)
-                space_image = SpaceImage(
-                    space_id=space.id,
-                    image_url=image_url,
-                    is_primary=(i == 0)  # First image is primary
-                )
+                content_hash = hash_image(image)
+                if content_hash in seen_hashes:
+                    continue
+                seen_hashes.add(content_hash)
+                
+                space_image = build_space_image(image, content_hash, spooled_images)
+                space_image.space_id = space.id
+                space_image.is_primary = (i == 0)  # First image is primary
                 db.session.add(space_image)
     
+    spool_images(spooled_images)
     db.session.commit()
-    return jsonify(space.to_dict()), 201
+    enqueue_images([space_image.id for space_image, _ in spooled_images])
+    
+    # 202 tells the client that some images are still being processed
+    return jsonify(space.to_dict()), 202 if spooled_images else 201
 
 @spaces_bp.route('/<int:space_id>', methods=['PUT'])
 @jwt_required()
@@ -263,6 +365,12 @@ def update_space(space_id):
           application/json:
             schema:
               $ref: '#/components/schemas/Space'
+      202:
+        description: Space updated, new images are still processing (async image mode)
+        content:
+          application/json:
+            schema:
+              $ref: '#/components/schemas/Space'
       400:
         description: Invalid input
       401:
@@ -279,7 +387,7 @@ def update_space(space_id):
     space = Space.query.get_or_404(space_id)
     
     # Allow space owner or admin to update
-    if space.owner_id != current_user_id and user.role != 'admin':
+    if space.owner_id != int(current_user_id) and user.role != 'admin':
         return jsonify({'error': 'Unauthorized'}), 403
     
     # Get form data
@@ -308,27 +416,40 @@ def update_space(space_id):
             return jsonify({'error': 'Invalid capacity format'}), 400
     
     # Handle image uploads
+    spooled_images = []
     if request.files and 'images' in request.files:
-        # Delete existing images if new ones are provided
-        SpaceImage.query.filter_by(space_id=space.id).delete()
+        # Diff the new image set against the existing one by content hash:
+        # unchanged images are kept, new ones uploaded, missing ones removed
+        existing_images = {
+            image.content_hash: image for image in space.images if image.content_hash
+        }
+        kept_images = []
         
         images = request.files.getlist('images')
-        for i, image in enumerate(images):
+        for image in images:
             if image:
                 try:
-                    image_url = upload_image(image)
-                    space_image = SpaceImage(
-                        space_id=space.id,
-                        image_url=image_url,
-                        is_primary=(i == 0)
-                    )
-                    db.session.add(space_image)
+                    content_hash = hash_image(image)
+                    space_image = existing_images.pop(content_hash, None)
+                    if space_image is None:
+                        if any(kept.content_hash == content_hash for kept in kept_images):
+                            continue
+                        space_image = build_space_image(image, content_hash, spooled_images)
+                        space.images.append(space_image)
+                    space_image.is_primary = not kept_images
+                    kept_images.append(space_image)
                 except Exception as e:
                     return jsonify({'error': f'Failed to upload image: {str(e)}'}), 422
+        
+        for space_image in list(space.images):
+            if space_image not in kept_images:
+                space.images.remove(space_image)
     
     try:
+        spool_images(spooled_images)
         db.session.commit()
-        return jsonify(space.to_dict()), 200
+        enqueue_images([space_image.id for space_image, _ in spooled_images])
+        return jsonify(space.to_dict()), 202 if spooled_images else 200
     except Exception as e:
         db.session.rollback()
         return jsonify({'error': f'Failed to update space: {str(e)}'}), 422
@@ -369,25 +490,109 @@ def delete_space(space_id):
     space = Space.query.get_or_404(space_id)
     
     # Allow space owner or admin to delete a space
-    if space.owner_id != current_user_id and user.role != 'admin':
+    if space.owner_id != int(current_user_id) and user.role != 'admin':
         return jsonify({'error': 'Unauthorized'}), 403
     
     db.session.delete(space)
     db.session.commit()
     return jsonify({'message': 'Space deleted successfully'}), 200
 
+@spaces_bp.route('/<int:space_id>/images/status', methods=['GET'])
+def get_space_images_status(space_id):
+    """
+    Get the processing status of a space's images
+    ---
+    tags:
+      - Spaces
+    parameters:
+      - name: space_id
+        in: path
+        type: integer
+        required: true
+    responses:
+      200:
+        description: Image processing status
+        content:
+          application/json:
+            schema:
+              type: object
+              properties:
+                space_id:
+                  type: integer
+                  example: 1
+                status:
+                  type: string
+                  enum: [processing, ready, failed]
+                  example: processing
+                images:
+                  type: array
+                  items:
+                    type: object
+                    properties:
+                      id:
+                        type: integer
+                        example: 1
+                      status:
+                        type: string
+                        example: ready
+                      image_url:
+                        type: string
+                        example: https://example.com/space.jpg
+      404:
+        description: Not found
+    """
+    # Only the image columns are loaded so clients can poll cheaply
+    images = db.session.query(
+        SpaceImage.id, SpaceImage.status, SpaceImage.image_url, SpaceImage.is_primary
+    ).filter_by(space_id=space_id).order_by(SpaceImage.id).all()
+    
+    if not images and not db.session.query(Space.id).filter_by(id=space_id).first():
+        return jsonify({'error': 'Space not found'}), 404
+    
+    statuses = {image.status for image in images}
+    if 'processing' in statuses:
+        status = 'processing'
+    elif 'failed' in statuses:
+        status = 'failed'
+    else:
+        status = 'ready'
+    
+    return jsonify({
+        'space_id': space_id,
+        'status': status,
+        'images': [
+            {
+                'id': image.id,
+                'status': image.status,
+                'image_url': image.image_url,
+                'is_primary': image.is_primary
+            }
+            for image in images
+        ]
+    }), 200
+
 @spaces_bp.route('/my-spaces', methods=['GET'])
 @jwt_required()
 def get_my_spaces():
-    """Get spaces owned by current user"""
+    """Get spaces owned by current user, or the changes since ?updated_since"""
     current_user_id = get_jwt_identity()
     user = User.query.get(current_user_id)
     
     if user.role not in ['owner', 'admin']:
         return jsonify({'error': 'Unauthorized'}), 403
-        
-    spaces = Space.query.filter_by(owner_id=current_user_id).all()
-    return jsonify([space.to_dict() for space in spaces]), 200
+    
+    try:
+        fields = requested_space_fields()
+        since = delta_since()
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    if since is not None:
+        return space_delta(since, fields, owner_id=user.id)
+    
+    query = Space.query.filter_by(owner_id=current_user_id)
+    query = query.options(*Space.load_options(fields))
+    spaces = query.all()
+    return jsonify([space.to_dict(fields) for space in spaces]), 200
 
 @spaces_bp.route('/stats', methods=['GET'])
 @jwt_required()
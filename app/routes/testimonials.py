@@ -1,18 +1,31 @@
 from flask import Blueprint, request, jsonify
 from app.models.testimonial import Testimonial
 from app import db
+from app.utils.cache import get_cache
+from app.utils.http_cache import cache_control, conditional_get, make_etag
 
 testimonials_bp = Blueprint('testimonials', __name__)
 
 # GET all testimonials
 @testimonials_bp.route('/', methods=['GET'])
+@cache_control(max_age=300, stale_while_revalidate=3600)
 def get_testimonials():
-    testimonials = Testimonial.query.all()
-    result = [t.to_dict() for t in testimonials]
+    result = get_cache().get_or_set(
+        'testimonials:all',
+        lambda: [t.to_dict() for t in Testimonial.query.all()],
+        tags=['testimonials']
+    )
     return jsonify(result), 200
 
+def testimonial_validators(id):
+    updated_at = db.session.query(Testimonial.updated_at).filter_by(id=id).scalar()
+    if updated_at is None:
+        return None
+    return make_etag('testimonial', id, updated_at.isoformat()), updated_at
+
 # GET a specific testimonial
 @testimonials_bp.route('/<int:id>', methods=['GET'])
+@conditional_get(testimonial_validators)
 def get_testimonial(id):
     testimonial = Testimonial.query.get_or_404(id)
     return jsonify(testimonial.to_dict()), 200
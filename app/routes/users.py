@@ -3,7 +3,7 @@ from flask_jwt_extended import jwt_required, get_jwt_identity
 from app.models.user import User
 from app import db
 from app.utils.validators import validate_email, validate_password
-from app.utils.cloudinary import upload_image
+from app.utils.images import hash_image, upload_image_deduplicated
 from app.utils.auth import role_required
 
 users_bp = Blueprint('users', __name__)
@@ -119,7 +119,7 @@ def get_user(user_id):
     current_user_id = get_jwt_identity()
     current_user = User.query.get(current_user_id)
     
-    if current_user_id != user_id and current_user.role != 'admin':
+    if int(current_user_id) != user_id and current_user.role != 'admin':
         return jsonify({'error': 'Unauthorized'}), 403
     
     user = User.query.get_or_404(user_id)
@@ -185,7 +185,7 @@ def update_user(user_id):
     current_user_id = get_jwt_identity()
     current_user = User.query.get(current_user_id)
     
-    if current_user_id != user_id and current_user.role != 'admin':
+    if int(current_user_id) != user_id and current_user.role != 'admin':
         return jsonify({'error': 'Unauthorized'}), 403
     
     user = User.query.get_or_404(user_id)
@@ -259,7 +259,7 @@ def delete_user(user_id):
     user = User.query.get_or_404(user_id)
     
     # Prevent self-deletion
-    if user_id == current_user_id:
+    if user_id == int(current_user_id):
         return jsonify({'error': 'Cannot delete your own account'}), 400
     
     db.session.delete(user)
@@ -414,8 +414,13 @@ def user_profile():
             user.bio = data['bio']
         if file:
             try:
-                image_url = upload_image(file, folder='avatars')
-                user.avatar_url = image_url
+                content_hash = hash_image(file)
+                if content_hash != user.avatar_hash or not user.avatar_url:
+                    image_url, content_hash = upload_image_deduplicated(
+                        file, folder='avatars', content_hash=content_hash
+                    )
+                    user.avatar_url = image_url
+                    user.avatar_hash = content_hash
             except Exception as e:
                 return jsonify({'error': f'Failed to upload avatar: {str(e)}'}), 500
         db.session.commit()
@@ -468,6 +473,6 @@ def user_activities():
             'id': b.id,
             'type': 'booking',
             'description': f'Booked space {b.space.name} for {b.purpose}',
-            'created_at': b.created_at.isoformat(),
+            'created_at': b.created_at,
         })
     return jsonify({'activities': activities}), 200
\ No newline at end of file
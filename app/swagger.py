@@ -0,0 +1,189 @@
+"""
+API documentation: the Swagger template, /docs and a disk-cached /apispec.json.
+
+Only imported when SWAGGER_ENABLED is set, so flasgger and its dependencies
+cost nothing at startup when the docs are turned off.
+"""
+import copy
+import hashlib
+import json
+import os
+import tempfile
+import flasgger
+from flasgger import Swagger
+
+SWAGGER_CONFIG = {
+    "headers": [],
+    "specs": [
+        {
+            "endpoint": 'apispec',
+            "route": '/apispec.json',
+            "rule_filter": lambda rule: True,  # all in
+            "model_filter": lambda tag: True,  # all in
+        }
+    ],
+    "static_url_path": "/flasgger_static",
+    "swagger_ui": True,
+    "specs_route": "/docs"
+}
+
+SWAGGER_TEMPLATE = {
+    "swagger": "2.0",
+    "info": {
+        "title": "Spacer API",
+        "description": "API for managing space bookings",
+        "version": "1.0.0"
+    },
+    "securityDefinitions": {
+        "BearerAuth": {
+            "type": "apiKey",
+            "name": "Authorization",
+            "in": "header"
+        }
+    },
+    "components": {
+        "schemas": {
+            "User": {
+                "type": "object",
+                "properties": {
+                    "id": {"type": "integer", "example": 1},
+                    "email": {"type": "string", "example": "user@example.com"},
+                    "first_name": {"type": "string", "example": "John"},
+                    "last_name": {"type": "string", "example": "Doe"},
+                    "name": {"type": "string", "example": "John Doe"},
+                    "role": {"type": "string", "enum": ["admin", "owner", "client"], "example": "client"},
+                    "phone": {"type": "string", "example": "254712345678"},
+                    "bio": {"type": "string", "example": "Software developer"},
+                    "avatar_url": {"type": "string", "example": "https://example.com/avatar.jpg"},
+                    "is_verified": {"type": "boolean", "example": True},
+                    "created_at": {"type": "string", "format": "date-time"},
+                    "updated_at": {"type": "string", "format": "date-time"}
+                }
+            },
+            "Space": {
+                "type": "object",
+                "properties": {
+                    "id": {"type": "integer", "example": 1},
+                    "name": {"type": "string", "example": "Conference Room"},
+                    "description": {"type": "string", "example": "Spacious room for meetings"},
+                    "address": {"type": "string", "example": "123 Main St"},
+                    "city": {"type": "string", "example": "Nairobi"},
+                    "price_per_hour": {"type": "number", "example": 100.0},
+                    "capacity": {"type": "integer", "example": 20},
+                    "is_available": {"type": "boolean", "example": True},
+                    "owner_id": {"type": "integer", "example": 1},
+                    "primary_image_url": {"type": "string", "example": "https://example.com/space.jpg"},
+                    "images": {
+                        "type": "array",
+                        "items": {
+                            "type": "object",
+                            "properties": {
+                                "id": {"type": "integer", "example": 1},
+                                "image_url": {"type": "string", "example": "https://example.com/space.jpg"},
+                                "is_primary": {"type": "boolean", "example": True}
+                            }
+                        }
+                    },
+                    "created_at": {"type": "string", "format": "date-time"},
+                    "updated_at": {"type": "string", "format": "date-time"}
+                }
+            },
+            "Booking": {
+                "type": "object",
+                "properties": {
+                    "id": {"type": "integer", "example": 1},
+                    "space_id": {"type": "integer", "example": 1},
+                    "user_id": {"type": "integer", "example": 1},
+                    "start_time": {"type": "string", "format": "date-time"},
+                    "end_time": {"type": "string", "format": "date-time"},
+                    "total_price": {"type": "number", "example": 200.0},
+                    "purpose": {"type": "string", "example": "Team meeting"},
+                    "status": {"type": "string", "enum": ["pending", "confirmed", "cancelled", "completed"], "example": "pending"},
+                    "payment_status": {"type": "string", "enum": ["pending", "paid", "refunded"], "example": "pending"},
+                    "created_at": {"type": "string", "format": "date-time"},
+                    "updated_at": {"type": "string", "format": "date-time"}
+                }
+            },
+            "Payment": {
+                "type": "object",
+                "properties": {
+                    "id": {"type": "integer", "example": 1},
+                    "booking_id": {"type": "integer", "example": 1},
+                    "amount": {"type": "number", "example": 200.0},
+                    "payment_method": {"type": "string", "enum": ["mpesa", "card", "cash"], "example": "mpesa"},
+                    "transaction_id": {"type": "string", "example": "MPESA123456789"},
+                    "status": {"type": "string", "enum": ["pending", "completed", "failed", "refunded"], "example": "completed"},
+                    "created_at": {"type": "string", "format": "date-time"},
+                    "updated_at": {"type": "string", "format": "date-time"}
+                }
+            }
+        }
+    }
+}
+
+def spec_fingerprint(app, template):
+    """
+    Hash of everything the generated spec depends on.
+
+    Reading the routes and docstrings is cheap; parsing the YAML in the
+    docstrings is what takes time, and only happens on a cache miss.
+    """
+    digest = hashlib.sha256(flasgger.__version__.encode())
+    digest.update(json.dumps(template, sort_keys=True, default=str).encode())
+    for rule in sorted(app.url_map.iter_rules(), key=lambda rule: (rule.rule, rule.endpoint)):
+        view = app.view_functions.get(rule.endpoint)
+        digest.update(f'{rule.rule} {sorted(rule.methods)} {rule.endpoint}\n'.encode())
+        digest.update((getattr(view, '__doc__', None) or '').encode())
+    return digest.hexdigest()
+
+class CachedSwagger(Swagger):
+    """Swagger that keeps generated specs in SWAGGER_CACHE_DIR across restarts."""
+    
+    def get_apispecs(self, endpoint='apispec_1'):
+        if not self.app.debug and endpoint in self.apispecs:
+            return self.apispecs[endpoint]
+        
+        path = os.path.join(self.app.config['SWAGGER_CACHE_DIR'], f'{endpoint}.json')
+        fingerprint = spec_fingerprint(self.app, self.template)
+        try:
+            with open(path) as f:
+                cached = json.load(f)
+            if cached.get('fingerprint') == fingerprint:
+                self.apispecs[endpoint] = cached['spec']
+                return cached['spec']
+        except (OSError, ValueError):
+            pass
+        
+        spec = super().get_apispecs(endpoint)
+        try:
+            write_spec(path, self.app.json.dumps({'fingerprint': fingerprint, 'spec': spec}))
+        except (OSError, TypeError) as e:
+            self.app.logger.warning(f'Could not cache the API spec in {path}: {e}')
+        return spec
+
+def write_spec(path, content):
+    # Serialized with the app's JSON provider, exactly as /apispec.json returns it.
+    # Write to a temporary file first so concurrent workers never read half a file
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w') as f:
+            f.write(content)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+
+def init_swagger(app):
+    """Serve /docs and /apispec.json, and add the `flask build-apispec` command."""
+    swagger = CachedSwagger(app, config=dict(SWAGGER_CONFIG), template=copy.deepcopy(SWAGGER_TEMPLATE))
+    
+    @app.cli.command('build-apispec')
+    def build_apispec():
+        """Generate the API spec into SWAGGER_CACHE_DIR, e.g. while building an image."""
+        for spec in SWAGGER_CONFIG['specs']:
+            swagger.get_apispecs(spec['endpoint'])
+            print(os.path.join(app.config['SWAGGER_CACHE_DIR'], f"{spec['endpoint']}.json"))
+    
+    return swagger
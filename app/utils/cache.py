@@ -0,0 +1,180 @@
+import pickle
+import threading
+import time
+from collections import OrderedDict
+from flask import current_app, has_app_context
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from app.utils.metrics import CACHE_REQUESTS
+from app.utils.replicas import primary_reads
+
+# Tags invalidated when a row of each table is written. A cached value lists
+# the tags it depends on and is dropped when any of them changes.
+TABLE_TAGS = {
+    'spaces': lambda obj: ['spaces', f'space:{obj.id}'],
+    'space_images': lambda obj: ['spaces', f'space:{obj.space_id}'],
+    'reviews': lambda obj: ['reviews', f'space:{obj.space_id}'],
+    'bookings': lambda obj: ['bookings'],
+    'payments': lambda obj: ['payments'],
+    'testimonials': lambda obj: ['testimonials'],
+    'users': lambda obj: ['users']
+}
+
+_MISSING = object()
+
+class LocalCache:
+    """Bounded in-process LRU cache with per-entry TTL."""
+
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # key -> (expires_at, value)
+        self._generations = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return _MISSING
+            if entry[0] < time.monotonic():
+                del self._entries[key]
+                return _MISSING
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def set(self, key, value, ttl):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def generations(self, tags):
+        return [self._generations.get(tag, 0) for tag in tags]
+
+    def bump(self, tags):
+        with self._lock:
+            for tag in tags:
+                self._generations[tag] = self._generations.get(tag, 0) + 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._generations.clear()
+
+class RedisCache:
+    """Cache shared by all workers through Redis; tag generations live in Redis too."""
+
+    def __init__(self, url, prefix='spacer:cache:'):
+        import redis  # optional, only needed for CACHE_BACKEND=redis
+        self.client = redis.Redis.from_url(url)
+        self.prefix = prefix
+
+    def get(self, key):
+        raw = self.client.get(self.prefix + key)
+        return _MISSING if raw is None else pickle.loads(raw)
+
+    def set(self, key, value, ttl):
+        self.client.set(self.prefix + key, pickle.dumps(value), ex=max(int(ttl), 1))
+
+    def generations(self, tags):
+        if not tags:
+            return []
+        values = self.client.mget([f'{self.prefix}gen:{tag}' for tag in tags])
+        return [int(value or 0) for value in values]
+
+    def bump(self, tags):
+        pipe = self.client.pipeline(transaction=False)
+        for tag in tags:
+            pipe.incr(f'{self.prefix}gen:{tag}')
+        pipe.execute()
+
+    def clear(self):
+        for key in self.client.scan_iter(match=self.prefix + '*'):
+            self.client.delete(key)
+
+class Cache:
+    """Read-through cache with tag invalidation and per-key single-flight."""
+
+    def __init__(self, backend, default_ttl, enabled=True, lock_stripes=64):
+        self.backend = backend
+        self.default_ttl = default_ttl
+        self.enabled = enabled
+        self._locks = [threading.Lock() for _ in range(lock_stripes)]
+
+    def _versioned_key(self, key, tags):
+        generations = self.backend.generations(tags)
+        return key + '|' + '.'.join(str(generation) for generation in generations)
+
+    def get_or_set(self, key, loader, tags=(), ttl=None):
+        """Return the cached value for ``key``, calling ``loader()`` to fill it on a miss.
+
+        Values are shared between requests and must be treated as read-only.
+        """
+        if not self.enabled:
+            return loader()
+
+        name = key.split(':', 1)[0]
+        versioned_key = self._versioned_key(key, tags)
+        value = self.backend.get(versioned_key)
+        if value is not _MISSING:
+            CACHE_REQUESTS.labels(cache=name, result='hit').inc()
+            return value
+
+        # Only one thread per key runs the loader; the others wait and reuse its result
+        with self._locks[hash(key) % len(self._locks)]:
+            value = self.backend.get(versioned_key)
+            if value is not _MISSING:
+                CACHE_REQUESTS.labels(cache=name, result='hit').inc()
+                return value
+            CACHE_REQUESTS.labels(cache=name, result='miss').inc()
+            # A lagging replica could still return rows from before the write
+            # that bumped the generation, and they would be cached under the
+            # new key for the whole TTL; fill the cache from the primary
+            with primary_reads():
+                value = loader()
+            self.backend.set(versioned_key, value, ttl or self.default_ttl)
+            return value
+
+    def invalidate(self, *tags):
+        if tags:
+            self.backend.bump(tags)
+
+    def clear(self):
+        self.backend.clear()
+
+def create_cache(app):
+    """Build the cache selected by ``CACHE_BACKEND``."""
+    backend = app.config['CACHE_BACKEND']
+    if backend == 'local':
+        store = LocalCache(app.config['CACHE_MAX_ENTRIES'])
+    elif backend == 'redis':
+        store = RedisCache(app.config['CACHE_REDIS_URL'])
+    else:
+        raise ValueError(f'Unknown cache backend: {backend}')
+    return Cache(store, app.config['CACHE_DEFAULT_TTL'], enabled=app.config['CACHE_ENABLED'])
+
+def get_cache():
+    """Return the cache for the current app."""
+    cache = current_app.extensions.get('cache')
+    if cache is None:
+        cache = current_app.extensions['cache'] = create_cache(current_app)
+    return cache
+
+@event.listens_for(Session, 'after_flush')
+def _collect_cache_tags(session, flush_context):
+    tags = session.info.setdefault('cache_tags', set())
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        tags_for = TABLE_TAGS.get(getattr(obj, '__tablename__', None))
+        if tags_for is not None:
+            tags.update(tags_for(obj))
+
+@event.listens_for(Session, 'after_commit')
+def _invalidate_cache_tags(session):
+    tags = session.info.pop('cache_tags', None)
+    if tags and has_app_context():
+        get_cache().invalidate(*tags)
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_cache_tags(session):
+    session.info.pop('cache_tags', None)
@@ -1,8 +1,8 @@
 import cloudinary
+import cloudinary.api
 import cloudinary.uploader
 from flask import current_app
-from PIL import Image
-import io
+from app.utils.metrics import track_outbound
 
 def configure_cloudinary():
     """Configure Cloudinary with credentials from config."""
@@ -11,58 +11,65 @@ def configure_cloudinary():
         api_key=current_app.config['CLOUDINARY_API_KEY'],
         api_secret=current_app.config['CLOUDINARY_API_SECRET']
     )
-
-def resize_image(image_file, max_size=(800, 800)):
-    """Resize image while maintaining aspect ratio."""
-    img = Image.open(image_file)
-    
-    # Convert to RGB if necessary
-    if img.mode in ('RGBA', 'P'):
-        img = img.convert('RGB')
-    
-    # Calculate new dimensions
-    width, height = img.size
-    if width > max_size[0] or height > max_size[1]:
-        ratio = min(max_size[0] / width, max_size[1] / height)
-        new_size = (int(width * ratio), int(height * ratio))
-        img = img.resize(new_size, Image.Resampling.LANCZOS)
-    
-    # Save to bytes
-    output = io.BytesIO()
-    img.save(output, format='JPEG', quality=85)
-    output.seek(0)
-    return output
+    if current_app.config['CLOUDINARY_UPLOAD_PREFIX']:
+        cloudinary.config(upload_prefix=current_app.config['CLOUDINARY_UPLOAD_PREFIX'])
 
 def upload_image(image_file, folder='spacer'):
-    """Upload image to Cloudinary with resizing."""
+    """Upload an already resized image to Cloudinary."""
     try:
         configure_cloudinary()
         
-        # Resizes image
-        resized_image = resize_image(image_file)
-        
         # Uploads to Cloudinary
-        result = cloudinary.uploader.upload(
-            resized_image,
-            folder=folder,
-            resource_type='image',
-            transformation=[
-                {'quality': 'auto'},
-                {'fetch_format': 'auto'}
-            ]
-        )
+        with track_outbound('cloudinary', 'upload'):
+            result = cloudinary.uploader.upload(
+                image_file,
+                folder=folder,
+                resource_type='image',
+                timeout=current_app.config['CLOUDINARY_TIMEOUT'],
+                transformation=[
+                    {'quality': 'auto'},
+                    {'fetch_format': 'auto'}
+                ]
+            )
         
         return result['secure_url']
     except Exception as e:
         current_app.logger.error(f"Failed to upload image to Cloudinary: {str(e)}")
         raise
 
+def public_id_from_url(image_url):
+    """Extract the Cloudinary public ID from a delivery URL."""
+    if '/upload/' not in image_url:
+        return None
+    path = image_url.split('/upload/', 1)[1].split('?', 1)[0]
+    parts = path.split('/')
+    # Skip the optional version segment (e.g. v1699999999)
+    if parts[0].startswith('v') and parts[0][1:].isdigit():
+        parts = parts[1:]
+    return '/'.join(parts).rsplit('.', 1)[0]
+
+def list_images(folder, next_cursor=None, max_results=500):
+    """List one page of uploaded images in a Cloudinary folder."""
+    configure_cloudinary()
+    options = {
+        'type': 'upload',
+        'resource_type': 'image',
+        'prefix': f'{folder}/',
+        'max_results': max_results
+    }
+    if next_cursor:
+        options['next_cursor'] = next_cursor
+    with track_outbound('cloudinary', 'list'):
+        result = cloudinary.api.resources(timeout=current_app.config['CLOUDINARY_TIMEOUT'], **options)
+    return result.get('resources', []), result.get('next_cursor')
+
 def delete_image(public_id):
     """Delete image from Cloudinary."""
     try:
         configure_cloudinary()
-        result = cloudinary.uploader.destroy(public_id)
+        with track_outbound('cloudinary', 'destroy'):
+            result = cloudinary.uploader.destroy(public_id, timeout=current_app.config['CLOUDINARY_TIMEOUT'])
         return result['result'] == 'ok'
     except Exception as e:
         current_app.logger.error(f"Failed to delete image from Cloudinary: {str(e)}")
-        return False 
\ No newline at end of file
+        return False
@@ -0,0 +1,129 @@
+import gzip
+import time
+import zlib
+from flask import current_app, request
+from app.utils.metrics import COMPRESSION_TIME
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - brotli is optional
+    brotli = None
+
+def init_compression(app):
+    """Compress eligible responses with Brotli or gzip."""
+    app.after_request(compress_response)
+
+def negotiate_encoding(accept_encodings):
+    """Pick the best supported content coding the client accepts."""
+    for encoding in current_app.config['COMPRESS_ALGORITHMS']:
+        if encoding == 'br' and brotli is None:
+            continue
+        if accept_encodings[encoding] > 0:
+            return encoding
+    return None
+
+def record_compression(app, path, encoding, raw_size, compressed_size, seconds):
+    """Report how long compression took so levels can be tuned."""
+    COMPRESSION_TIME.labels(encoding).observe(seconds)
+    app.logger.debug(
+        f"Compressed {path} with {encoding}: {raw_size} -> {compressed_size} bytes "
+        f"in {seconds * 1000:.2f} ms"
+    )
+
+def compress_response(response):
+    config = current_app.config
+    if not config['COMPRESS_ENABLED']:
+        return response
+    if (request.method == 'HEAD'
+            or response.status_code < 200
+            or response.status_code in (204, 206, 304)
+            or response.direct_passthrough
+            or 'Content-Encoding' in response.headers
+            or response.mimetype not in config['COMPRESS_MIMETYPES']):
+        return response
+    
+    response.vary.add('Accept-Encoding')
+    encoding = negotiate_encoding(request.accept_encodings)
+    if encoding is None:
+        return response
+    
+    if response.is_streamed:
+        response.response = _compress_stream(response.response, encoding)
+    else:
+        data = response.get_data()
+        if len(data) < config['COMPRESS_MIN_SIZE']:
+            return response
+        # Buffered bodies are already in memory: compress them in one call
+        # so the response keeps an exact Content-Length
+        start = time.perf_counter()
+        compressed = _compress(data, encoding)
+        elapsed = time.perf_counter() - start
+        response.set_data(compressed)
+        response.headers['Server-Timing'] = f'compress;dur={elapsed * 1000:.2f};desc="{encoding}"'
+        record_compression(
+            current_app._get_current_object(), request.path,
+            encoding, len(data), len(compressed), elapsed
+        )
+    
+    if response.is_streamed:
+        response.headers.pop('Content-Length', None)
+    response.headers['Content-Encoding'] = encoding
+    
+    # A strong ETag identifies exact bytes, so tag each coding separately
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        response.set_etag(f'{etag}-{encoding}')
+    return response
+
+def _compress(data, encoding):
+    if encoding == 'br':
+        return brotli.compress(data, quality=current_app.config['COMPRESS_BR_LEVEL'])
+    return gzip.compress(data, compresslevel=current_app.config['COMPRESS_LEVEL'], mtime=0)
+
+def _compress_stream(chunks, encoding):
+    # Read settings now: the generator runs after the request context is gone
+    config = current_app.config
+    if encoding == 'br':
+        compressor = brotli.Compressor(quality=config['COMPRESS_BR_LEVEL'])
+        compress, flush, finish = compressor.process, compressor.flush, compressor.finish
+    else:
+        compressor = zlib.compressobj(config['COMPRESS_LEVEL'], zlib.DEFLATED, 31)
+        compress = compressor.compress
+        flush = lambda: compressor.flush(zlib.Z_SYNC_FLUSH)
+        finish = compressor.flush
+    
+    return _generate_compressed(
+        chunks, compress, flush, finish, config['COMPRESS_CHUNK_SIZE'],
+        current_app._get_current_object(), request.path, encoding
+    )
+
+def _generate_compressed(chunks, compress, flush, finish, flush_size, app, path, encoding):
+    raw_size = compressed_size = pending = 0
+    elapsed = 0.0
+    try:
+        for chunk in chunks:
+            if isinstance(chunk, str):
+                chunk = chunk.encode('utf-8')
+            raw_size += len(chunk)
+            pending += len(chunk)
+            start = time.perf_counter()
+            output = compress(chunk)
+            # Flush regularly so streamed rows reach the client promptly
+            if pending >= flush_size:
+                output += flush()
+                pending = 0
+            elapsed += time.perf_counter() - start
+            if output:
+                compressed_size += len(output)
+                yield output
+        
+        start = time.perf_counter()
+        output = finish()
+        elapsed += time.perf_counter() - start
+        compressed_size += len(output)
+        yield output
+    finally:
+        if hasattr(chunks, 'close'):
+            chunks.close()
+    
+    record_compression(app, path, encoding, raw_size, compressed_size, elapsed)
@@ -0,0 +1,68 @@
+import time
+from sqlalchemy import event
+from sqlalchemy.pool import QueuePool
+from app.utils.metrics import POOL_CHECKOUT_WAIT
+
+class TimedQueuePool(QueuePool):
+    """QueuePool that reports how long each checkout waited for a connection."""
+    
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            POOL_CHECKOUT_WAIT.observe(time.perf_counter() - start)
+
+def is_memory_sqlite(database_uri):
+    return database_uri in ('sqlite://', 'sqlite:///:memory:') or 'mode=memory' in database_uri
+
+def build_engine_options(database_uri, pool_size, max_overflow, pool_recycle, pool_timeout,
+                         statement_timeout_ms):
+    """Build SQLALCHEMY_ENGINE_OPTIONS for the given database URI."""
+    if database_uri.startswith('sqlite'):
+        # SQLite tuning is applied per connection through SQLITE_PRAGMAS
+        return {}
+    
+    options = {
+        'pool_size': pool_size,
+        'max_overflow': max_overflow,
+        'pool_recycle': pool_recycle,  # seconds, avoids connections dropped by the server or a failover
+        'pool_timeout': pool_timeout,
+        'pool_pre_ping': True  # detect stale connections before handing them out
+    }
+    if database_uri.startswith(('postgres', 'postgresql')) and statement_timeout_ms:
+        options['connect_args'] = {'options': f'-c statement_timeout={statement_timeout_ms}'}
+    return options
+
+def configure_engine_options(app):
+    """
+    Build the engine options from the DB_* knobs and the database URI the app
+    actually ends up with, so subclasses and test overrides of
+    SQLALCHEMY_DATABASE_URI get matching options.
+    """
+    database_uri = app.config['SQLALCHEMY_DATABASE_URI']
+    options = build_engine_options(
+        database_uri,
+        pool_size=app.config['DB_POOL_SIZE'],
+        max_overflow=app.config['DB_MAX_OVERFLOW'],
+        pool_recycle=app.config['DB_POOL_RECYCLE'],
+        pool_timeout=app.config['DB_POOL_TIMEOUT'],
+        statement_timeout_ms=app.config['DB_STATEMENT_TIMEOUT_MS']
+    )
+    options.update(app.config.get('SQLALCHEMY_ENGINE_OPTIONS') or {})
+    if not is_memory_sqlite(database_uri):
+        options.setdefault('poolclass', TimedQueuePool)
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = options
+
+def install_sqlite_pragmas(app, engine):
+    """Apply SQLITE_PRAGMAS to every new connection of a SQLite engine."""
+    pragmas = app.config['SQLITE_PRAGMAS']
+    if engine.dialect.name != 'sqlite' or not pragmas:
+        return
+    
+    @event.listens_for(engine, 'connect')
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas.items():
+            cursor.execute(f'PRAGMA {name}={value}')
+        cursor.close()
@@ -0,0 +1,76 @@
+from datetime import datetime, timedelta
+from flask import current_app, request
+from sqlalchemy import delete, func, select
+from app import db
+from app.models.deletion_log import DeletionLog
+from app.utils.validators import parse_timestamp
+
+# Bootstrapping a delta client: it holds no rows, so missing tombstones cannot matter
+EPOCH = datetime(1970, 1, 1)
+FULL_SYNC_REQUIRED = ('updated_since is older than DELETION_LOG_RETENTION_DAYS, so deletions may be '
+                      'missing: drop the local copy and sync again from updated_since=1970-01-01')
+
+def delta_since():
+    """
+    The ``?updated_since`` timestamp of a delta request, or None for a full
+    listing. Raises ValueError for an invalid timestamp.
+    """
+    return parse_timestamp(request.args.get('updated_since'), 'updated_since')
+
+def database_now():
+    """
+    Current time on the database clock, as naive UTC like the updated_at columns.
+    
+    Delta requests read on the primary (see ``primary_reads``): a replica that
+    lags behind would answer without rows the returned mark already covers,
+    and the client would never ask for them again.
+    """
+    if db.session.get_bind().dialect.name == 'postgresql':
+        now = func.timezone('utc', func.now())
+    else:
+        now = func.current_timestamp()
+    return db.session.execute(select(now)).scalar()
+
+def high_water_mark(now):
+    """
+    Timestamp for the client to send as ``updated_since`` next time.
+    
+    updated_at is set by the application when a row is flushed, not when it
+    is committed, so a slow transaction, or an app server whose clock trails
+    the database's, can commit rows stamped slightly before ``now``. Handing
+    out a mark DELTA_SYNC_OVERLAP seconds behind means those rows are still
+    picked up; the price is that recent rows may be sent twice, so clients
+    apply deltas as upserts.
+    """
+    return now - timedelta(seconds=current_app.config['DELTA_SYNC_OVERLAP'])
+
+def deletions_expired(since, now):
+    """
+    True when tombstones after ``since`` may already have been pruned, so a
+    delta could not tell the client about every deletion.
+    """
+    cutoff = now - timedelta(days=current_app.config['DELETION_LOG_RETENTION_DAYS'])
+    return EPOCH < since < cutoff
+
+def deleted_ids(table_name, since, **scope):
+    """Ids of ``table_name`` rows deleted since ``since``, optionally filtered by owner_id/user_id."""
+    query = db.session.query(DeletionLog.row_id).filter(
+        DeletionLog.table_name == table_name,
+        DeletionLog.deleted_at >= since
+    )
+    for column, value in scope.items():
+        query = query.filter(getattr(DeletionLog, column) == value)
+    return sorted({row_id for row_id, in query})
+
+def prune_deletion_log(now):
+    """Delete tombstones older than DELETION_LOG_RETENTION_DAYS; returns how many went."""
+    cutoff = now - timedelta(days=current_app.config['DELETION_LOG_RETENTION_DAYS'])
+    result = db.session.execute(delete(DeletionLog).where(DeletionLog.deleted_at < cutoff))
+    db.session.commit()
+    return result.rowcount
+
+def init_delta_sync(app):
+    @app.cli.command('prune-deletion-log')
+    def prune_deletion_log_command():
+        """Delete deletion_log rows past DELETION_LOG_RETENTION_DAYS (run daily)."""
+        print(f'pruned {prune_deletion_log(database_now())} tombstones')
@@ -1,15 +1,29 @@
 import os
-from sib_api_v3_sdk import ApiClient, Configuration, TransactionalEmailsApi
-from sib_api_v3_sdk.models import SendSmtpEmail, SendSmtpEmailTo
 from flask import current_app
+from app.utils.metrics import track_outbound
 import jwt
 from datetime import datetime, timedelta
 
+_sib = None
+
+def sib():
+    """
+    The Sendinblue SDK module.
+    
+    It is slow to import and most requests never send an email, so it is
+    imported on first use rather than at worker startup.
+    """
+    global _sib
+    if _sib is None:
+        import sib_api_v3_sdk
+        _sib = sib_api_v3_sdk
+    return _sib
+
 def get_email_client():
-    configuration = Configuration()
+    configuration = sib().Configuration()
     configuration.api_key['api-key'] = current_app.config['SENDINBLUE_API_KEY']
-    api_client = ApiClient(configuration)
-    return TransactionalEmailsApi(api_client)
+    api_client = sib().ApiClient(configuration)
+    return sib().TransactionalEmailsApi(api_client)
 
 def generate_verification_token(user):
     payload = {
@@ -27,8 +41,8 @@ def send_verification_email(user):
         verification_url = f"{current_app.config['FRONTEND_URL']}/verify-email/{token}"
         
         # Create email content
-        to = [SendSmtpEmailTo(email=user.email, name=f"{user.first_name} {user.last_name}")]
-        email = SendSmtpEmail(
+        to = [sib().SendSmtpEmailTo(email=user.email, name=f"{user.first_name} {user.last_name}")]
+        email = sib().SendSmtpEmail(
             to=to,
             subject="Verify your Spacer account",
             html_content=f"""
@@ -42,7 +56,8 @@ def send_verification_email(user):
         )
         
         # Send email
-        api_instance.send_transac_email(email)
+        with track_outbound('sendinblue', 'verification'):
+            api_instance.send_transac_email(email, _request_timeout=current_app.config['EMAIL_TIMEOUT'])
         return True
     except Exception as e:
         current_app.logger.error(f"Failed to send verification email: {str(e)}")
@@ -54,8 +69,8 @@ def send_booking_confirmation_email(booking):
         user = booking.user
         space = booking.space
         
-        to = [SendSmtpEmailTo(email=user.email, name=f"{user.first_name} {user.last_name}")]
-        email = SendSmtpEmail(
+        to = [sib().SendSmtpEmailTo(email=user.email, name=f"{user.first_name} {user.last_name}")]
+        email = sib().SendSmtpEmail(
             to=to,
             subject="Booking Confirmation - Spacer",
             html_content=f"""
@@ -73,7 +88,8 @@ def send_booking_confirmation_email(booking):
             """
         )
         
-        api_instance.send_transac_email(email)
+        with track_outbound('sendinblue', 'booking_confirmation'):
+            api_instance.send_transac_email(email, _request_timeout=current_app.config['EMAIL_TIMEOUT'])
         return True
     except Exception as e:
         current_app.logger.error(f"Failed to send booking confirmation email: {str(e)}")
@@ -109,8 +125,8 @@ def send_invoice_email(user, booking, invoice_number, payment_method):
         # Calculate duration in hours
         duration_hours = round((booking.end_time - booking.start_time).total_seconds() / 3600)
         
-        to = [SendSmtpEmailTo(email=user.email, name=f"{user.first_name} {user.last_name}")]
-        email = SendSmtpEmail(
+        to = [sib().SendSmtpEmailTo(email=user.email, name=f"{user.first_name} {user.last_name}")]
+        email = sib().SendSmtpEmail(
             to=to,
             subject=f"Invoice #{invoice_number} - Spacer Booking",
             html_content=f"""
@@ -182,7 +198,8 @@ def send_invoice_email(user, booking, invoice_number, payment_method):
             """
         )
         
-        api_instance.send_transac_email(email)
+        with track_outbound('sendinblue', 'invoice'):
+            api_instance.send_transac_email(email, _request_timeout=current_app.config['EMAIL_TIMEOUT'])
         return True
     except Exception as e:
         current_app.logger.error(f"Failed to send invoice email: {str(e)}")
@@ -0,0 +1,86 @@
+import csv
+import io
+from datetime import datetime
+from flask import Response, current_app, stream_with_context
+from app import db
+from app.models.booking import Booking, Payment
+from app.models.user import User
+
+# Exported columns per dataset; secrets such as password hashes are never listed
+EXPORTS = {
+    'bookings': (Booking, [
+        'id', 'space_id', 'user_id', 'start_time', 'end_time', 'total_price', 'purpose',
+        'status', 'payment_status', 'created_at', 'updated_at'
+    ]),
+    'payments': (Payment, [
+        'id', 'booking_id', 'amount', 'payment_method', 'transaction_id', 'status',
+        'created_at', 'updated_at'
+    ]),
+    'users': (User, [
+        'id', 'email', 'first_name', 'last_name', 'role', 'phone', 'is_verified',
+        'created_at', 'updated_at'
+    ]),
+}
+
+FORMATS = {
+    'ndjson': 'application/x-ndjson',
+    'csv': 'text/csv',
+}
+
+def export_rows(dataset, created_from=None, created_to=None):
+    """
+    Yield the rows of ``dataset`` in batches, ordered by id.
+
+    The query runs with ``yield_per``, which streams from a server-side cursor
+    on PostgreSQL; only one batch of plain tuples is held at a time, and no
+    ORM objects are built, so memory stays flat however many rows there are.
+    """
+    model, columns = EXPORTS[dataset]
+    table = model.__table__
+    query = db.select(*(table.c[column] for column in columns)).order_by(table.c.id)
+    if created_from is not None:
+        query = query.where(table.c.created_at >= created_from)
+    if created_to is not None:
+        query = query.where(table.c.created_at < created_to)
+
+    result = db.session.execute(
+        query.execution_options(yield_per=current_app.config['EXPORT_BATCH_SIZE'])
+    )
+    try:
+        yield from result.partitions()
+    finally:
+        result.close()
+
+def _ndjson_chunks(columns, batches):
+    dumpb = current_app.json.dumpb
+    for batch in batches:
+        yield b''.join(dumpb(dict(zip(columns, row))) + b'\n' for row in batch)
+
+def _csv_chunks(columns, batches):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    yield buffer.getvalue()
+    buffer.seek(0)
+    buffer.truncate()
+    for batch in batches:
+        writer.writerows(
+            [value.isoformat() if isinstance(value, datetime) else value for value in row]
+            for row in batch
+        )
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+
+def export_response(dataset, export_format, created_from=None, created_to=None):
+    """Build a streamed attachment response for an export."""
+    columns = EXPORTS[dataset][1]
+    batches = export_rows(dataset, created_from, created_to)
+    chunks = (_csv_chunks if export_format == 'csv' else _ndjson_chunks)(columns, batches)
+    filename = f"{dataset}-{datetime.utcnow().strftime('%Y%m%dT%H%M%S')}.{export_format}"
+    # stream_with_context keeps the request context, and with it the database
+    # session, alive while the body is being sent
+    response = Response(stream_with_context(chunks), mimetype=FORMATS[export_format])
+    response.headers['Content-Disposition'] = f'attachment; filename="{filename}"'
+    response.headers['Cache-Control'] = 'no-store'
+    return response
@@ -0,0 +1,139 @@
+import hashlib
+from datetime import timezone
+from functools import wraps
+from flask import current_app, g, make_response, request
+
+def make_etag(*parts):
+    """Strong ETag value built from the given validator parts."""
+    return hashlib.sha1('|'.join(str(part) for part in parts).encode()).hexdigest()
+
+def _strip_coding(tag):
+    # Compressed responses carry "<etag>-<coding>", see app/utils/compression.py
+    for encoding in current_app.config['COMPRESS_ALGORITHMS']:
+        if tag.endswith(f'-{encoding}'):
+            return tag[:-len(encoding) - 1]
+    return tag
+
+def _matching_tag(etag):
+    """The tag from If-None-Match that matches ``etag``, or None."""
+    for tag in request.headers.get('If-None-Match', '').split(','):
+        tag = tag.strip()
+        if tag == '*':
+            return etag
+        if tag.startswith('W/'):
+            tag = tag[2:]
+        tag = tag.strip('"')
+        if _strip_coding(tag) == etag:
+            return tag
+    return None
+
+def _not_modified_since(last_modified):
+    since = request.if_modified_since
+    if since is None or last_modified is None:
+        return False
+    if last_modified.tzinfo is None:
+        last_modified = last_modified.replace(tzinfo=timezone.utc)
+    # HTTP dates only have second precision
+    return last_modified.replace(microsecond=0) <= since
+
+def current_etag():
+    """ETag computed by ``conditional_get`` for this request, if any."""
+    return g.get('etag')
+
+def conditional_get(validators):
+    """Answer conditional GETs with 304 before the view loads and serializes anything.
+
+    ``validators`` is called with the view arguments and returns ``(etag, last_modified)``
+    from a cheap query, or None to let the view handle the request (e.g. to return 404).
+    """
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            result = validators(*args, **kwargs)
+            if result is None:
+                return fn(*args, **kwargs)
+
+            etag, last_modified = result
+            g.etag = etag
+            if 'If-None-Match' in request.headers:
+                matched = _matching_tag(etag)
+                not_modified = matched is not None
+            else:
+                matched = etag
+                not_modified = _not_modified_since(last_modified)
+
+            if not_modified:
+                response = make_response('', 304)
+                response.set_etag(matched)
+            else:
+                response = make_response(fn(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+                response.set_etag(etag)
+            if last_modified is not None:
+                response.last_modified = last_modified
+            return response
+        return wrapper
+    return decorator
+
+CACHE_CONTROL_DIRECTIVES = (
+    ('public', 'public'),
+    ('max_age', 'max-age'),
+    ('s_maxage', 's-maxage'),
+    ('stale_while_revalidate', 'stale-while-revalidate'),
+    ('stale_if_error', 'stale-if-error')
+)
+
+def cache_control(**policy):
+    """Declare the Cache-Control policy of a public view, see ``init_cache_control``.
+
+    Accepts ``max_age``, ``s_maxage``, ``stale_while_revalidate``, ``stale_if_error``
+    (seconds) and ``vary`` (list of request headers).
+    """
+    def decorator(fn):
+        fn.cache_control_policy = policy
+        return fn
+    return decorator
+
+def _cache_control_header(policy):
+    policy = {'public': True, **policy}
+    directives = []
+    for key, name in CACHE_CONTROL_DIRECTIVES:
+        value = policy.get(key)
+        if value is True:
+            directives.append(name)
+        elif value is not None and value is not False:
+            directives.append(f'{name}={int(value)}')
+    return ', '.join(directives)
+
+def init_cache_control(app):
+    """Apply per-endpoint Cache-Control policies to successful GET responses.
+
+    Policies come from the view's ``@cache_control`` decorator, overridden by
+    ``CACHE_CONTROL_POLICIES`` (which also covers endpoints we do not own, like the
+    flasgger spec). Responses to requests carrying credentials are never public.
+    """
+    overrides = app.config['CACHE_CONTROL_POLICIES']
+
+    @app.after_request
+    def apply_cache_control(response):
+        if request.method not in ('GET', 'HEAD'):
+            return response
+
+        if 'Authorization' in request.headers or 'Set-Cookie' in response.headers:
+            # Shared caches must never store a response meant for one user
+            if response.cache_control.public or 'Cache-Control' not in response.headers:
+                response.headers['Cache-Control'] = 'private, no-cache'
+            return response
+
+        if response.status_code not in (200, 304) or 'Cache-Control' in response.headers:
+            return response
+        view = app.view_functions.get(request.endpoint)
+        policy = {**getattr(view, 'cache_control_policy', {}), **overrides.get(request.endpoint, {})}
+        if not policy:
+            return response
+
+        response.headers['Cache-Control'] = _cache_control_header(policy)
+        for header in policy.get('vary', ()):
+            response.vary.add(header)
+        return response
@@ -0,0 +1,98 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from flask import current_app
+from app.models.space import SpaceImage
+from app.models.user import User
+from app.utils.storage import get_storage
+
+def find_referenced_urls(urls):
+    """Return the subset of ``urls`` still referenced by the database."""
+    if not urls:
+        return set()
+    referenced = {
+        row.image_url for row in
+        SpaceImage.query.with_entities(SpaceImage.image_url).filter(SpaceImage.image_url.in_(urls))
+    }
+    referenced.update(
+        row.avatar_url for row in
+        User.query.with_entities(User.avatar_url).filter(User.avatar_url.in_(urls))
+    )
+    return referenced
+
+def collect_garbage(folders=None, cursors=None, max_pages=None, page_size=None,
+                    max_workers=None, min_age=None, dry_run=False):
+    """
+    Delete stored images that no database row references any more.
+    
+    The storage backend is walked one page at a time and each page is
+    checked against the database, so memory use is bounded by ``page_size``.
+    Objects younger than ``min_age`` are skipped to avoid racing uploads that
+    have not been committed yet. ``cursors`` maps folder names to the cursor
+    returned by a previous run, which lets large catalogues be collected
+    incrementally across runs limited by ``max_pages``.
+    
+    Returns a report dict including ``bytes_reclaimed``. Its ``pending`` entry
+    maps every folder that was not fully scanned to the cursor to resume
+    from (None means the folder has not been started); it is empty once the
+    whole catalogue has been collected.
+    """
+    config = current_app.config
+    folders = folders or config['IMAGE_GC_FOLDERS']
+    cursors = dict(cursors or {})
+    page_size = page_size or config['IMAGE_GC_PAGE_SIZE']
+    max_workers = max_workers or config['IMAGE_GC_MAX_WORKERS']
+    if min_age is None:
+        min_age = timedelta(seconds=config['IMAGE_GC_MIN_AGE'])
+    cutoff = datetime.utcnow() - min_age
+    storage = get_storage()
+    app = current_app._get_current_object()
+    
+    def delete(stored_object):
+        with app.app_context():
+            return storage.delete(stored_object.key)
+    
+    report = {
+        'scanned': 0,
+        'orphaned': 0,
+        'deleted': 0,
+        'failed': 0,
+        'bytes_reclaimed': 0,
+        'pages': 0,
+        'dry_run': dry_run
+    }
+    pending = {}
+    
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for folder in folders:
+            cursor = cursors.get(folder)
+            while True:
+                if max_pages is not None and report['pages'] >= max_pages:
+                    pending[folder] = cursor
+                    break
+                
+                objects, cursor = storage.list_objects(folder, cursor, page_size)
+                report['pages'] += 1
+                report['scanned'] += len(objects)
+                
+                referenced = find_referenced_urls([obj.url for obj in objects])
+                orphans = [
+                    obj for obj in objects
+                    if obj.url not in referenced and obj.created_at < cutoff
+                ]
+                report['orphaned'] += len(orphans)
+                
+                if orphans and not dry_run:
+                    for obj, deleted in zip(orphans, executor.map(delete, orphans)):
+                        if deleted:
+                            report['deleted'] += 1
+                            report['bytes_reclaimed'] += obj.size
+                        else:
+                            report['failed'] += 1
+                elif dry_run:
+                    report['bytes_reclaimed'] += sum(obj.size for obj in orphans)
+                
+                if cursor is None:
+                    break
+    
+    report['pending'] = pending
+    return report
@@ -0,0 +1,152 @@
+import os
+import queue
+import threading
+from flask import current_app
+from app import db
+from app.models.space import SpaceImage
+from app.utils.images import upload_image_deduplicated
+
+# Uploads deferred by ASYNC_IMAGE_PROCESSING are spooled to
+# IMAGE_SPOOL_DIR/<space_image_id>.upload and finished by a background
+# thread running in each worker process.
+_queue = queue.Queue()
+_worker_lock = threading.Lock()
+_worker_pid = None
+
+def _spool_path(spool_dir, image_id):
+    return os.path.join(spool_dir, f'{image_id}.upload')
+
+def spool_images(spooled_images):
+    """
+    Save the raw bytes of ``(space_image, image_file)`` pairs to the spool.
+    
+    Flushes the session so every SpaceImage has an ID. Call
+    ``enqueue_images`` once the transaction is committed.
+    """
+    if not spooled_images:
+        return
+    db.session.flush()
+    spool_dir = current_app.config['IMAGE_SPOOL_DIR']
+    os.makedirs(spool_dir, exist_ok=True)
+    for space_image, image_file in spooled_images:
+        path = _spool_path(spool_dir, space_image.id)
+        image_file.seek(0)
+        image_file.save(path + '.part')
+        os.replace(path + '.part', path)
+
+def enqueue_images(image_ids):
+    """Queue spooled images for processing by the background worker."""
+    if not image_ids:
+        return
+    _ensure_worker(current_app._get_current_object())
+    for image_id in image_ids:
+        _queue.put(image_id)
+
+def init_image_worker(app):
+    """Recover leftover spool files on the first request of each process."""
+    # Not done in create_app, so CLI commands such as `flask db upgrade` do
+    # not start a worker thread
+    recovered_pid = None
+    
+    @app.before_request
+    def _recover_on_first_request():
+        nonlocal recovered_pid
+        if recovered_pid != os.getpid():
+            recovered_pid = os.getpid()
+            recover_spooled_images(app)
+
+def _pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+def recover_spooled_images(app):
+    """
+    Queue spool files left behind by a previous process.
+    
+    Besides unclaimed ``<id>.upload`` files this picks up
+    ``<id>.upload.<pid>`` files claimed by a process that died mid-upload;
+    they are renamed back so the usual claim still guards against two
+    processes recovering the same file.
+    """
+    spool_dir = app.config['IMAGE_SPOOL_DIR']
+    if not os.path.isdir(spool_dir):
+        return
+    image_ids = []
+    for name in os.listdir(spool_dir):
+        image_id, _, rest = name.partition('.upload')
+        if not image_id.isdigit():
+            continue
+        if rest:
+            pid = rest[1:]
+            if not rest.startswith('.') or not pid.isdigit() or _pid_alive(int(pid)):
+                continue
+            try:
+                os.rename(os.path.join(spool_dir, name), _spool_path(spool_dir, image_id))
+            except FileNotFoundError:
+                continue
+        image_ids.append(int(image_id))
+    if image_ids:
+        _ensure_worker(app)
+        for image_id in image_ids:
+            _queue.put(image_id)
+
+def _ensure_worker(app):
+    global _worker_pid
+    # Threads do not survive fork, so start one per worker process
+    with _worker_lock:
+        if _worker_pid == os.getpid():
+            return
+        thread = threading.Thread(target=_run_worker, args=(app,), name='image-worker', daemon=True)
+        thread.start()
+        _worker_pid = os.getpid()
+
+def _run_worker(app):
+    while True:
+        image_id = _queue.get()
+        try:
+            with app.app_context():
+                process_spooled_image(image_id)
+        except Exception as e:
+            app.logger.error(f"Image worker failed on image {image_id}: {str(e)}")
+        finally:
+            _queue.task_done()
+
+def process_spooled_image(image_id):
+    """Upload a spooled image and mark its SpaceImage row as ready."""
+    spool_dir = current_app.config['IMAGE_SPOOL_DIR']
+    path = _spool_path(spool_dir, image_id)
+    claimed_path = f'{path}.{os.getpid()}'
+    try:
+        # Claim the file atomically so only one process handles it
+        os.rename(path, claimed_path)
+    except FileNotFoundError:
+        return
+    
+    try:
+        space_image = db.session.get(SpaceImage, image_id)
+        if space_image is None or space_image.status != 'processing':
+            return
+        
+        try:
+            with open(claimed_path, 'rb') as image_file:
+                image_url, _ = upload_image_deduplicated(
+                    image_file, content_hash=space_image.content_hash
+                )
+            space_image.image_url = image_url
+            space_image.status = 'ready'
+        except Exception as e:
+            current_app.logger.error(f"Failed to process image {image_id}: {str(e)}")
+            db.session.rollback()
+            space_image = db.session.get(SpaceImage, image_id)
+            if space_image is None:
+                return
+            space_image.status = 'failed'
+        db.session.commit()
+    finally:
+        if os.path.exists(claimed_path):
+            os.remove(claimed_path)
@@ -0,0 +1,105 @@
+from flask import current_app
+from PIL import Image
+import hashlib
+import io
+import sys
+from app.models.space import SpaceImage
+from app.models.user import User
+from app.utils.storage import get_storage
+
+def resize_image(image_file, max_size=(800, 800)):
+    """Resize image while maintaining aspect ratio."""
+    img = Image.open(image_file)
+    
+    # Convert to RGB if necessary
+    if img.mode in ('RGBA', 'P'):
+        img = img.convert('RGB')
+    
+    # Calculate new dimensions
+    width, height = img.size
+    if width > max_size[0] or height > max_size[1]:
+        ratio = min(max_size[0] / width, max_size[1] / height)
+        new_size = (int(width * ratio), int(height * ratio))
+        img = img.resize(new_size, Image.Resampling.LANCZOS)
+    
+    # Save to bytes
+    output = io.BytesIO()
+    img.save(output, format='JPEG', quality=85)
+    output.seek(0)
+    return output
+
+def run_cpu_bound(func, *args):
+    """
+    Call ``func(*args)`` without stalling other requests under gevent.
+    
+    In a gevent worker every request, and the ASYNC_IMAGE_PROCESSING worker
+    thread, is a greenlet on one OS thread, so CPU-heavy work would block
+    them all. There it runs on gevent's pool of native threads instead;
+    Pillow releases the GIL while resizing and encoding. Elsewhere it is a
+    plain call.
+    """
+    if 'gevent' in sys.modules:
+        from gevent import get_hub, monkey
+        if monkey.is_module_patched('threading'):
+            return get_hub().threadpool.apply(func, args)
+    return func(*args)
+
+def hash_image(image_file, chunk_size=64 * 1024):
+    """Return the SHA-256 hex digest of the raw uploaded image bytes."""
+    digest = hashlib.sha256()
+    image_file.seek(0)
+    for chunk in iter(lambda: image_file.read(chunk_size), b''):
+        digest.update(chunk)
+    image_file.seek(0)
+    return digest.hexdigest()
+
+def find_uploaded_image(content_hash):
+    """Return the URL of an already uploaded image with the same content, if any."""
+    # Images still processing, or whose processing failed, have no URL yet
+    space_image = SpaceImage.query.with_entities(SpaceImage.image_url).filter(
+        SpaceImage.content_hash == content_hash,
+        SpaceImage.image_url.isnot(None)
+    ).first()
+    if space_image:
+        return space_image.image_url
+    
+    user = User.query.with_entities(User.avatar_url).filter(
+        User.avatar_hash == content_hash,
+        User.avatar_url.isnot(None)
+    ).first()
+    return user.avatar_url if user else None
+
+def upload_image(image_file, folder='spacer', content_hash=None):
+    """Resize an image and store it with the configured storage backend."""
+    if content_hash is None:
+        content_hash = hash_image(image_file)
+    try:
+        resized_image = run_cpu_bound(resize_image, image_file)
+        return get_storage().save(resized_image, folder, content_hash)
+    except Exception as e:
+        current_app.logger.error(f"Failed to upload image: {str(e)}")
+        raise
+
+def upload_image_deduplicated(image_file, folder='spacer', content_hash=None):
+    """
+    Upload image unless identical content was uploaded before.
+    
+    Returns a ``(image_url, content_hash)`` tuple. When an image with the same
+    SHA-256 hash is already stored, its URL is reused and both the resize and
+    the upload are skipped.
+    """
+    if content_hash is None:
+        content_hash = hash_image(image_file)
+    
+    image_url = find_uploaded_image(content_hash)
+    if image_url is None:
+        image_url = upload_image(image_file, folder=folder, content_hash=content_hash)
+    return image_url, content_hash
+
+def delete_image(image_url):
+    """Delete a stored image by URL. Returns True on success."""
+    storage = get_storage()
+    key = storage.key_for_url(image_url)
+    if key is None:
+        return False
+    return storage.delete(key)
@@ -0,0 +1,70 @@
+import dataclasses
+import decimal
+import uuid
+from datetime import date, datetime, time
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is optional
+    orjson = None
+
+def _default(o):
+    """Serialize types the JSON encoder does not handle natively."""
+    # orjson handles dates itself; this branch only runs on the stdlib fallback
+    if isinstance(o, (datetime, date, time)):
+        return o.isoformat()
+    if isinstance(o, (decimal.Decimal, uuid.UUID)):
+        return str(o)
+    if dataclasses.is_dataclass(o):
+        return dataclasses.asdict(o)
+    if hasattr(o, '__html__'):
+        return str(o.__html__())
+    raise TypeError(f'Object of type {type(o).__name__} is not JSON serializable')
+
+class FastJSONProvider(DefaultJSONProvider):
+    """
+    JSON provider backed by orjson, falling back to the stdlib encoder.
+    
+    Datetimes are serialized as ISO 8601 strings (unlike Flask's default
+    RFC 822 format), so models can return datetime objects from ``to_dict``.
+    """
+    
+    default = staticmethod(_default)
+    sort_keys = False
+    
+    def _orjson_options(self, pretty=False):
+        options = orjson.OPT_NON_STR_KEYS
+        if self.sort_keys:
+            options |= orjson.OPT_SORT_KEYS
+        if pretty:
+            options |= orjson.OPT_INDENT_2
+        return options
+    
+    def dumps(self, obj, **kwargs):
+        if orjson is None or kwargs:
+            return super().dumps(obj, **kwargs)
+        return orjson.dumps(obj, default=_default, option=self._orjson_options()).decode('utf-8')
+    
+    def dumpb(self, obj):
+        """Serialize ``obj`` to UTF-8 encoded JSON bytes."""
+        if orjson is None:
+            return self.dumps(obj).encode('utf-8')
+        return orjson.dumps(obj, default=_default, option=self._orjson_options())
+    
+    def loads(self, s, **kwargs):
+        if orjson is None or kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+    
+    def response(self, *args, **kwargs):
+        if orjson is None:
+            return super().response(*args, **kwargs)
+        
+        obj = self._prepare_response_obj(args, kwargs)
+        pretty = self.compact is False or (self.compact is None and self._app.debug)
+        options = self._orjson_options(pretty=pretty) | orjson.OPT_APPEND_NEWLINE
+        return self._app.response_class(
+            orjson.dumps(obj, default=_default, option=options),
+            mimetype=self.mimetype
+        )
@@ -0,0 +1,131 @@
+import hmac
+import os
+import time
+from contextlib import contextmanager
+from flask import Response, abort, current_app, g, has_request_context, request
+from prometheus_client import (
+    CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Histogram, generate_latest, multiprocess
+)
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# When PROMETHEUS_MULTIPROC_DIR is set (see gunicorn.conf.py), prometheus_client
+# keeps values in per-process files there and /metrics aggregates them, so
+# every gunicorn worker reports into the same series.
+
+REQUEST_LATENCY = Histogram(
+    'spacer_http_request_duration_seconds',
+    'HTTP request latency',
+    ['blueprint', 'endpoint', 'method', 'status']
+)
+REQUEST_DB_QUERIES = Histogram(
+    'spacer_http_request_db_queries',
+    'SQL statements executed per request',
+    ['blueprint', 'endpoint'],
+    buckets=(0, 1, 2, 3, 5, 10, 20, 50, 100, 250, 500, 1000)
+)
+REQUEST_DB_TIME = Histogram(
+    'spacer_http_request_db_seconds',
+    'Time spent executing SQL per request',
+    ['blueprint', 'endpoint']
+)
+OUTBOUND_LATENCY = Histogram(
+    'spacer_outbound_request_duration_seconds',
+    'Latency of calls to external services',
+    ['service', 'operation', 'outcome']
+)
+COMPRESSION_TIME = Histogram(
+    'spacer_response_compression_seconds',
+    'Time spent compressing response bodies',
+    ['encoding'],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+)
+POOL_CHECKOUT_WAIT = Histogram(
+    'spacer_db_pool_checkout_wait_seconds',
+    'Time spent waiting for a database connection from the pool',
+    buckets=(0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 30.0)
+)
+CACHE_REQUESTS = Counter(
+    'spacer_cache_requests_total',
+    'Cache lookups by cache name and result (hit or miss)',
+    ['cache', 'result']
+)
+REPLICA_FALLBACKS = Counter(
+    'spacer_db_replica_fallbacks_total',
+    'Replica health checks that sent reads back to the primary',
+    ['reason']
+)
+
+_sql_listeners_installed = False
+
+def init_metrics(app):
+    """Record per-request metrics and expose them on /metrics."""
+    if not app.config['METRICS_ENABLED']:
+        return
+    _install_sql_listeners()
+    app.before_request(_start_request_timer)
+    app.after_request(_record_request)
+    app.add_url_rule('/metrics', 'metrics', metrics_view, methods=['GET'])
+
+@contextmanager
+def track_outbound(service, operation):
+    """Time a call to an external service such as M-Pesa or Cloudinary."""
+    outcome = 'error'
+    start = time.perf_counter()
+    try:
+        yield
+        outcome = 'success'
+    finally:
+        OUTBOUND_LATENCY.labels(service, operation, outcome).observe(time.perf_counter() - start)
+
+def metrics_view():
+    # Route names, error rates and pool stats are not public: without a
+    # configured token the endpoint does not exist
+    token = current_app.config['METRICS_AUTH_TOKEN']
+    if not token:
+        abort(404)
+    if not hmac.compare_digest(request.headers.get('Authorization', ''), f'Bearer {token}'):
+        return Response('Unauthorized\n', status=401, mimetype='text/plain')
+    
+    if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return Response(generate_latest(registry), content_type=CONTENT_TYPE_LATEST)
+
+def _start_request_timer():
+    g.metrics_start = time.perf_counter()
+    g.metrics_db_queries = 0
+    g.metrics_db_time = 0.0
+
+def _record_request(response):
+    start = g.get('metrics_start')
+    if start is None or request.endpoint == 'metrics':
+        return response
+    
+    blueprint = request.blueprint or ''
+    endpoint = request.endpoint or 'unmatched'
+    REQUEST_LATENCY.labels(
+        blueprint, endpoint, request.method, str(response.status_code)
+    ).observe(time.perf_counter() - start)
+    REQUEST_DB_QUERIES.labels(blueprint, endpoint).observe(g.metrics_db_queries)
+    REQUEST_DB_TIME.labels(blueprint, endpoint).observe(g.metrics_db_time)
+    return response
+
+def _install_sql_listeners():
+    global _sql_listeners_installed
+    if _sql_listeners_installed:
+        return
+    event.listen(Engine, 'before_cursor_execute', _before_cursor_execute)
+    event.listen(Engine, 'after_cursor_execute', _after_cursor_execute)
+    _sql_listeners_installed = True
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault('metrics_query_start', []).append(time.perf_counter())
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info['metrics_query_start'].pop()
+    if has_request_context() and 'metrics_start' in g:
+        g.metrics_db_queries += 1
+        g.metrics_db_time += elapsed
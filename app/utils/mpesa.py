@@ -3,6 +3,7 @@ import base64
 from datetime import datetime
 from flask import current_app
 import json
+from app.utils.metrics import track_outbound
 
 class MpesaAPI:
     def __init__(self):
@@ -12,9 +13,12 @@ class MpesaAPI:
         self.passkey = current_app.config['MPESA_PASSKEY']
         self.callback_url = f"{current_app.config['BACKEND_URL']}/api/payments/mpesa-callback"
         
+        self.timeout = current_app.config['MPESA_TIMEOUT']
+        
         # API endpoints
-        self.auth_url = "https://sandbox.safaricom.co.ke/oauth/v1/generate?grant_type=client_credentials"
-        self.stk_push_url = "https://sandbox.safaricom.co.ke/mpesa/stkpush/v1/processrequest"
+        base_url = current_app.config['MPESA_BASE_URL'].rstrip('/')
+        self.auth_url = f"{base_url}/oauth/v1/generate?grant_type=client_credentials"
+        self.stk_push_url = f"{base_url}/mpesa/stkpush/v1/processrequest"
     
     def get_auth_token(self):
         """Get OAuth token from Safaricom."""
@@ -27,7 +31,8 @@ class MpesaAPI:
                 "Authorization": f"Basic {auth_string}"
             }
             
-            response = requests.get(self.auth_url, headers=headers)
+            with track_outbound('mpesa', 'auth'):
+                response = requests.get(self.auth_url, headers=headers, timeout=self.timeout)
             response.raise_for_status()
             
             result = response.json()
@@ -76,7 +81,8 @@ class MpesaAPI:
                 "TransactionDesc": f"Payment for booking {booking_id}"
             }
             
-            response = requests.post(self.stk_push_url, json=payload, headers=headers)
+            with track_outbound('mpesa', 'stk_push'):
+                response = requests.post(self.stk_push_url, json=payload, headers=headers, timeout=self.timeout)
             response.raise_for_status()
             
             result = response.json()
@@ -0,0 +1,277 @@
+import cProfile
+import glob
+import json
+import os
+import pstats
+import random
+import re
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from datetime import datetime
+from flask import current_app, g, has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+def frame_label(frame):
+    code = frame.f_code
+    return f'{os.path.basename(code.co_filename)}:{code.co_name}'
+
+class StackSampler:
+    """Samples the stack of one thread at a fixed interval.
+
+    The result is in the folded ("collapsed") format read by flamegraph.pl,
+    speedscope and most other flame graph tools: one ``frame;frame;frame count``
+    line per distinct stack, root first.
+    """
+
+    def __init__(self, thread_id=None, interval=0.005):
+        self.thread_id = thread_id or threading.get_ident()
+        self.interval = interval
+        self.stacks = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _sample(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            labels = []
+            while frame is not None:
+                labels.append(frame_label(frame))
+                frame = frame.f_back
+            self.stacks[';'.join(reversed(labels))] += 1
+            self.samples += 1
+
+    def start(self):
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._sample, name='stack-sampler', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        return self
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def folded(self):
+        return ''.join(f'{stack} {count}\n' for stack, count in self.stacks.most_common())
+
+PROFILE_ID = re.compile(r'^[0-9T]+-[0-9a-f]{8}$')
+# Keep the SQL timeline of pathological requests to a readable size
+MAX_STATEMENTS = 500
+TOP_ENTRIES = 30
+
+def init_profiling(app):
+    """
+    Profile individual requests on demand.
+
+    Disabled unless PROFILING_ENABLED is set. A request is profiled when an
+    admin sends the PROFILE_HEADER header (its value may pick the mode,
+    'cprofile' or 'stack'), or at random with probability
+    PROFILE_SAMPLE_RATE. The profile and the request's SQL timeline are saved
+    to PROFILE_DIR, which keeps the newest PROFILE_RETENTION profiles, and
+    the response carries the id in X-Profile-Id.
+    """
+    if not app.config['PROFILING_ENABLED']:
+        return
+    os.makedirs(app.config['PROFILE_DIR'], exist_ok=True)
+    _install_sql_listeners()
+    app.before_request(_start_profile)
+    app.after_request(_finish_profile)
+    app.teardown_request(_stop_profile)
+
+def _requested_by_admin():
+    from flask_jwt_extended import get_jwt_identity, verify_jwt_in_request
+    from app.models.user import User
+    try:
+        verify_jwt_in_request(optional=True)
+    except Exception:
+        return False
+    user_id = get_jwt_identity()
+    user = User.query.get(user_id) if user_id is not None else None
+    return user is not None and user.role == 'admin'
+
+def _start_profile():
+    config = current_app.config
+    mode = config['PROFILE_MODE']
+    header = request.headers.get(config['PROFILE_HEADER'])
+    if header is not None and _requested_by_admin():
+        trigger = 'header'
+        if header in ('cprofile', 'stack'):
+            mode = header
+    elif config['PROFILE_SAMPLE_RATE'] and random.random() < config['PROFILE_SAMPLE_RATE']:
+        trigger = 'sampled'
+    else:
+        return
+
+    profiler = None
+    if mode == 'cprofile':
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:
+            # Another profiler is active in this interpreter (Python 3.12+)
+            profiler, mode = None, 'stack'
+    if profiler is None:
+        profiler = StackSampler(interval=config['PROFILE_SAMPLE_INTERVAL']).start()
+
+    g.profile = {
+        'id': f"{datetime.utcnow().strftime('%Y%m%dT%H%M%S%f')}-{uuid.uuid4().hex[:8]}",
+        'mode': mode,
+        'trigger': trigger,
+        'profiler': profiler,
+        'start': time.perf_counter(),
+        'started_at': datetime.utcnow().isoformat(timespec='milliseconds'),
+        'sql': [],
+        'sql_dropped': 0
+    }
+
+def _stop_profile(exc=None):
+    profile = g.get('profile')
+    if profile is None or 'duration' in profile:
+        return
+    profile['duration'] = time.perf_counter() - profile['start']
+    if profile['mode'] == 'cprofile':
+        profile['profiler'].disable()
+    else:
+        profile['profiler'].stop()
+
+def _finish_profile(response):
+    profile = g.get('profile')
+    if profile is None:
+        return response
+    _stop_profile()
+    try:
+        save_profile(profile, response.status_code)
+    except OSError as e:
+        current_app.logger.warning(f"Could not save profile {profile['id']}: {e}")
+        return response
+    response.headers['X-Profile-Id'] = profile['id']
+    return response
+
+def save_profile(profile, status_code):
+    directory = current_app.config['PROFILE_DIR']
+    base = os.path.join(directory, profile['id'])
+    profiler = profile['profiler']
+    if profile['mode'] == 'cprofile':
+        profile_file = base + '.prof'
+        profiler.dump_stats(profile_file)
+        top = _cprofile_top(profiler)
+    else:
+        profile_file = base + '.folded'
+        with open(profile_file, 'w') as f:
+            f.write(profiler.folded())
+        top = _sampler_top(profiler)
+
+    sql_time = sum(entry['duration_ms'] for entry in profile['sql'])
+    metadata = {
+        'id': profile['id'],
+        'mode': profile['mode'],
+        'trigger': profile['trigger'],
+        'started_at': profile['started_at'],
+        'method': request.method,
+        'path': request.full_path.rstrip('?'),
+        'endpoint': request.endpoint,
+        'status': status_code,
+        'duration_ms': round(profile['duration'] * 1000, 3),
+        'sql_count': len(profile['sql']) + profile['sql_dropped'],
+        'sql_time_ms': round(sql_time, 3),
+        'file': os.path.basename(profile_file),
+        'top': top,
+        'sql': profile['sql']
+    }
+    with open(base + '.json', 'w') as f:
+        json.dump(metadata, f)
+    prune_profiles(directory, current_app.config['PROFILE_RETENTION'])
+
+def _cprofile_top(profiler):
+    stats = pstats.Stats(profiler).stats
+    rows = sorted(stats.items(), key=lambda item: item[1][3], reverse=True)[:TOP_ENTRIES]
+    return [{
+        'function': f'{os.path.basename(filename)}:{line}({name})',
+        'calls': calls,
+        'self_ms': round(self_time * 1000, 3),
+        'cumulative_ms': round(cumulative * 1000, 3)
+    } for (filename, line, name), (_, calls, self_time, cumulative, _) in rows]
+
+def _sampler_top(sampler):
+    leaves = Counter()
+    for stack, count in sampler.stacks.items():
+        leaves[stack.rsplit(';', 1)[-1]] += count
+    return [{'function': label, 'samples': count} for label, count in leaves.most_common(TOP_ENTRIES)]
+
+def prune_profiles(directory, keep):
+    """Delete all but the newest ``keep`` profiles."""
+    ids = sorted(os.path.basename(path)[:-5] for path in glob.glob(os.path.join(directory, '*.json')))
+    for profile_id in ids[:max(0, len(ids) - keep)]:
+        for path in glob.glob(os.path.join(directory, profile_id + '.*')):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+def list_profiles(directory):
+    """Metadata of the stored profiles, newest first, without their details."""
+    profiles = []
+    for path in sorted(glob.glob(os.path.join(directory, '*.json')), reverse=True):
+        try:
+            with open(path) as f:
+                metadata = json.load(f)
+        except (OSError, ValueError):
+            continue
+        metadata.pop('top', None)
+        metadata.pop('sql', None)
+        profiles.append(metadata)
+    return profiles
+
+def load_profile(directory, profile_id):
+    if not PROFILE_ID.match(profile_id):
+        return None
+    try:
+        with open(os.path.join(directory, profile_id + '.json')) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+_sql_listeners_installed = False
+
+def _install_sql_listeners():
+    global _sql_listeners_installed
+    if _sql_listeners_installed:
+        return
+    event.listen(Engine, 'before_cursor_execute', _before_cursor_execute)
+    event.listen(Engine, 'after_cursor_execute', _after_cursor_execute)
+    _sql_listeners_installed = True
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if has_request_context() and 'profile' in g:
+        conn.info.setdefault('profile_query_start', []).append(time.perf_counter())
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    starts = conn.info.get('profile_query_start')
+    if not starts or not (has_request_context() and 'profile' in g):
+        return
+    began = starts.pop()
+    profile = g.profile
+    if len(profile['sql']) >= MAX_STATEMENTS:
+        profile['sql_dropped'] += 1
+        return
+    # Parameters are left out; they can hold personal data
+    profile['sql'].append({
+        'start_ms': round((began - profile['start']) * 1000, 3),
+        'duration_ms': round((time.perf_counter() - began) * 1000, 3),
+        'statement': statement
+    })
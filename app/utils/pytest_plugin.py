@@ -0,0 +1,17 @@
+"""
+Pytest helpers for keeping query counts in check.
+
+Enable with ``pytest_plugins = ['app.utils.pytest_plugin']`` in conftest.py,
+then give each endpoint a query budget::
+
+    def test_list_spaces(client, query_budget):
+        with query_budget(3):
+            client.get('/api/spaces/')
+"""
+import pytest
+from app.utils.query_counter import assert_query_budget
+
+@pytest.fixture
+def query_budget():
+    """Context manager failing the test when a block runs too many queries."""
+    return assert_query_budget
@@ -0,0 +1,113 @@
+import re
+import traceback
+from collections import Counter
+from contextlib import contextmanager
+from flask import current_app, g, has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# Collapse literals and expanded IN lists so that the same query issued for
+# different rows maps to one statement template
+_IN_LIST = re.compile(r'\((?:\s*(?:\?|%s|%\(\w+\)s|:\w+)\s*,)+\s*(?:\?|%s|%\(\w+\)s|:\w+)\s*\)')
+_WHITESPACE = re.compile(r'\s+')
+
+class RepeatedQueryError(Exception):
+    """Raised when one statement template repeats too often in a request."""
+
+class QueryLog:
+    """Statements executed while a ``count_queries`` block is active."""
+    
+    def __init__(self):
+        self.statements = []
+    
+    @property
+    def count(self):
+        return len(self.statements)
+    
+    def templates(self):
+        return Counter(statement_template(s) for s in self.statements)
+
+def statement_template(statement):
+    """Normalize a SQL statement for repeat detection."""
+    statement = _WHITESPACE.sub(' ', statement.strip())
+    return _IN_LIST.sub('(?)', statement)
+
+def init_query_counter(app):
+    """
+    Detect N+1 query patterns per request.
+    
+    Enabled in debug and testing mode unless QUERY_COUNTER_ENABLED says
+    otherwise. When one statement template runs more than
+    QUERY_REPEAT_THRESHOLD times in a request, a warning with the stack
+    trace is logged, or RepeatedQueryError is raised if QUERY_REPEAT_RAISE
+    is set.
+    """
+    enabled = app.config['QUERY_COUNTER_ENABLED']
+    if enabled is None:
+        enabled = app.debug or app.testing
+    if not enabled:
+        return
+    _install_listener()
+    app.before_request(_reset_request_counts)
+
+@contextmanager
+def count_queries():
+    """Collect every SQL statement executed inside the block."""
+    log = QueryLog()
+    _active_logs.append(log)
+    _install_listener()
+    try:
+        yield log
+    finally:
+        _active_logs.remove(log)
+
+@contextmanager
+def assert_query_budget(max_queries):
+    """Fail with the executed statements if the block exceeds ``max_queries``."""
+    with count_queries() as log:
+        yield log
+    if log.count > max_queries:
+        details = '\n'.join(
+            f'  {count}x {template}' for template, count in log.templates().most_common()
+        )
+        raise AssertionError(
+            f'Expected at most {max_queries} queries, {log.count} were executed:\n{details}'
+        )
+
+_active_logs = []
+_listener_installed = False
+
+def _install_listener():
+    global _listener_installed
+    if not _listener_installed:
+        event.listen(Engine, 'before_cursor_execute', _before_cursor_execute)
+        _listener_installed = True
+
+def _reset_request_counts():
+    g.query_templates = Counter()
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    for log in _active_logs:
+        log.statements.append(statement)
+    
+    if not has_request_context() or 'query_templates' not in g:
+        return
+    template = statement_template(statement)
+    g.query_templates[template] += 1
+    threshold = current_app.config['QUERY_REPEAT_THRESHOLD']
+    if g.query_templates[template] != threshold + 1:
+        return
+    
+    # Only show application frames; the library frames are the same every time
+    app_frames = [
+        frame for frame in traceback.extract_stack()[:-1]
+        if frame.filename.startswith(current_app.root_path)
+    ]
+    message = (
+        f"Possible N+1 query in {request.method} {request.path} ({request.endpoint}): "
+        f"statement repeated more than {threshold} times:\n  {template}\n"
+        + ''.join(traceback.format_list(app_frames))
+    )
+    if current_app.config['QUERY_REPEAT_RAISE']:
+        raise RepeatedQueryError(message)
+    current_app.logger.warning(message)
@@ -0,0 +1,176 @@
+import random
+import threading
+import time
+from contextlib import contextmanager
+from flask import current_app, g, has_request_context, request
+from flask_jwt_extended import get_jwt_identity, verify_jwt_in_request
+from flask_sqlalchemy.session import Session
+from sqlalchemy import event, text
+from app.utils.metrics import REPLICA_FALLBACKS
+
+READ_METHODS = ('GET', 'HEAD', 'OPTIONS')
+STICKY_COOKIE = 'db_primary_until'
+
+def replica_bind_key(index):
+    return f'replica_{index}'
+
+def configure_replica_binds(app):
+    """Register SQLALCHEMY_REPLICA_URIS as extra binds so Flask-SQLAlchemy creates their engines."""
+    uris = app.config.get('SQLALCHEMY_REPLICA_URIS') or []
+    binds = dict(app.config.get('SQLALCHEMY_BINDS') or {})
+    for index, uri in enumerate(uris):
+        binds[replica_bind_key(index)] = uri
+    app.config['SQLALCHEMY_BINDS'] = binds
+    app.extensions['db_replicas'] = ReplicaSet(
+        [replica_bind_key(index) for index in range(len(uris))],
+        max_lag=app.config['REPLICA_MAX_LAG'],
+        check_interval=app.config['REPLICA_LAG_CHECK_INTERVAL'],
+        sticky_seconds=app.config['REPLICA_STICKY_SECONDS']
+    )
+
+class ReplicaSet:
+    """Replica bind keys plus cached lag checks and recent writers for one app."""
+
+    def __init__(self, bind_keys, max_lag, check_interval, sticky_seconds):
+        self.bind_keys = bind_keys
+        self.max_lag = max_lag
+        self.check_interval = check_interval
+        self.sticky_seconds = sticky_seconds
+        self._health = {}  # bind key -> (checked_at, healthy)
+        self._writers = {}  # user id -> time of last write
+        self._lock = threading.Lock()
+
+    def replica_lag(self, engine):
+        """Seconds the replica is behind the primary (0 when it cannot tell)."""
+        if engine.dialect.name != 'postgresql':
+            return 0.0
+        with engine.connect() as connection:
+            lag = connection.execute(text(
+                'SELECT EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp())'
+            )).scalar()
+        # NULL when the server is not replaying WAL, e.g. it was promoted
+        return float(lag or 0.0)
+
+    def is_healthy(self, bind_key, engine):
+        now = time.monotonic()
+        cached = self._health.get(bind_key)
+        if cached and now - cached[0] < self.check_interval:
+            return cached[1]
+
+        try:
+            lag = self.replica_lag(engine)
+            healthy = lag <= self.max_lag
+            if not healthy:
+                REPLICA_FALLBACKS.labels(reason='lag').inc()
+                current_app.logger.warning('Replica %s is %.1fs behind, reading from primary', bind_key, lag)
+        except Exception as e:
+            healthy = False
+            REPLICA_FALLBACKS.labels(reason='error').inc()
+            current_app.logger.warning('Replica %s lag check failed: %s', bind_key, e)
+        self._health[bind_key] = (now, healthy)
+        return healthy
+
+    def choose(self, engines):
+        """Pick a healthy replica engine, or None to use the primary."""
+        candidates = [key for key in self.bind_keys if self.is_healthy(key, engines[key])]
+        if not candidates:
+            return None
+        return engines[random.choice(candidates)]
+
+    def record_write(self, user_id):
+        now = time.monotonic()
+        with self._lock:
+            self._writers[user_id] = now
+            if len(self._writers) > 10000:
+                cutoff = now - self.sticky_seconds
+                self._writers = {uid: at for uid, at in self._writers.items() if at > cutoff}
+
+    def wrote_recently(self, user_id):
+        written_at = self._writers.get(user_id)
+        return written_at is not None and time.monotonic() - written_at < self.sticky_seconds
+
+def _current_user_id():
+    try:
+        # Public endpoints never verify the token themselves
+        verify_jwt_in_request(optional=True)
+        identity = get_jwt_identity()
+    except Exception:
+        return None
+    return str(identity) if identity is not None else None
+
+def _sticky_to_primary(replicas):
+    try:
+        until = float(request.cookies.get(STICKY_COOKIE, 0))
+    except ValueError:
+        until = 0
+    if until > time.time():
+        return True
+    user_id = _current_user_id()
+    return user_id is not None and replicas.wrote_recently(user_id)
+
+def read_engine_for_request():
+    """Replica engine for reads in the current request, or None for the primary."""
+    if not has_request_context() or request.method not in READ_METHODS:
+        return None
+    replicas = current_app.extensions.get('db_replicas')
+    if not replicas or not replicas.bind_keys or g.get('db_wrote') or g.get('db_force_primary'):
+        return None
+
+    if 'db_read_engine' not in g:
+        if _sticky_to_primary(replicas):
+            g.db_read_engine = None
+        else:
+            g.db_read_engine = replicas.choose(current_app.extensions['sqlalchemy'].engines)
+    return g.db_read_engine
+
+@contextmanager
+def primary_reads():
+    """Send the reads inside the block to the primary, even in a read-only request."""
+    if not has_request_context():
+        yield
+        return
+    previous = g.get('db_force_primary', False)
+    g.db_force_primary = True
+    try:
+        yield
+    finally:
+        g.db_force_primary = previous
+
+class RoutingSession(Session):
+    """Session that sends SELECTs issued while serving read-only requests to a replica."""
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and not self._flushing and getattr(clause, 'is_select', False):
+            engine = read_engine_for_request()
+            if engine is not None:
+                return engine
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+@event.listens_for(RoutingSession, 'after_flush')
+def _mark_request_wrote(session, flush_context):
+    if has_request_context():
+        # Later reads in this request must see the rows just written
+        g.db_wrote = True
+        g.pop('db_read_engine', None)
+
+def init_replica_routing(app):
+    """Keep a client on the primary for a short window after it writes."""
+    replicas = app.extensions.get('db_replicas')
+    if not replicas or not replicas.bind_keys:
+        return
+
+    @app.after_request
+    def stick_writers_to_primary(response):
+        if not g.get('db_wrote'):
+            return response
+        user_id = _current_user_id()
+        if user_id is not None:
+            replicas.record_write(user_id)
+        response.set_cookie(
+            STICKY_COOKIE,
+            str(int(time.time() + replicas.sticky_seconds)),
+            max_age=replicas.sticky_seconds,
+            httponly=True,
+            samesite='Lax'
+        )
+        return response
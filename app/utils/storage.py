@@ -0,0 +1,152 @@
+import os
+from abc import ABC, abstractmethod
+import tempfile
+from collections import namedtuple
+from datetime import datetime
+from flask import current_app
+from app.utils import cloudinary
+
+# A stored image as reported by StorageBackend.list_objects
+StoredObject = namedtuple('StoredObject', ['key', 'url', 'size', 'created_at'])
+
+class StorageBackend(ABC):
+    """Interface for image storage backends."""
+    
+    @abstractmethod
+    def save(self, image_file, folder, content_hash):
+        """Store a resized image and return its public URL."""
+    
+    @abstractmethod
+    def delete(self, key):
+        """Delete a stored image by key. Returns True on success."""
+    
+    @abstractmethod
+    def key_for_url(self, image_url):
+        """Return the backend key for a URL produced by ``save``."""
+    
+    @abstractmethod
+    def list_objects(self, folder, cursor=None, page_size=500):
+        """
+        List one page of stored images in ``folder``.
+        
+        Returns ``(objects, next_cursor)`` where ``objects`` is a list of
+        StoredObject and ``next_cursor`` is None on the last page.
+        """
+
+class CloudinaryStorage(StorageBackend):
+    """Stores images on Cloudinary. Keys are Cloudinary public IDs."""
+    
+    def save(self, image_file, folder, content_hash):
+        return cloudinary.upload_image(image_file, folder=folder)
+    
+    def delete(self, key):
+        return cloudinary.delete_image(key)
+    
+    def key_for_url(self, image_url):
+        return cloudinary.public_id_from_url(image_url)
+    
+    def list_objects(self, folder, cursor=None, page_size=500):
+        resources, next_cursor = cloudinary.list_images(folder, cursor, page_size)
+        objects = [
+            StoredObject(
+                key=resource['public_id'],
+                url=resource['secure_url'],
+                size=resource.get('bytes', 0),
+                created_at=datetime.strptime(resource['created_at'], '%Y-%m-%dT%H:%M:%SZ')
+            )
+            for resource in resources
+        ]
+        return objects, next_cursor
+
+class LocalStorage(StorageBackend):
+    """
+    Stores images on local disk under content-hashed paths.
+    
+    Files live at ``<root>/<folder>/<hash[:2]>/<hash>.jpg`` and are served by
+    the media blueprint. Keys are paths relative to ``root``.
+    """
+    
+    def __init__(self, root, base_url):
+        self.root = os.path.abspath(root)
+        self.base_url = base_url.rstrip('/')
+    
+    def path_for_key(self, key):
+        return os.path.join(self.root, *key.split('/'))
+    
+    def save(self, image_file, folder, content_hash):
+        key = f'{folder}/{content_hash[:2]}/{content_hash}.jpg'
+        path = self.path_for_key(key)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # Write to a temporary file first so readers never see partial images
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    f.write(image_file.read())
+                os.replace(tmp_path, path)
+            except Exception:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                raise
+        return f'{self.base_url}/{key}'
+    
+    def delete(self, key):
+        try:
+            os.remove(self.path_for_key(key))
+            return True
+        except OSError as e:
+            current_app.logger.error(f"Failed to delete local image {key}: {str(e)}")
+            return False
+    
+    def key_for_url(self, image_url):
+        prefix = self.base_url + '/'
+        if not image_url.startswith(prefix):
+            return None
+        return image_url[len(prefix):].split('?', 1)[0]
+    
+    def list_objects(self, folder, cursor=None, page_size=500):
+        # Keys sort as <folder>/<hh>/<hash>.jpg, so the cursor is simply the
+        # last key returned and only directories at or after it are read
+        folder_path = self.path_for_key(folder)
+        if not os.path.isdir(folder_path):
+            return [], None
+        
+        objects = []
+        for shard in sorted(os.listdir(folder_path)):
+            shard_key = f'{folder}/{shard}'
+            if cursor and shard_key < cursor.rsplit('/', 1)[0]:
+                continue
+            shard_path = os.path.join(folder_path, shard)
+            if not os.path.isdir(shard_path):
+                continue
+            for name in sorted(os.listdir(shard_path)):
+                key = f'{shard_key}/{name}'
+                if name.endswith('.tmp') or (cursor and key <= cursor):
+                    continue
+                if len(objects) == page_size:
+                    return objects, objects[-1].key
+                stat = os.stat(os.path.join(shard_path, name))
+                objects.append(StoredObject(
+                    key=key,
+                    url=f'{self.base_url}/{key}',
+                    size=stat.st_size,
+                    created_at=datetime.utcfromtimestamp(stat.st_mtime)
+                ))
+        return objects, None
+
+def create_storage(app):
+    """Build the storage backend selected by ``IMAGE_STORAGE_BACKEND``."""
+    backend = app.config['IMAGE_STORAGE_BACKEND']
+    if backend == 'cloudinary':
+        return CloudinaryStorage()
+    if backend == 'local':
+        base_url = app.config['IMAGE_STORAGE_URL'] or f"{app.config['BACKEND_URL'].rstrip('/')}/media"
+        return LocalStorage(app.config['IMAGE_STORAGE_PATH'], base_url)
+    raise ValueError(f'Unknown image storage backend: {backend}')
+
+def get_storage():
+    """Return the storage backend for the current app."""
+    storage = current_app.extensions.get('image_storage')
+    if storage is None:
+        storage = current_app.extensions['image_storage'] = create_storage(current_app)
+    return storage
@@ -17,6 +17,22 @@ def validate_password(password):
         return False
     return True
 
+def parse_timestamp(value, name):
+    """
+    Parse an ISO 8601 date or datetime query parameter as naive UTC, the way
+    timestamps are stored. Returns None for a missing value and raises
+    ValueError for an invalid one.
+    """
+    if value is None:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except ValueError:
+        raise ValueError(f"'{name}' must be an ISO 8601 date or datetime")
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
 def validate_booking_dates(start_time, end_time):
     """Validate booking dates."""
     try:
@@ -0,0 +1,32 @@
+import re
+from urllib.parse import quote
+from werkzeug.utils import redirect
+
+_SLASHES = re.compile(r'/{2,}')
+
+class SlashNormalizer:
+    """
+    Redirect paths containing repeated slashes to their normalized form.
+    
+    Runs in front of Flask, so well-formed requests only pay for one
+    substring test; the regex and the redirect are built only for the rare
+    path that needs them. The query string is preserved.
+    """
+    
+    def __init__(self, wsgi_app):
+        self.wsgi_app = wsgi_app
+    
+    def __call__(self, environ, start_response):
+        path = environ.get('PATH_INFO', '')
+        if '//' not in path:
+            return self.wsgi_app(environ, start_response)
+        
+        # PATH_INFO is the decoded path as latin-1; quote it back for the header
+        location = quote(
+            (environ.get('SCRIPT_NAME', '') + _SLASHES.sub('/', path)).encode('latin-1'),
+            safe="/:@!$&'()*+,;=-._~"
+        )
+        query_string = environ.get('QUERY_STRING')
+        if query_string:
+            location += '?' + query_string
+        return redirect(location, code=301)(environ, start_response)
@@ -0,0 +1,81 @@
+"""
+Benchmark JSON serialization of a large booking listing.
+
+Compares the previous path (``isoformat()`` in ``to_dict`` plus Flask's
+stdlib provider) with FastJSONProvider serializing datetimes natively.
+
+Usage:
+    python benchmarks/bench_json.py [--bookings 10000] [--repeat 5]
+"""
+import argparse
+import os
+import sys
+import timeit
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+from app.models.booking import Booking
+from app.utils import json_provider
+from app.utils.json_provider import FastJSONProvider
+
+def make_bookings(count):
+    now = datetime.utcnow()
+    bookings = []
+    for i in range(count):
+        start = now + timedelta(hours=i)
+        bookings.append(Booking(
+            id=i + 1,
+            space_id=i % 500 + 1,
+            user_id=i % 2000 + 1,
+            start_time=start,
+            end_time=start + timedelta(hours=2),
+            total_price=200.0 + i % 50,
+            purpose='Team meeting',
+            status='confirmed',
+            payment_status='paid',
+            created_at=now,
+            updated_at=now
+        ))
+    return bookings
+
+def legacy_dict(booking):
+    """Booking.to_dict as it was before datetimes were serialized natively."""
+    data = booking.to_dict()
+    for key in ('start_time', 'end_time', 'created_at', 'updated_at'):
+        data[key] = data[key].isoformat()
+    return data
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--bookings', type=int, default=10000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+    
+    app = Flask(__name__)
+    stdlib = DefaultJSONProvider(app)
+    fast = FastJSONProvider(app)
+    bookings = make_bookings(args.bookings)
+    
+    with app.test_request_context():
+        legacy_payload = [legacy_dict(b) for b in bookings]
+        payload = [b.to_dict() for b in bookings]
+        cases = {
+            'stdlib (isoformat in to_dict)': lambda: stdlib.response([legacy_dict(b) for b in bookings]),
+            'fast provider (native datetime)': lambda: fast.response([b.to_dict() for b in bookings]),
+            'stdlib, encode only': lambda: stdlib.dumps(legacy_payload),
+            'fast provider, encode only': lambda: fast.dumps(payload),
+        }
+        
+        print(f'{args.bookings} bookings, best of {args.repeat} (orjson available: {json_provider.orjson is not None})')
+        baseline = None
+        for name, case in cases.items():
+            best = min(timeit.repeat(case, number=1, repeat=args.repeat))
+            if baseline is None or name.startswith('stdlib'):
+                baseline = best
+            print(f'  {name:<34} {best * 1000:9.2f} ms  ({baseline / best:4.1f}x)')
+
+if __name__ == '__main__':
+    main()
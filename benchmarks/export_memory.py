@@ -0,0 +1,67 @@
+"""
+Stream an admin export and watch the process memory while it runs.
+
+Runs the export view in-process against the database in DATABASE_URL (fill
+it with seed_bulk.py first) and reads the body chunk by chunk, as a WSGI
+server would. Reports rows, throughput and resident memory growth, which
+should stay flat however large the export is.
+
+Usage:
+    python benchmarks/export_memory.py --dataset bookings --format ndjson
+    python benchmarks/export_memory.py --dataset users --format csv --from 2024-01-01
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import create_app
+from http_bench import BENCH_PASSWORD, ensure_user
+
+def rss_mb():
+    with open('/proc/self/statm') as f:
+        return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 2 ** 20
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--dataset', default='bookings', choices=['bookings', 'payments', 'users'])
+    parser.add_argument('--format', default='ndjson', choices=['ndjson', 'csv'])
+    parser.add_argument('--from', dest='created_from')
+    parser.add_argument('--to', dest='created_to')
+    args = parser.parse_args()
+
+    app = create_app()
+    with app.app_context():
+        ensure_user('bench-admin@example.com', 'admin')
+    client = app.test_client()
+    response = client.post('/api/auth/login', json={'email': 'bench-admin@example.com', 'password': BENCH_PASSWORD})
+    headers = {'Authorization': f"Bearer {response.get_json()['access_token']}"}
+
+    params = {'format': args.format}
+    if args.created_from:
+        params['from'] = args.created_from
+    if args.created_to:
+        params['to'] = args.created_to
+
+    baseline = peak = rss_mb()
+    lines = size = 0
+    began = time.perf_counter()
+    response = client.get(f'/api/admin/export/{args.dataset}', query_string=params, headers=headers, buffered=False)
+    if response.status_code != 200:
+        raise SystemExit(f'export failed: {response.status_code} {response.get_data(as_text=True)}')
+    for chunk in response.response:
+        lines += chunk.count(b'\n')
+        size += len(chunk)
+        peak = max(peak, rss_mb())
+    response.close()
+    elapsed = time.perf_counter() - began
+
+    rows = lines - 1 if args.format == 'csv' else lines
+    print(f'{rows} {args.dataset} rows, {size / 2 ** 20:.1f} MB of {args.format} in {elapsed:.2f}s '
+          f'({rows / elapsed:,.0f} rows/s)')
+    print(f'resident memory: {baseline:.1f} MB before, {peak:.1f} MB peak (+{peak - baseline:.1f} MB)')
+
+if __name__ == '__main__':
+    main()
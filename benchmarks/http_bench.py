@@ -0,0 +1,309 @@
+"""
+End-to-end HTTP benchmark with a mixed workload.
+
+Starts the app from create_app() on a local threaded server (or targets a
+running server with --url) against the database in DATABASE_URL, which
+should be filled with seed_bulk.py first. Each concurrency level runs for a
+fixed time with a weighted mix of: browsing spaces, viewing a space, login,
+creating a booking, the M-Pesa callback and the admin dashboard. The
+workload writes bookings and flips payment states, so use a throwaway
+database.
+
+Per endpoint and level it reports p50/p95/p99 latency and throughput as JSON,
+and compares against a stored baseline so regressions show up in review.
+benchmarks/baseline.json is the reference run; its meta records the
+seed_bulk.py command and row counts of the database it ran against, and a
+comparison is only meaningful on the same dataset and hardware class.
+It was taken with admin_stats weighted down to 1: on SQLite a dashboard
+request takes seconds and otherwise starves the other endpoints of samples.
+Endpoints with fewer than --min-samples requests in either run are reported
+as insufficient instead of being compared.
+
+Usage:
+    python benchmarks/http_bench.py --concurrency 1,8,32 --duration 20 --out run.json
+    python benchmarks/http_bench.py --baseline benchmarks/baseline.json --workload admin_stats=1 \
+        --duration 90 --fail-on-regression
+    python benchmarks/http_bench.py --url http://127.0.0.1:8000 --concurrency 64
+"""
+import argparse
+import json
+import logging
+import os
+import platform
+import random
+import sys
+import threading
+import time
+from datetime import datetime, timedelta
+
+import requests
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from werkzeug.serving import make_server
+from app import create_app, db
+from app.models.booking import Booking, Payment
+from app.models.space import Space
+from app.models.user import User
+
+BENCH_PASSWORD = 'BenchPassword123'
+# Scenario name -> relative weight in the mix
+WORKLOAD = {
+    'browse_spaces': 40,
+    'view_space': 30,
+    'login': 5,
+    'create_booking': 10,
+    'mpesa_callback': 5,
+    'admin_stats': 10,
+}
+
+def ensure_user(email, role):
+    user = User.query.filter_by(email=email).first()
+    if user is None:
+        user = User(email=email, first_name='Bench', last_name=role.title(), role=role)
+        db.session.add(user)
+    user.set_password(BENCH_PASSWORD)
+    db.session.commit()
+
+def prepare(app, sample_size):
+    """Create the benchmark accounts and sample ids to request."""
+    with app.app_context():
+        ensure_user('bench-admin@example.com', 'admin')
+        ensure_user('bench-client@example.com', 'client')
+        space_ids = [row.id for row in db.session.query(Space.id).limit(sample_size)]
+        transaction_ids = [
+            row.transaction_id for row in
+            db.session.query(Payment.transaction_id).filter(Payment.transaction_id.isnot(None)).limit(sample_size)
+        ]
+    if not space_ids:
+        raise SystemExit('the database has no spaces, run seed_bulk.py first')
+    return {'space_ids': space_ids, 'transaction_ids': transaction_ids}
+
+def row_counts(app):
+    with app.app_context():
+        return {model.__tablename__: db.session.query(model).count() for model in (User, Space, Booking, Payment)}
+
+def login(session, base_url, email):
+    response = session.post(f'{base_url}/api/auth/login', json={'email': email, 'password': BENCH_PASSWORD})
+    response.raise_for_status()
+    return {'Authorization': f"Bearer {response.json()['access_token']}"}
+
+class Worker:
+    """One client thread: its own HTTP session, tokens and random stream."""
+
+    def __init__(self, base_url, data, seed):
+        self.base_url = base_url
+        self.data = data
+        self.rng = random.Random(seed)
+        self.session = requests.Session()
+        self.client_headers = login(self.session, base_url, 'bench-client@example.com')
+        self.admin_headers = login(self.session, base_url, 'bench-admin@example.com')
+
+    def browse_spaces(self):
+        page = self.rng.randint(1, 20)
+        return self.session.get(f'{self.base_url}/api/spaces/', params={'page': page, 'per_page': 20})
+
+    def view_space(self):
+        return self.session.get(f"{self.base_url}/api/spaces/{self.rng.choice(self.data['space_ids'])}")
+
+    def login(self):
+        return self.session.post(f'{self.base_url}/api/auth/login',
+                                 json={'email': 'bench-client@example.com', 'password': BENCH_PASSWORD})
+
+    def create_booking(self):
+        # Far in the future and spread out, so most requests do not collide
+        start = datetime.utcnow().replace(minute=0, second=0, microsecond=0) + timedelta(
+            days=self.rng.randint(400, 4000), hours=self.rng.randint(0, 23)
+        )
+        return self.session.post(f'{self.base_url}/api/bookings/', headers=self.client_headers, json={
+            'space_id': self.rng.choice(self.data['space_ids']),
+            'start_time': start.isoformat(),
+            'end_time': (start + timedelta(hours=self.rng.randint(1, 3))).isoformat(),
+            'purpose': 'Benchmark'
+        })
+
+    def mpesa_callback(self):
+        transaction_id = self.rng.choice(self.data['transaction_ids'] or ['missing'])
+        return self.session.post(f'{self.base_url}/api/payments/mpesa-callback', json={
+            'Body': {'stkCallback': {
+                'MerchantRequestID': 'bench',
+                'CheckoutRequestID': transaction_id,
+                'ResultCode': 0,
+                'ResultDesc': 'The service request is processed successfully.'
+            }}
+        })
+
+    def admin_stats(self):
+        return self.session.get(f'{self.base_url}/api/admin/stats', headers=self.admin_headers)
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, max(0, round(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+def summarize(samples, seconds):
+    latencies = sorted(latency for latency, _ in samples)
+    errors = sum(1 for _, status in samples if status is None or status >= 500)
+    return {
+        'requests': len(samples),
+        'errors': errors,
+        'throughput': round(len(samples) / seconds, 2),
+        'p50_ms': round(percentile(latencies, 50) * 1000, 2) if latencies else None,
+        'p95_ms': round(percentile(latencies, 95) * 1000, 2) if latencies else None,
+        'p99_ms': round(percentile(latencies, 99) * 1000, 2) if latencies else None,
+    }
+
+def run_level(base_url, data, workload, concurrency, duration, warmup, seed):
+    workers = [Worker(base_url, data, seed * 1000 + i) for i in range(concurrency)]
+    names = list(workload)
+    weights = list(workload.values())
+    samples = {name: [] for name in names}
+    lock = threading.Lock()
+    start_at = time.perf_counter() + warmup
+    stop_at = start_at + duration
+
+    def loop(worker):
+        local = {name: [] for name in names}
+        while True:
+            name = worker.rng.choices(names, weights=weights)[0]
+            began = time.perf_counter()
+            if began >= stop_at:
+                break
+            try:
+                status = getattr(worker, name)().status_code
+            except requests.RequestException:
+                status = None
+            if began >= start_at:
+                local[name].append((time.perf_counter() - began, status))
+        with lock:
+            for name, values in local.items():
+                samples[name].extend(values)
+
+    threads = [threading.Thread(target=loop, args=(worker,)) for worker in workers]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    results = {name: summarize(values, duration) for name, values in samples.items()}
+    results['all'] = summarize([sample for values in samples.values() for sample in values], duration)
+    return results
+
+def compare(results, baseline, threshold, min_samples):
+    """
+    Print the change against the baseline and return the regressions found.
+
+    An endpoint with fewer than min_samples requests in either run is reported
+    as insufficient rather than compared: its p95 is then close to its maximum
+    and a single slow request reads as a regression.
+    """
+    regressions = []
+    print(f"\n{'level':>5} {'endpoint':<16}{'p95 ms':>16}{'change':>9}{'req/s':>18}{'change':>9}", file=sys.stderr)
+    for level, endpoints in results['levels'].items():
+        for name, current in endpoints.items():
+            previous = baseline.get('levels', {}).get(level, {}).get(name)
+            if not previous or not previous['p95_ms'] or not current['p95_ms']:
+                continue
+            if min(previous['requests'], current['requests']) < min_samples:
+                print(f"{level:>5} {name:<16}  insufficient samples "
+                      f"({previous['requests']} -> {current['requests']}, need {min_samples})", file=sys.stderr)
+                continue
+            p95_change = current['p95_ms'] / previous['p95_ms'] - 1
+            rate_change = current['throughput'] / previous['throughput'] - 1 if previous['throughput'] else 0
+            regressed = p95_change > threshold or rate_change < -threshold
+            if regressed:
+                regressions.append((level, name))
+            print(f"{level:>5} {name:<16}{previous['p95_ms']:>7} -> {current['p95_ms']:<7}{p95_change:>+8.0%}"
+                  f"{previous['throughput']:>8} -> {current['throughput']:<8}{rate_change:>+8.0%}"
+                  f"{'  REGRESSION' if regressed else ''}", file=sys.stderr)
+    return regressions
+
+def parse_workload(value):
+    """Weights like 'admin_stats=1,login=2' on top of WORKLOAD."""
+    workload = dict(WORKLOAD)
+    for item in filter(None, value.split(',')):
+        name, _, weight = item.partition('=')
+        if name not in WORKLOAD:
+            raise argparse.ArgumentTypeError(f'unknown scenario {name!r}, choose from {", ".join(WORKLOAD)}')
+        workload[name] = int(weight)
+    return {name: weight for name, weight in workload.items() if weight > 0}
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--url', help='benchmark a running server instead of starting one')
+    parser.add_argument('--concurrency', default='1,8,32', help='comma separated client counts')
+    parser.add_argument('--duration', type=float, default=20, help='measured seconds per level')
+    parser.add_argument('--warmup', type=float, default=3, help='unmeasured seconds per level')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--workload', type=parse_workload, default=dict(WORKLOAD),
+                        help='override scenario weights, e.g. admin_stats=1; 0 drops a scenario')
+    parser.add_argument('--dataset', help='how the database was filled, e.g. the seed_bulk.py command line')
+    parser.add_argument('--sample-size', type=int, default=1000, help='spaces and payments to pick from')
+    parser.add_argument('--out', help='write results JSON here (default: stdout)')
+    parser.add_argument('--baseline', help='results JSON to compare against')
+    parser.add_argument('--threshold', type=float, default=0.15,
+                        help='relative p95 increase or throughput drop counted as a regression')
+    parser.add_argument('--min-samples', type=int, default=30,
+                        help='requests an endpoint needs in both runs to be compared')
+    parser.add_argument('--fail-on-regression', action='store_true')
+    args = parser.parse_args()
+
+    app = create_app()
+    rows = row_counts(app)
+    data = prepare(app, args.sample_size)
+
+    server = None
+    base_url = args.url
+    if base_url is None:
+        logging.getLogger('werkzeug').setLevel(logging.WARNING)  # no access log per request
+        server = make_server('127.0.0.1', 0, app, threaded=True)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        base_url = f'http://127.0.0.1:{server.server_port}'
+
+    results = {
+        'meta': {
+            'started_at': datetime.utcnow().isoformat(timespec='seconds'),
+            'target': args.url or 'in-process werkzeug',
+            'database': app.config['SQLALCHEMY_DATABASE_URI'].split(':', 1)[0],
+            'dataset': args.dataset,
+            'rows': rows,
+            'python': platform.python_version(),
+            'cpus': os.cpu_count(),
+            'duration': args.duration,
+            'workload': args.workload,
+        },
+        'levels': {}
+    }
+    try:
+        for concurrency in [int(level) for level in args.concurrency.split(',')]:
+            print(f'running {concurrency} clients for {args.duration:g}s', file=sys.stderr)
+            results['levels'][str(concurrency)] = run_level(
+                base_url, data, args.workload, concurrency, args.duration, args.warmup, args.seed
+            )
+    finally:
+        if server is not None:
+            server.shutdown()
+
+    output = json.dumps(results, indent=2)
+    if args.out:
+        with open(args.out, 'w') as f:
+            f.write(output + '\n')
+    else:
+        print(output)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        for key in ('database', 'rows', 'workload'):
+            if baseline['meta'].get(key) != results['meta'][key]:
+                print(f"warning: baseline {key} {baseline['meta'].get(key)} differs from {results['meta'][key]}",
+                      file=sys.stderr)
+        regressions = compare(results, baseline, args.threshold, args.min_samples)
+        print(f'\n{len(regressions)} regression(s) beyond {args.threshold:.0%}' if regressions
+              else '\nno regressions', file=sys.stderr)
+        if regressions and args.fail_on_regression:
+            sys.exit(1)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,171 @@
+"""
+Microbenchmarks for per-request serialization and validation code.
+
+Times Booking/Space/User.to_dict (plus JSON encoding) over 1, 100 and 10k
+objects, booking date parsing and the regex validators. Each run can be
+appended to a JSON-lines history file, and is compared with the previous
+entry there, so changes are visible over time.
+
+Usage:
+    python benchmarks/micro.py
+    python benchmarks/micro.py --history benchmarks/results/micro.jsonl
+    python benchmarks/micro.py --filter to_dict --profile micro.prof
+    python benchmarks/micro.py --filter space --flamegraph micro.folded
+"""
+import argparse
+import cProfile
+import json
+import os
+import platform
+import pstats
+import subprocess
+import sys
+import timeit
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import Flask
+from app.models.booking import Booking
+from app.models.space import Space, SpaceImage
+from app.models.user import User
+from app.utils.json_provider import FastJSONProvider
+from app.utils.profiling import StackSampler
+from app.utils.validators import validate_booking_dates, validate_email, validate_password
+
+SIZES = (1, 100, 10000)
+
+def make_bookings(count, now):
+    return [Booking(
+        id=i + 1, space_id=i % 500 + 1, user_id=i % 2000 + 1,
+        start_time=now + timedelta(hours=i), end_time=now + timedelta(hours=i + 2),
+        total_price=200.0, purpose='Team meeting', status='confirmed', payment_status='paid',
+        created_at=now, updated_at=now
+    ) for i in range(count)]
+
+def make_spaces(count, now):
+    spaces = []
+    for i in range(count):
+        space = Space(
+            id=i + 1, name=f'Space {i}', description='Spacious room for meetings. ' * 10,
+            address='123 Main St', city='Nairobi', price_per_hour=100.0, capacity=20, owner_id=1,
+            is_available=True, primary_image_url='https://example.com/0.jpg', created_at=now, updated_at=now
+        )
+        space.images = [SpaceImage(
+            id=i * 3 + j, space_id=i + 1, image_url=f'https://example.com/{j}.jpg',
+            status='ready', is_primary=j == 0, created_at=now
+        ) for j in range(3)]
+        spaces.append(space)
+    return spaces
+
+def make_users(count, now):
+    return [User(
+        id=i + 1, email=f'user{i}@example.com', first_name='Jane', last_name='Doe', role='client',
+        phone='254712345678', bio='Software developer', is_verified=True, created_at=now, updated_at=now
+    ) for i in range(count)]
+
+def build_cases():
+    """Name -> zero-argument callable for every benchmark case."""
+    now = datetime(2030, 1, 1, 9)
+    provider = FastJSONProvider(Flask(__name__))
+    cases = {}
+    for name, factory in (('booking', make_bookings), ('space', make_spaces), ('user', make_users)):
+        for size in SIZES:
+            objects = factory(size, now)
+            cases[f'{name}.to_dict x{size}'] = lambda objects=objects: [o.to_dict() for o in objects]
+            cases[f'{name}.to_dict+json x{size}'] = (
+                lambda objects=objects: provider.dumps([o.to_dict() for o in objects])
+            )
+    start, end = '2030-01-01T09:00:00Z', '2030-01-01T11:30:00.000Z'
+    cases['validate_booking_dates'] = lambda: validate_booking_dates(start, end)
+    cases['validate_booking_dates invalid'] = lambda: validate_booking_dates('tomorrow', end)
+    cases['validate_email valid'] = lambda: validate_email('jane.doe+spacer@example.co.ke')
+    cases['validate_email invalid'] = lambda: validate_email('jane.doe@@example')
+    cases['validate_password'] = lambda: validate_password('StrongPassw0rd')
+    return cases
+
+def measure(case, repeat):
+    """Best seconds per call over ``repeat`` timing runs."""
+    number, _ = timeit.Timer(case).autorange()
+    return min(timeit.repeat(case, number=number, repeat=repeat)) / number
+
+def git_commit():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], text=True,
+                                       stderr=subprocess.DEVNULL).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def load_previous(history):
+    if not history or not os.path.exists(history):
+        return {}
+    with open(history) as f:
+        lines = [line for line in f if line.strip()]
+    return json.loads(lines[-1])['results'] if lines else {}
+
+def format_seconds(seconds):
+    for unit, scale in (('s', 1), ('ms', 1e-3), ('us', 1e-6)):
+        if seconds >= scale:
+            return f'{seconds / scale:8.2f} {unit}'
+    return f'{seconds / 1e-9:8.0f} ns'
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--filter', help='only run cases containing this text')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--history', help='JSON-lines file to compare with and append this run to')
+    parser.add_argument('--profile', metavar='FILE', help='run the cases under cProfile and save the stats')
+    parser.add_argument('--flamegraph', metavar='FILE', help='sample stacks and save them in folded format')
+    args = parser.parse_args()
+
+    cases = {name: case for name, case in build_cases().items() if not args.filter or args.filter in name}
+    if not cases:
+        raise SystemExit(f'no cases match {args.filter!r}')
+
+    if args.profile or args.flamegraph:
+        # Profile instead of timing; each case runs for about a second
+        profiler = cProfile.Profile() if args.profile else None
+        sampler = StackSampler(interval=0.001) if args.flamegraph else None
+        if sampler:
+            sampler.start()
+        for name, case in cases.items():
+            number, _ = timeit.Timer(case).autorange()
+            if profiler:
+                profiler.enable()
+            for _ in range(number * 5):
+                case()
+            if profiler:
+                profiler.disable()
+        if sampler:
+            sampler.stop()
+            with open(args.flamegraph, 'w') as f:
+                f.write(sampler.folded())
+            print(f'{sampler.samples} stack samples written to {args.flamegraph} '
+                  f'(render with flamegraph.pl or https://www.speedscope.app)')
+        if profiler:
+            profiler.dump_stats(args.profile)
+            pstats.Stats(profiler).sort_stats('cumulative').print_stats(20)
+            print(f'cProfile stats written to {args.profile} (view with snakeviz or pstats)')
+        return
+
+    previous = load_previous(args.history)
+    results = {}
+    print(f"{'case':<34}{'per call':>12}{'previous':>12}{'change':>9}")
+    for name, case in cases.items():
+        results[name] = seconds = measure(case, args.repeat)
+        before = previous.get(name)
+        change = f'{seconds / before - 1:+8.0%}' if before else ''
+        print(f"{name:<34}{format_seconds(seconds):>12}{format_seconds(before) if before else '':>12}{change:>9}")
+
+    if args.history:
+        os.makedirs(os.path.dirname(os.path.abspath(args.history)), exist_ok=True)
+        with open(args.history, 'a') as f:
+            f.write(json.dumps({
+                'timestamp': datetime.utcnow().isoformat(timespec='seconds'),
+                'commit': git_commit(),
+                'python': platform.python_version(),
+                'results': results
+            }) + '\n')
+
+if __name__ == '__main__':
+    main()
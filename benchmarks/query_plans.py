@@ -0,0 +1,115 @@
+"""
+Check that the hot-path queries are planned with their indexes.
+
+Runs EXPLAIN (EXPLAIN QUERY PLAN on SQLite) for the queries behind the busiest
+routes and fails if the expected index does not appear in the plan. On
+PostgreSQL sequential scans are disabled for the session, so small tables do
+not hide a missing index. tests/test_query_plans.py runs the same checks
+against SQLite as part of the test suite.
+
+Usage:
+    python benchmarks/query_plans.py                # throwaway SQLite database
+    DATABASE_URL=postgresql://... python benchmarks/query_plans.py --existing
+"""
+import argparse
+import os
+import sys
+import tempfile
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import Config
+from app import create_app, db
+from app.models.booking import Booking, Payment
+from app.models.deletion_log import DeletionLog
+from app.models.review import Review
+from app.models.space import Space, SpaceImage
+from app.models.user import User
+
+def hot_queries():
+    """(description, expected index, statement) for each query to check."""
+    start = datetime(2030, 1, 1, 10)
+    end = start + timedelta(hours=2)
+    return [
+        ('booking overlap check', 'ix_bookings_space_status_time', Booking.query.filter(
+            Booking.space_id == 1,
+            Booking.status != 'cancelled',
+            (
+                (Booking.start_time <= start) & (Booking.end_time > start) |
+                (Booking.start_time < end) & (Booking.end_time >= end) |
+                (Booking.start_time >= start) & (Booking.end_time <= end)
+            )
+        ).limit(1).statement),
+        ('bookings of a space', 'ix_bookings_space_status_time',
+         Booking.query.filter_by(space_id=1).statement),
+        ('bookings of a user', 'ix_bookings_user_id',
+         Booking.query.filter_by(user_id=1).statement),
+        ('recent bookings', 'ix_bookings_created_at',
+         Booking.query.order_by(Booking.created_at.desc()).limit(10).statement),
+        ('recent users', 'ix_users_created_at',
+         User.query.order_by(User.created_at.desc()).limit(10).statement),
+        ('payment of a booking', 'ix_payments_booking_id',
+         Payment.query.filter_by(booking_id=1).statement),
+        ('images of a space', 'ix_space_images_space_id',
+         SpaceImage.query.filter_by(space_id=1).statement),
+        ('reviews of a space', 'ix_reviews_space_id',
+         Review.query.filter_by(space_id=1).statement),
+        ('reviews by a user', 'ix_reviews_user_id',
+         Review.query.filter_by(user_id=1).statement),
+        ('spaces of an owner', 'ix_spaces_owner_id',
+         Space.query.filter_by(owner_id=1).statement),
+        ('space delta', 'ix_spaces_updated_at',
+         Space.query.filter(Space.updated_at >= start).statement),
+        ('booking delta', 'ix_bookings_updated_at',
+         Booking.query.filter(Booking.updated_at >= start).statement),
+        ('deleted rows', 'ix_deletion_log_table_deleted_at', DeletionLog.query.filter(
+            DeletionLog.table_name == 'spaces', DeletionLog.deleted_at >= start
+        ).statement),
+    ]
+
+def explain(connection, statement):
+    compiled = statement.compile(dialect=connection.dialect)
+    if compiled.positional:
+        params = tuple(compiled.params[name] for name in compiled.positiontup)
+    else:
+        params = compiled.params
+    prefix = 'EXPLAIN QUERY PLAN ' if connection.dialect.name == 'sqlite' else 'EXPLAIN '
+    rows = connection.exec_driver_sql(prefix + str(compiled), params).fetchall()
+    return '\n'.join(' '.join(str(value) for value in row) for row in rows)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--existing', action='store_true',
+                        help='check the database in DATABASE_URL instead of a throwaway SQLite file')
+    parser.add_argument('--verbose', action='store_true', help='print every plan')
+    args = parser.parse_args()
+
+    overrides = {'TESTING': True, 'METRICS_ENABLED': False}
+    if not args.existing:
+        path = os.path.join(tempfile.mkdtemp(), 'plans.db')
+        overrides['SQLALCHEMY_DATABASE_URI'] = f'sqlite:///{path}'
+    app = create_app(type('QueryPlanConfig', (Config,), overrides))
+
+    failures = checked = 0
+    with app.app_context():
+        if not args.existing:
+            db.create_all()
+        with db.engine.connect() as connection:
+            if connection.dialect.name == 'postgresql':
+                connection.exec_driver_sql('SET enable_seqscan = off')
+            for description, index, statement in hot_queries():
+                plan = explain(connection, statement)
+                ok = index in plan
+                checked += 1
+                failures += not ok
+                print(f"{'ok  ' if ok else 'FAIL'} {description:<24} {index}")
+                if args.verbose or not ok:
+                    print('     ' + plan.replace('\n', '\n     '))
+
+    print(f'\n{failures} of {checked} queries are missing their index' if failures
+          else '\nall hot-path queries use their indexes')
+    sys.exit(1 if failures else 0)
+
+if __name__ == '__main__':
+    main()
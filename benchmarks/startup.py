@@ -0,0 +1,100 @@
+"""
+Measure worker startup: import time, create_app() and the first requests.
+
+Every sample runs in a fresh interpreter, like a new gunicorn worker or a
+serverless cold start. Reports the median of --runs samples for each
+scenario: docs disabled, docs enabled with a cold spec cache, and docs
+enabled with the spec already cached on disk.
+
+Usage:
+    python benchmarks/startup.py
+    python benchmarks/startup.py --runs 20 --json
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Runs in the child interpreter; prints one JSON object of timings in ms
+CHILD = '''
+import json, sys, time
+start = time.perf_counter()
+sys.path.insert(0, {root!r})
+import app
+imported = time.perf_counter()
+from app import create_app
+application = create_app()
+created = time.perf_counter()
+client = application.test_client()
+assert client.get('/api/').status_code == 200
+first_request = time.perf_counter()
+spec_ms = None
+if application.config['SWAGGER_ENABLED']:
+    assert client.get('/apispec.json').status_code == 200
+    spec_ms = (time.perf_counter() - first_request) * 1000
+print(json.dumps({{
+    'import_ms': (imported - start) * 1000,
+    'create_app_ms': (created - imported) * 1000,
+    'first_request_ms': (first_request - created) * 1000,
+    'total_ms': (first_request - start) * 1000,
+    'first_apispec_ms': spec_ms,
+    'modules': len(sys.modules),
+    'flasgger_loaded': 'flasgger' in sys.modules
+}}))
+'''
+
+def sample(env):
+    output = subprocess.check_output(
+        [sys.executable, '-c', CHILD.format(root=ROOT)], env=env, cwd=ROOT, stderr=subprocess.DEVNULL
+    )
+    return json.loads(output.decode().strip().splitlines()[-1])
+
+def run_scenario(runs, swagger_enabled, cache_dir, clear_cache):
+    env = dict(os.environ, SWAGGER_ENABLED=str(swagger_enabled).lower(), SWAGGER_CACHE_DIR=cache_dir,
+               METRICS_ENABLED='false', DATABASE_URL=os.environ.get('DATABASE_URL', 'sqlite://'))
+    samples = []
+    for _ in range(runs):
+        if clear_cache:
+            for name in os.listdir(cache_dir):
+                os.remove(os.path.join(cache_dir, name))
+        samples.append(sample(env))
+    result = {}
+    for key, value in samples[0].items():
+        if isinstance(value, float) or value is None:
+            values = [s[key] for s in samples if s[key] is not None]
+            result[key] = round(statistics.median(values), 1) if values else None
+        else:
+            result[key] = value
+    return result
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--runs', type=int, default=7, help='fresh interpreters per scenario')
+    parser.add_argument('--json', action='store_true', help='print the results as JSON')
+    args = parser.parse_args()
+
+    cache_dir = tempfile.mkdtemp()
+    scenarios = {
+        'docs disabled': run_scenario(args.runs, False, cache_dir, clear_cache=True),
+        'docs, cold spec cache': run_scenario(args.runs, True, cache_dir, clear_cache=True),
+    }
+    sample(dict(os.environ, SWAGGER_ENABLED='true', SWAGGER_CACHE_DIR=cache_dir, DATABASE_URL='sqlite://'))
+    scenarios['docs, cached spec'] = run_scenario(args.runs, True, cache_dir, clear_cache=False)
+
+    if args.json:
+        print(json.dumps(scenarios, indent=2))
+        return
+    columns = ['import_ms', 'create_app_ms', 'first_request_ms', 'total_ms', 'first_apispec_ms', 'modules']
+    print(f"{'scenario':<24}" + ''.join(f'{column:>18}' for column in columns))
+    for name, result in scenarios.items():
+        print(f'{name:<24}' + ''.join(
+            f"{'-' if result[column] is None else result[column]:>18}" for column in columns
+        ))
+
+if __name__ == '__main__':
+    main()
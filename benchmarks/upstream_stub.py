@@ -0,0 +1,83 @@
+"""
+Stand-in for the M-Pesa and Cloudinary APIs with configurable latency.
+
+Answers the M-Pesa OAuth and STK push calls and Cloudinary uploads with
+canned success responses after --latency milliseconds. Point the app at it
+with MPESA_BASE_URL and CLOUDINARY_UPLOAD_PREFIX to load-test the payment
+and upload endpoints without reaching the real services.
+
+Usage:
+    python benchmarks/upstream_stub.py --port 9100 --latency 300
+"""
+import argparse
+import json
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+class UpstreamHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    latency = 0.3
+
+    def log_message(self, format, *args):
+        pass
+
+    def respond(self, payload, status=200):
+        time.sleep(self.latency)
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path.startswith('/oauth/v1/generate'):
+            return self.respond({'access_token': 'stub-token', 'expires_in': '3599'})
+        self.respond({'error': 'not found'}, 404)
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        self.rfile.read(length)
+        if self.path == '/mpesa/stkpush/v1/processrequest':
+            return self.respond({
+                'MerchantRequestID': uuid.uuid4().hex,
+                'CheckoutRequestID': f'ws_CO_{uuid.uuid4().hex}',
+                'ResponseCode': '0',
+                'ResponseDescription': 'Success. Request accepted for processing',
+                'CustomerMessage': 'Success. Request accepted for processing'
+            })
+        if self.path.endswith('/image/upload'):
+            public_id = f'spacer/{uuid.uuid4().hex}'
+            cloud_name = self.path.split('/')[2]
+            return self.respond({
+                'public_id': public_id,
+                'version': 1,
+                'secure_url': f'https://res.cloudinary.com/{cloud_name}/image/upload/v1/{public_id}.jpg'
+            })
+        self.respond({'error': 'not found'}, 404)
+
+def start_stub(port=0, latency=0.3):
+    """Serve the stub on a background thread and return the server."""
+    handler = type('Handler', (UpstreamHandler,), {'latency': latency})
+    server = ThreadingHTTPServer(('127.0.0.1', port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--port', type=int, default=9100)
+    parser.add_argument('--latency', type=float, default=300, help='milliseconds per response')
+    args = parser.parse_args()
+
+    server = start_stub(args.port, args.latency / 1000)
+    print(f'upstream stub on http://127.0.0.1:{server.server_port} with {args.latency:g} ms latency')
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,132 @@
+"""
+Compare the per-request cost of the slash normalization strategies.
+
+Builds the app three times: with the old before_request hook that ran a
+regex on every request, with the SlashNormalizer WSGI middleware, and with
+no normalization at all as the floor. Each variant serves the same request
+per blueprint (successes, 401s and 405s, against an empty throwaway SQLite
+database) straight through the WSGI interface, and the best mean of several
+rounds is reported in microseconds.
+
+Usage:
+    python benchmarks/url_normalization.py
+    python benchmarks/url_normalization.py --requests 5000 --repeat 7
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from werkzeug.test import EnvironBuilder
+from config import Config
+from app import create_app, db
+from app.utils.wsgi import SlashNormalizer
+
+# One request per blueprint, plus a path that needs normalizing
+PATHS = [
+    '/api/',
+    '/api/auth/',
+    '/api/spaces/?per_page=5',
+    '/api/bookings/',
+    '/api/users/profile',
+    '/api/payments/mpesa-callback',
+    '/api/testimonials/',
+    '/api/reviews?space_id=1',
+    '/api/admin/stats',
+    '/api/emails/invoice',
+    '/api//spaces//?per_page=5',
+]
+
+def remove_double_slashes():
+    # The hook create_app used to register, kept verbatim for comparison
+    from flask import request, redirect
+    import re
+    normalized_path = re.sub(r'/{2,}', '/', request.path)
+    if normalized_path != request.path:
+        query_string = request.query_string.decode('utf-8')
+        new_url = normalized_path
+        if query_string:
+            new_url += '?' + query_string
+        return redirect(new_url, code=301)
+
+def build_variants():
+    path = os.path.join(tempfile.mkdtemp(), 'urls.db')
+    config = type('UrlBenchConfig', (Config,), {
+        'SQLALCHEMY_DATABASE_URI': f'sqlite:///{path}',
+        'METRICS_ENABLED': False,
+        'CACHE_ENABLED': False,
+        'SWAGGER_ENABLED': False,
+    })
+    variants = {}
+    for name in ('before_request hook', 'WSGI middleware', 'none'):
+        app = create_app(config)
+        assert isinstance(app.wsgi_app, SlashNormalizer)
+        if name != 'WSGI middleware':
+            app.wsgi_app = app.wsgi_app.wsgi_app
+        if name == 'before_request hook':
+            app.before_request(remove_double_slashes)
+        with app.app_context():
+            db.create_all()
+        variants[name] = app
+    return variants
+
+def start_response(status, headers, exc_info=None):
+    return lambda data: None
+
+def time_requests(app, url, count):
+    """Mean seconds per request through the full WSGI stack."""
+    path, _, query_string = url.partition('?')
+    environ = EnvironBuilder(path=path, query_string=query_string).get_environ()
+    began = time.perf_counter()
+    for _ in range(count):
+        response = app(dict(environ), start_response)
+        for _ in response:
+            pass
+        if hasattr(response, 'close'):
+            response.close()
+    return (time.perf_counter() - began) / count
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--requests', type=int, default=2000, help='requests per path, variant and round')
+    parser.add_argument('--repeat', type=int, default=5, help='rounds; the best one counts')
+    args = parser.parse_args()
+
+    variants = build_variants()
+    names = list(variants)
+    print(f"{'path':<30}" + ''.join(f'{name:>22}' for name in names) + f"{'saved':>10}")
+    totals = dict.fromkeys(names, 0.0)
+    for url in PATHS:
+        for app in variants.values():
+            time_requests(app, url, 50)  # warm up
+        # Interleave the variants so drift in machine load hits them equally
+        row = dict.fromkeys(names, float('inf'))
+        for _ in range(args.repeat):
+            for name, app in variants.items():
+                row[name] = min(row[name], time_requests(app, url, args.requests) * 1e6)
+        for name in names:
+            totals[name] += row[name]
+        saved = row['before_request hook'] - row['WSGI middleware']
+        print(f'{url:<30}' + ''.join(f'{row[name]:>19.1f} us' for name in names) + f'{saved:>7.1f} us')
+
+    count = len(PATHS)
+    print(f"{'mean':<30}" + ''.join(f'{totals[name] / count:>19.1f} us' for name in names)
+          + f"{(totals['before_request hook'] - totals['WSGI middleware']) / count:>7.1f} us")
+
+    # The normalization step alone, for a path that needs no change
+    app = variants['none']
+    environ = EnvironBuilder(path='/api/spaces/', query_string='per_page=5').get_environ()
+    with app.test_request_context('/api/spaces/?per_page=5'):
+        hook = min(timeit.repeat(remove_double_slashes, number=args.requests, repeat=args.repeat))
+    middleware = SlashNormalizer(lambda environ, start_response: None)
+    wsgi = min(timeit.repeat(lambda: middleware(environ, start_response),
+                             number=args.requests, repeat=args.repeat))
+    print(f'\nnormalization step alone: hook {hook / args.requests * 1e6:.2f} us, '
+          f'middleware {wsgi / args.requests * 1e6:.2f} us per request')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,235 @@
+"""
+Compare the sync and gevent gunicorn profiles on endpoints that call out.
+
+Starts upstream_stub.py in place of M-Pesa and Cloudinary, then for each
+worker profile runs gunicorn with gunicorn.conf.py against DATABASE_URL and
+drives two scenarios with concurrent clients for a fixed time: M-Pesa
+payment initiation, and space creation with an image upload. Use a
+throwaway database; it gains a space, pending bookings, payments and one
+space per upload.
+
+Reports p50/p95/p99 latency and throughput per profile and scenario as
+JSON, with a side-by-side table on stderr. The gevent profile needs the
+gevent and psycogreen packages.
+
+Usage:
+    DATABASE_URL=postgresql://... python benchmarks/worker_profiles.py
+    python benchmarks/worker_profiles.py --profiles sync,gevent --concurrency 64 --latency 500 --out profiles.json
+"""
+import argparse
+import importlib.util
+import io
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+
+import requests
+from PIL import Image
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from app import create_app, db
+from app.models.booking import Booking
+from app.models.space import Space
+from app.models.user import User
+from http_bench import ensure_user, login, summarize
+from upstream_stub import start_stub
+
+SCENARIOS = ('mpesa_initiate', 'upload_space')
+
+def prepare(app, booking_count):
+    """Create the benchmark accounts, a space and pending bookings to pay for."""
+    with app.app_context():
+        ensure_user('bench-owner@example.com', 'owner')
+        ensure_user('bench-client@example.com', 'client')
+        owner = User.query.filter_by(email='bench-owner@example.com').first()
+        client = User.query.filter_by(email='bench-client@example.com').first()
+        space = Space(name='Benchmark space', description='Used by worker_profiles.py', address='1 Bench Rd',
+                      city='Nairobi', price_per_hour=100.0, capacity=10, owner_id=owner.id)
+        db.session.add(space)
+        db.session.flush()
+        start = datetime.utcnow().replace(minute=0, second=0, microsecond=0) + timedelta(days=5000)
+        bookings = [Booking(space_id=space.id, user_id=client.id, start_time=start + timedelta(hours=2 * i),
+                            end_time=start + timedelta(hours=2 * i + 1), total_price=100.0, purpose='Benchmark')
+                    for i in range(booking_count)]
+        db.session.add_all(bookings)
+        db.session.commit()
+        return [booking.id for booking in bookings]
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+def start_gunicorn(profile, port, args, stub_url):
+    env = dict(
+        os.environ,
+        GUNICORN_WORKER_CLASS=profile,
+        GUNICORN_BIND=f'127.0.0.1:{port}',
+        GUNICORN_WORKERS=str(args.workers),
+        MPESA_BASE_URL=stub_url,
+        MPESA_CONSUMER_KEY='bench', MPESA_CONSUMER_SECRET='bench',
+        MPESA_BUSINESS_SHORTCODE='174379', MPESA_PASSKEY='bench',
+        IMAGE_STORAGE_BACKEND='cloudinary',
+        CLOUDINARY_UPLOAD_PREFIX=stub_url,
+        CLOUDINARY_CLOUD_NAME='bench', CLOUDINARY_API_KEY='bench', CLOUDINARY_API_SECRET='bench',
+        ASYNC_IMAGE_PROCESSING='false',
+        SWAGGER_ENABLED='false',
+    )
+    env.pop('PROMETHEUS_MULTIPROC_DIR', None)
+    # A file rather than a pipe: nobody reads a pipe during the run, and
+    # gunicorn blocks once its buffer is full
+    log = tempfile.NamedTemporaryFile(prefix=f'gunicorn-{profile}-', suffix='.log', delete=False)
+    process = subprocess.Popen(
+        [sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py', 'run:app'],
+        cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=log
+    )
+    log.close()
+    print(f'{profile}: gunicorn log in {log.name}', file=sys.stderr)
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            with open(log.name) as f:
+                raise SystemExit(f'gunicorn ({profile}) exited:\n{f.read()[-2000:]}')
+        try:
+            requests.get(f'http://127.0.0.1:{port}/api/', timeout=1)
+            return process
+        except requests.RequestException:
+            time.sleep(0.2)
+    process.kill()
+    raise SystemExit(f'gunicorn ({profile}) did not start within 60s')
+
+def random_image():
+    # Random pixels, so upload deduplication never skips the upload
+    output = io.BytesIO()
+    Image.frombytes('RGB', (16, 16), os.urandom(16 * 16 * 3)).save(output, format='PNG')
+    output.seek(0)
+    return output
+
+class Client:
+    """One client thread with its own session and tokens."""
+
+    def __init__(self, base_url, booking_ids, index):
+        self.base_url = base_url
+        self.booking_ids = booking_ids
+        self.index = index
+        self.session = requests.Session()
+        self.client_headers = login(self.session, base_url, 'bench-client@example.com')
+        self.owner_headers = login(self.session, base_url, 'bench-owner@example.com')
+        self.calls = 0
+
+    def mpesa_initiate(self):
+        self.calls += 1
+        booking_id = self.booking_ids[(self.index + self.calls) % len(self.booking_ids)]
+        return self.session.post(f'{self.base_url}/api/payments/mpesa/initiate/{booking_id}',
+                                 headers=self.client_headers, json={'phone_number': '254712345678'})
+
+    def upload_space(self):
+        return self.session.post(f'{self.base_url}/api/spaces/', headers=self.owner_headers, data={
+            'name': 'Uploaded space', 'description': 'Created by worker_profiles.py', 'address': '1 Bench Rd',
+            'city': 'Nairobi', 'price_per_hour': '100', 'capacity': '10'
+        }, files={'images': ('space.png', random_image(), 'image/png')})
+
+def run_scenario(base_url, booking_ids, scenario, concurrency, duration, warmup):
+    clients = [Client(base_url, booking_ids, i) for i in range(concurrency)]
+    samples = []
+    lock = threading.Lock()
+    start_at = time.perf_counter() + warmup
+    stop_at = start_at + duration
+
+    def loop(client):
+        local = []
+        call = getattr(client, scenario)
+        while True:
+            began = time.perf_counter()
+            if began >= stop_at:
+                break
+            try:
+                status = call().status_code
+            except requests.RequestException:
+                status = None
+            if began >= start_at:
+                local.append((time.perf_counter() - began, status))
+        with lock:
+            samples.extend(local)
+
+    threads = [threading.Thread(target=loop, args=(client,)) for client in clients]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return summarize(samples, duration)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--profiles', default='sync,gevent', help='comma separated gunicorn worker classes')
+    parser.add_argument('--workers', type=int, default=2, help='gunicorn worker processes')
+    parser.add_argument('--concurrency', type=int, default=32, help='concurrent clients')
+    parser.add_argument('--duration', type=float, default=20, help='measured seconds per scenario')
+    parser.add_argument('--warmup', type=float, default=3, help='unmeasured seconds per scenario')
+    parser.add_argument('--latency', type=float, default=300, help='upstream stub latency in milliseconds')
+    parser.add_argument('--bookings', type=int, default=50, help='pending bookings to initiate payments for')
+    parser.add_argument('--out', help='write results JSON here (default: stdout)')
+    args = parser.parse_args()
+
+    profiles = args.profiles.split(',')
+    if 'gevent' in profiles and not (importlib.util.find_spec('gevent') and importlib.util.find_spec('psycogreen')):
+        raise SystemExit('the gevent profile needs: pip install gevent psycogreen')
+
+    app = create_app()
+    booking_ids = prepare(app, args.bookings)
+    stub = start_stub(latency=args.latency / 1000)
+    stub_url = f'http://127.0.0.1:{stub.server_port}'
+
+    results = {
+        'meta': {
+            'started_at': datetime.utcnow().isoformat(timespec='seconds'),
+            'database': app.config['SQLALCHEMY_DATABASE_URI'].split(':', 1)[0],
+            'workers': args.workers,
+            'concurrency': args.concurrency,
+            'duration': args.duration,
+            'upstream_latency_ms': args.latency,
+        },
+        'profiles': {}
+    }
+    for profile in profiles:
+        port = free_port()
+        process = start_gunicorn(profile, port, args, stub_url)
+        try:
+            results['profiles'][profile] = {}
+            for scenario in SCENARIOS:
+                print(f'{profile}: {scenario} with {args.concurrency} clients for {args.duration:g}s',
+                      file=sys.stderr)
+                results['profiles'][profile][scenario] = run_scenario(
+                    f'http://127.0.0.1:{port}', booking_ids, scenario,
+                    args.concurrency, args.duration, args.warmup
+                )
+        finally:
+            process.terminate()
+            process.wait(timeout=30)
+    stub.shutdown()
+
+    output = json.dumps(results, indent=2)
+    if args.out:
+        with open(args.out, 'w') as f:
+            f.write(output + '\n')
+    else:
+        print(output)
+
+    print(f"\n{'scenario':<16}{'profile':<10}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'errors':>8}",
+          file=sys.stderr)
+    for scenario in SCENARIOS:
+        for profile, scenarios in results['profiles'].items():
+            r = scenarios[scenario]
+            print(f"{scenario:<16}{profile:<10}{r['throughput']:>10}{r['p50_ms'] or '-':>10}"
+                  f"{r['p95_ms'] or '-':>10}{r['p99_ms'] or '-':>10}{r['errors']:>8}", file=sys.stderr)
+
+if __name__ == '__main__':
+    main()
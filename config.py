@@ -1,6 +1,8 @@
 import os
 from datetime import timedelta
 
+basedir = os.path.abspath(os.path.dirname(__file__))
+
 class Config:
     # Flask
     SECRET_KEY = os.environ.get('SECRET_KEY') or 'dev'
@@ -11,6 +13,33 @@ class Config:
     
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     
+    # Connection pool (per worker process)
+    DB_POOL_SIZE = int(os.environ.get('DB_POOL_SIZE', '5'))
+    DB_MAX_OVERFLOW = int(os.environ.get('DB_MAX_OVERFLOW', '10'))
+    DB_POOL_RECYCLE = int(os.environ.get('DB_POOL_RECYCLE', '1800'))  # seconds
+    DB_POOL_TIMEOUT = int(os.environ.get('DB_POOL_TIMEOUT', '30'))  # seconds
+    DB_STATEMENT_TIMEOUT_MS = int(os.environ.get('DB_STATEMENT_TIMEOUT_MS', '30000'))
+    # SQLALCHEMY_ENGINE_OPTIONS is built from these knobs and the final
+    # SQLALCHEMY_DATABASE_URI at startup (app/utils/database.py); options set
+    # here explicitly take precedence
+    
+    # Read replicas (comma separated URLs); GET requests read from these when set
+    SQLALCHEMY_REPLICA_URIS = [
+        uri.strip() for uri in os.environ.get('DATABASE_REPLICA_URLS', '').split(',') if uri.strip()
+    ]
+    REPLICA_STICKY_SECONDS = int(os.environ.get('REPLICA_STICKY_SECONDS', '10'))  # read-your-writes window
+    REPLICA_MAX_LAG = float(os.environ.get('REPLICA_MAX_LAG', '5'))  # seconds before falling back to primary
+    REPLICA_LAG_CHECK_INTERVAL = int(os.environ.get('REPLICA_LAG_CHECK_INTERVAL', '5'))  # seconds
+    
+    # Applied to every new SQLite connection
+    SQLITE_PRAGMAS = {
+        'journal_mode': 'WAL',  # readers no longer block the writer
+        'synchronous': 'NORMAL',  # safe with WAL, far fewer fsyncs
+        'busy_timeout': 5000,  # ms to wait for a lock instead of failing
+        'cache_size': -20000,  # ~20 MB page cache
+        'temp_store': 'MEMORY'
+    }
+    
     # JWT
     JWT_SECRET_KEY = os.environ.get('JWT_SECRET_KEY') or 'dev-jwt-secret'
     JWT_ACCESS_TOKEN_EXPIRES = timedelta(hours=1)
@@ -27,17 +56,102 @@ class Config:
     CLOUDINARY_CLOUD_NAME = os.environ.get('CLOUDINARY_CLOUD_NAME')
     CLOUDINARY_API_KEY = os.environ.get('CLOUDINARY_API_KEY')
     CLOUDINARY_API_SECRET = os.environ.get('CLOUDINARY_API_SECRET')
+    CLOUDINARY_UPLOAD_PREFIX = os.environ.get('CLOUDINARY_UPLOAD_PREFIX')  # API host override, e.g. a local stub
+    CLOUDINARY_TIMEOUT = float(os.environ.get('CLOUDINARY_TIMEOUT', '30'))  # seconds
+    
+    # Image storage ('cloudinary' or 'local')
+    IMAGE_STORAGE_BACKEND = os.environ.get('IMAGE_STORAGE_BACKEND', 'cloudinary')
+    IMAGE_STORAGE_PATH = os.environ.get('IMAGE_STORAGE_PATH') or os.path.join(basedir, 'media')
+    IMAGE_STORAGE_URL = os.environ.get('IMAGE_STORAGE_URL')  # defaults to BACKEND_URL + '/media'
+    IMAGE_CACHE_MAX_AGE = int(os.environ.get('IMAGE_CACHE_MAX_AGE', str(365 * 24 * 3600)))
+    USE_X_SENDFILE = os.environ.get('USE_X_SENDFILE', 'false').lower() in ['true', 'on', '1']
+    
+    # Deferred image processing: uploads are spooled and finished in the background
+    ASYNC_IMAGE_PROCESSING = os.environ.get('ASYNC_IMAGE_PROCESSING', 'false').lower() in ['true', 'on', '1']
+    IMAGE_SPOOL_DIR = os.environ.get('IMAGE_SPOOL_DIR') or os.path.join(basedir, 'spool')
+    
+    # Orphaned image garbage collection (see gc_images.py)
+    IMAGE_GC_FOLDERS = ['spacer', 'avatars']
+    IMAGE_GC_PAGE_SIZE = int(os.environ.get('IMAGE_GC_PAGE_SIZE', '500'))
+    IMAGE_GC_MAX_WORKERS = int(os.environ.get('IMAGE_GC_MAX_WORKERS', '4'))
+    IMAGE_GC_MIN_AGE = int(os.environ.get('IMAGE_GC_MIN_AGE', str(24 * 3600)))  # seconds
     
     # Sendinblue
     SENDINBLUE_API_KEY = os.environ.get('SENDINBLUE_API_KEY')
+    EMAIL_TIMEOUT = float(os.environ.get('EMAIL_TIMEOUT', '10'))  # seconds
     
     # M-Pesa configuration
     MPESA_CONSUMER_KEY = os.environ.get('MPESA_CONSUMER_KEY')
     MPESA_CONSUMER_SECRET = os.environ.get('MPESA_CONSUMER_SECRET')
     MPESA_BUSINESS_SHORTCODE = os.environ.get('MPESA_BUSINESS_SHORTCODE')
     MPESA_PASSKEY = os.environ.get('MPESA_PASSKEY')
+    MPESA_BASE_URL = os.environ.get('MPESA_BASE_URL', 'https://sandbox.safaricom.co.ke')
+    MPESA_TIMEOUT = float(os.environ.get('MPESA_TIMEOUT', '10'))  # seconds, connect and read each
     BACKEND_URL = os.environ.get('BACKEND_URL', 'http://localhost:5000')
     
+    # Response compression
+    COMPRESS_ENABLED = os.environ.get('COMPRESS_ENABLED', 'true').lower() in ['true', 'on', '1']
+    COMPRESS_ALGORITHMS = ['br', 'gzip']  # in order of preference
+    COMPRESS_LEVEL = int(os.environ.get('COMPRESS_LEVEL', '6'))  # gzip, 1-9
+    COMPRESS_BR_LEVEL = int(os.environ.get('COMPRESS_BR_LEVEL', '4'))  # brotli, 0-11
+    COMPRESS_MIN_SIZE = int(os.environ.get('COMPRESS_MIN_SIZE', '500'))  # bytes
+    COMPRESS_CHUNK_SIZE = 64 * 1024  # flush interval for streamed responses
+    COMPRESS_MIMETYPES = [
+        'application/json',
+        'application/x-ndjson',
+        'text/csv',
+        'text/html',
+        'text/plain',
+        'text/css',
+        'application/javascript'
+    ]
+    
+    # Metrics (Prometheus text format on /metrics)
+    METRICS_ENABLED = os.environ.get('METRICS_ENABLED', 'true').lower() in ['true', 'on', '1']
+    METRICS_AUTH_TOKEN = os.environ.get('METRICS_AUTH_TOKEN')  # bearer token for /metrics; 404 while unset
+    
+    # Per-request profiling (admin header or random sampling), stored in PROFILE_DIR
+    PROFILING_ENABLED = os.environ.get('PROFILING_ENABLED', 'false').lower() in ['true', 'on', '1']
+    PROFILE_HEADER = os.environ.get('PROFILE_HEADER', 'X-Profile')
+    PROFILE_SAMPLE_RATE = float(os.environ.get('PROFILE_SAMPLE_RATE', '0'))  # 0-1
+    PROFILE_MODE = os.environ.get('PROFILE_MODE', 'cprofile')  # or 'stack'
+    PROFILE_SAMPLE_INTERVAL = float(os.environ.get('PROFILE_SAMPLE_INTERVAL', '0.005'))  # seconds, 'stack' mode
+    PROFILE_DIR = os.environ.get('PROFILE_DIR') or os.path.join(basedir, 'profiles')
+    PROFILE_RETENTION = int(os.environ.get('PROFILE_RETENTION', '100'))  # newest profiles kept
+    
+    # N+1 query detection (defaults to on in debug and testing mode)
+    QUERY_COUNTER_ENABLED = None
+    QUERY_REPEAT_THRESHOLD = int(os.environ.get('QUERY_REPEAT_THRESHOLD', '10'))
+    QUERY_REPEAT_RAISE = False
+    
+    # Response data cache ('local' per worker, or 'redis' shared between workers)
+    CACHE_ENABLED = os.environ.get('CACHE_ENABLED', 'true').lower() in ['true', 'on', '1']
+    CACHE_BACKEND = os.environ.get('CACHE_BACKEND', 'local')
+    CACHE_REDIS_URL = os.environ.get('CACHE_REDIS_URL', 'redis://localhost:6379/0')
+    CACHE_DEFAULT_TTL = int(os.environ.get('CACHE_DEFAULT_TTL', '60'))  # seconds
+    CACHE_STATS_TTL = int(os.environ.get('CACHE_STATS_TTL', '30'))  # seconds
+    CACHE_MAX_ENTRIES = int(os.environ.get('CACHE_MAX_ENTRIES', '2048'))
+    
+    # Cache-Control overrides by endpoint, merged over the views' @cache_control policies
+    CACHE_CONTROL_POLICIES = {
+        'flasgger.apispec': {'max_age': 3600, 'stale_while_revalidate': 86400}
+    }
+    
+    # API docs on /docs and /apispec.json; the generated spec is cached on disk
+    SWAGGER_ENABLED = os.environ.get('SWAGGER_ENABLED', 'true').lower() in ['true', 'on', '1']
+    SWAGGER_CACHE_DIR = os.environ.get('SWAGGER_CACHE_DIR') or os.path.join(basedir, 'instance')
+    
+    # Admin exports: rows fetched per server-side cursor batch. gunicorn.conf.py
+    # turns exports off for sync workers whose timeout would cut them short
+    EXPORTS_ENABLED = os.environ.get('EXPORTS_ENABLED', 'true').lower() in ['true', 'on', '1']
+    EXPORT_BATCH_SIZE = int(os.environ.get('EXPORT_BATCH_SIZE', '2000'))
+    
+    # Delta sync: seconds the returned high-water mark trails the database clock, to catch
+    # slow commits and app server clock skew
+    DELTA_SYNC_OVERLAP = int(os.environ.get('DELTA_SYNC_OVERLAP', '5'))
+    # Days of tombstones kept by `flask prune-deletion-log`; older updated_since values get 410
+    DELETION_LOG_RETENTION_DAYS = int(os.environ.get('DELETION_LOG_RETENTION_DAYS', '30'))
+    
     # Pagination
     ITEMS_PER_PAGE = 10
 
@@ -46,13 +160,22 @@ class Config:
 
 class DevelopmentConfig(Config):
     DEBUG = True
+    DB_POOL_SIZE = int(os.environ.get('DB_POOL_SIZE', '2'))
+    DB_MAX_OVERFLOW = int(os.environ.get('DB_MAX_OVERFLOW', '5'))
+    DB_STATEMENT_TIMEOUT_MS = int(os.environ.get('DB_STATEMENT_TIMEOUT_MS', '60000'))
 
 class TestingConfig(Config):
     TESTING = True
+    QUERY_REPEAT_RAISE = True
     # SQLALCHEMY_DATABASE_URI = 'postgresql://localhost/spacer_test_db'
 
 class ProductionConfig(Config):
     DEBUG = False
+    DB_POOL_SIZE = int(os.environ.get('DB_POOL_SIZE', '10'))
+    DB_MAX_OVERFLOW = int(os.environ.get('DB_MAX_OVERFLOW', '20'))
+    DB_POOL_RECYCLE = int(os.environ.get('DB_POOL_RECYCLE', '900'))
+    DB_POOL_TIMEOUT = int(os.environ.get('DB_POOL_TIMEOUT', '10'))
+    DB_STATEMENT_TIMEOUT_MS = int(os.environ.get('DB_STATEMENT_TIMEOUT_MS', '15000'))
 
 config = {
     'development': DevelopmentConfig,
@@ -0,0 +1,49 @@
+"""
+Delete stored images that are no longer referenced by any space or avatar.
+
+Usage:
+    python gc_images.py [--dry-run] [--max-pages N] [--state gc_state.json]
+
+With --max-pages the run stops after N listing pages and records where it
+stopped in the state file, so the next run continues from there. A dry run
+reads the state file but never writes it, since nothing was deleted.
+"""
+import argparse
+import json
+import os
+from app import create_app
+from app.utils.image_gc import collect_garbage
+
+def main():
+    parser = argparse.ArgumentParser(description='Delete orphaned images from storage.')
+    parser.add_argument('--dry-run', action='store_true', help='report orphans without deleting them')
+    parser.add_argument('--max-pages', type=int, help='stop after this many listing pages')
+    parser.add_argument('--page-size', type=int, help='objects per listing page')
+    parser.add_argument('--workers', type=int, help='parallel delete calls')
+    parser.add_argument('--state', help='file used to resume incremental runs')
+    args = parser.parse_args()
+    
+    pending = None
+    if args.state and os.path.exists(args.state):
+        with open(args.state) as f:
+            pending = json.load(f) or None
+    
+    app = create_app()
+    with app.app_context():
+        report = collect_garbage(
+            folders=list(pending) if pending else None,
+            cursors=pending,
+            max_pages=args.max_pages,
+            page_size=args.page_size,
+            max_workers=args.workers,
+            dry_run=args.dry_run
+        )
+    
+    if args.state and not args.dry_run:
+        with open(args.state, 'w') as f:
+            json.dump(report['pending'], f)
+    
+    print(json.dumps(report, indent=2))
+
+if __name__ == '__main__':
+    main()
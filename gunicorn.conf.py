@@ -0,0 +1,70 @@
+"""
+Gunicorn configuration.
+
+    gunicorn -c gunicorn.conf.py run:app
+
+Metrics from all workers are aggregated through PROMETHEUS_MULTIPROC_DIR,
+which must be set in the environment before gunicorn starts so that every
+worker writes its metric values there.
+
+GUNICORN_WORKER_CLASS=gevent selects the high-concurrency profile: each
+worker serves up to GUNICORN_WORKER_CONNECTIONS requests at once, and a
+request waiting on M-Pesa, Cloudinary, Sendinblue or PostgreSQL yields to
+the others instead of blocking the worker. It needs the gevent and
+psycogreen packages. Size DB_POOL_SIZE + DB_MAX_OVERFLOW for the
+concurrent requests that actually reach the database. CPU-heavy work does
+not yield, and with threading monkey-patched the ASYNC_IMAGE_PROCESSING
+worker is a greenlet too, so image resizing runs on gevent's native thread
+pool instead (see run_cpu_bound in app/utils/images.py).
+
+Response caching needs CACHE_BACKEND=redis when running more than one
+worker; the per-process local cache is turned off in that case.
+
+Admin exports stream for as long as the table takes to read. A sync worker
+only checks in with the arbiter between requests, so an export running past
+GUNICORN_TIMEOUT gets the worker killed mid-body. With sync workers exports
+are turned off unless the timeout is at least EXPORT_MIN_TIMEOUT; use the
+gevent profile, raise the timeout, or serve /api/admin/export from a
+separate gunicorn with either.
+"""
+import os
+import shutil
+
+bind = os.environ.get('GUNICORN_BIND', '0.0.0.0:5000')
+workers = int(os.environ.get('GUNICORN_WORKERS', '4'))
+worker_class = os.environ.get('GUNICORN_WORKER_CLASS', 'sync')
+worker_connections = int(os.environ.get('GUNICORN_WORKER_CONNECTIONS', '200'))  # gevent only
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', '30'))
+graceful_timeout = int(os.environ.get('GUNICORN_GRACEFUL_TIMEOUT', '30'))
+keepalive = int(os.environ.get('GUNICORN_KEEPALIVE', '5'))
+
+# The local cache is only invalidated in the worker that wrote the change, so
+# with several workers the others would serve stale entries until they
+# expire. Turn it off unless CACHE_BACKEND points at a shared store or
+# CACHE_ENABLED is set explicitly.
+if workers > 1 and os.environ.get('CACHE_BACKEND', 'local') == 'local':
+    os.environ.setdefault('CACHE_ENABLED', 'false')
+
+# Unless EXPORTS_ENABLED is set explicitly, see the module docstring
+EXPORT_MIN_TIMEOUT = 600
+if worker_class == 'sync' and 0 < timeout < EXPORT_MIN_TIMEOUT:
+    os.environ.setdefault('EXPORTS_ENABLED', 'false')
+
+def on_starting(server):
+    # Start each run with an empty metrics directory
+    multiproc_dir = os.environ.get('PROMETHEUS_MULTIPROC_DIR')
+    if multiproc_dir:
+        shutil.rmtree(multiproc_dir, ignore_errors=True)
+        os.makedirs(multiproc_dir, exist_ok=True)
+
+def post_fork(server, worker):
+    if 'gevent' in server.cfg.worker_class_str:
+        # gunicorn monkey-patches the standard library; psycopg2 is a C
+        # extension and needs its own wait callback to yield while queries run
+        from psycogreen.gevent import patch_psycopg
+        patch_psycopg()
+
+def child_exit(server, worker):
+    if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        from prometheus_client import multiprocess
+        multiprocess.mark_process_dead(worker.pid)
@@ -0,0 +1,36 @@
+"""Add content hashes for uploaded images
+
+Revision ID: 3e6d84d292e9
+Revises: 92fa4ce5b028
+Create Date: 2026-10-19 09:12:41.208113
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3e6d84d292e9'
+down_revision = '92fa4ce5b028'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('space_images', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('content_hash', sa.String(length=64), nullable=True))
+        batch_op.create_index(batch_op.f('ix_space_images_content_hash'), ['content_hash'], unique=False)
+
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('avatar_hash', sa.String(length=64), nullable=True))
+        batch_op.create_index(batch_op.f('ix_users_avatar_hash'), ['avatar_hash'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_users_avatar_hash'))
+        batch_op.drop_column('avatar_hash')
+
+    with op.batch_alter_table('space_images', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_space_images_content_hash'))
+        batch_op.drop_column('content_hash')
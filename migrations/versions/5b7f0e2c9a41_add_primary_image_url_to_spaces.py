@@ -0,0 +1,48 @@
+"""Add primary image URL to spaces
+
+Revision ID: 5b7f0e2c9a41
+Revises: 692f73c48a15
+Create Date: 2026-10-19 14:21:38.104752
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5b7f0e2c9a41'
+down_revision = '692f73c48a15'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('spaces', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('primary_image_url', sa.String(length=255), nullable=True))
+
+    # Backfill from the first ready primary image of each space
+    spaces = sa.table('spaces', sa.column('id', sa.Integer), sa.column('primary_image_url', sa.String))
+    images = sa.table(
+        'space_images',
+        sa.column('id', sa.Integer),
+        sa.column('space_id', sa.Integer),
+        sa.column('image_url', sa.String),
+        sa.column('is_primary', sa.Boolean)
+    )
+    primary_image_url = (
+        sa.select(images.c.image_url)
+        .where(
+            images.c.space_id == spaces.c.id,
+            images.c.is_primary.is_(True),
+            images.c.image_url.isnot(None)
+        )
+        .order_by(images.c.id)
+        .limit(1)
+        .scalar_subquery()
+    )
+    op.execute(spaces.update().values(primary_image_url=primary_image_url))
+
+
+def downgrade():
+    with op.batch_alter_table('spaces', schema=None) as batch_op:
+        batch_op.drop_column('primary_image_url')
@@ -0,0 +1,33 @@
+"""Add processing status to space images
+
+Revision ID: 692f73c48a15
+Revises: 3e6d84d292e9
+Create Date: 2026-10-19 10:04:17.532961
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '692f73c48a15'
+down_revision = '3e6d84d292e9'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('space_images', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('status', sa.String(length=20), nullable=False, server_default='ready'))
+        batch_op.alter_column('image_url',
+               existing_type=sa.VARCHAR(length=255),
+               nullable=True)
+
+
+def downgrade():
+    op.execute("DELETE FROM space_images WHERE image_url IS NULL")
+    with op.batch_alter_table('space_images', schema=None) as batch_op:
+        batch_op.alter_column('image_url',
+               existing_type=sa.VARCHAR(length=255),
+               nullable=False)
+        batch_op.drop_column('status')
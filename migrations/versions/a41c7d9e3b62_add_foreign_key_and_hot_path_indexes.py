@@ -0,0 +1,43 @@
+"""Add foreign key and hot path indexes
+
+Revision ID: a41c7d9e3b62
+Revises: 5b7f0e2c9a41
+Create Date: 2026-10-19 15:02:11.386420
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a41c7d9e3b62'
+down_revision = '5b7f0e2c9a41'
+branch_labels = None
+depends_on = None
+
+# name, table, columns
+INDEXES = [
+    ('ix_bookings_user_id', 'bookings', ['user_id']),
+    # Overlap check in create_booking; its leading column also covers bookings.space_id
+    ('ix_bookings_space_status_time', 'bookings', ['space_id', 'status', 'start_time', 'end_time']),
+    ('ix_bookings_created_at', 'bookings', [sa.text('created_at DESC')]),
+    ('ix_payments_booking_id', 'payments', ['booking_id']),
+    ('ix_reviews_space_id', 'reviews', ['space_id']),
+    ('ix_reviews_user_id', 'reviews', ['user_id']),
+    ('ix_space_images_space_id', 'space_images', ['space_id']),
+    ('ix_spaces_owner_id', 'spaces', ['owner_id']),
+    ('ix_users_created_at', 'users', [sa.text('created_at DESC')]),
+]
+
+
+def upgrade():
+    # CONCURRENTLY cannot run inside a transaction, and avoids locking writes on PostgreSQL
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(name, table, columns, unique=False, postgresql_concurrently=True)
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        for name, table, columns in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True)
@@ -0,0 +1,49 @@
+"""Add deletion log and updated_at indexes for delta sync
+
+Revision ID: c7d2e5f18a90
+Revises: a41c7d9e3b62
+Create Date: 2026-10-19 19:20:41.512803
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c7d2e5f18a90'
+down_revision = 'a41c7d9e3b62'
+branch_labels = None
+depends_on = None
+
+# name, table, columns
+INDEXES = [
+    ('ix_spaces_updated_at', 'spaces', ['updated_at']),
+    ('ix_bookings_updated_at', 'bookings', ['updated_at']),
+]
+
+
+def upgrade():
+    op.create_table('deletion_log',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('table_name', sa.String(length=50), nullable=False),
+    sa.Column('row_id', sa.Integer(), nullable=False),
+    sa.Column('owner_id', sa.Integer(), nullable=True),
+    sa.Column('user_id', sa.Integer(), nullable=True),
+    sa.Column('deleted_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_deletion_log_table_deleted_at', 'deletion_log', ['table_name', 'deleted_at'], unique=False)
+
+    # CONCURRENTLY cannot run inside a transaction, and avoids locking writes on PostgreSQL
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(name, table, columns, unique=False, postgresql_concurrently=True)
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        for name, table, columns in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True)
+
+    op.drop_index('ix_deletion_log_table_deleted_at', table_name='deletion_log')
+    op.drop_table('deletion_log')
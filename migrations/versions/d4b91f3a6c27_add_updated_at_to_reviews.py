@@ -0,0 +1,30 @@
+"""Add updated_at to reviews
+
+Revision ID: d4b91f3a6c27
+Revises: c7d2e5f18a90
+Create Date: 2026-10-19 21:04:17.385920
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd4b91f3a6c27'
+down_revision = 'c7d2e5f18a90'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('reviews', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('updated_at', sa.DateTime(), nullable=True))
+
+    # Existing reviews were last changed when they were written
+    reviews = sa.table('reviews', sa.column('created_at', sa.DateTime), sa.column('updated_at', sa.DateTime))
+    op.execute(reviews.update().values(updated_at=reviews.c.created_at))
+
+
+def downgrade():
+    with op.batch_alter_table('reviews', schema=None) as batch_op:
+        batch_op.drop_column('updated_at')
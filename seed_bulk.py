@@ -0,0 +1,309 @@
+"""
+Generate a large synthetic dataset for benchmarking.
+
+Unlike seed_spaces.py this skips the ORM and writes rows in batches with Core
+executemany, or COPY on PostgreSQL. Output is reproducible for a given --seed
+and --anchor: all dates are laid out around the anchor, not the current time.
+
+Distributions:
+  * cities are Zipf-skewed (Nairobi gets the most spaces)
+  * owners and spaces follow a power law, so a few spaces get most bookings;
+    only clients book and review
+  * bookings never overlap within a space; past ones are mostly completed
+  * paid bookings get a payment with a unique transaction id, and part of the
+    completed ones get a review from the guest
+
+Usage:
+    python seed_bulk.py --users 100000 --spaces 20000 --bookings 1000000
+    python seed_bulk.py --users 1000 --spaces 200 --bookings 10000 --seed 7
+"""
+import argparse
+import csv
+import io
+import random
+import string
+import time
+from datetime import datetime, timedelta
+
+import bcrypt
+from sqlalchemy import func, select, text
+
+from app import create_app, db
+
+CITIES = ['Nairobi', 'Mombasa', 'Kisumu', 'Nakuru', 'Eldoret', 'Thika', 'Malindi', 'Kitale',
+          'Garissa', 'Nyeri', 'Machakos', 'Meru', 'Kericho', 'Naivasha', 'Kakamega']
+FIRST_NAMES = ['Amina', 'Brian', 'Caro', 'David', 'Esther', 'Felix', 'Grace', 'Hassan', 'Irene',
+               'James', 'Kevin', 'Lucy', 'Mercy', 'Njeri', 'Otieno', 'Peter', 'Faith', 'Wanjiru']
+LAST_NAMES = ['Achieng', 'Kamau', 'Mwangi', 'Odhiambo', 'Wafula', 'Kiptoo', 'Njoroge', 'Mutua',
+              'Omondi', 'Chebet', 'Karanja', 'Wekesa', 'Ali', 'Barasa', 'Kariuki', 'Onyango']
+SPACE_KINDS = ['Conference Room', 'Studio', 'Loft', 'Rooftop', 'Meeting Room', 'Event Hall',
+               'Co-working Desk', 'Garden', 'Gallery', 'Workshop']
+PURPOSES = ['Team meeting', 'Workshop', 'Photo shoot', 'Birthday party', 'Interview', 'Training',
+            'Product launch', 'Board meeting', 'Podcast recording', 'Yoga class']
+IMAGE_URLS = [
+    'https://images.unsplash.com/photo-1506744038136-46273834b3fb',
+    'https://images.unsplash.com/photo-1494526585095-c41746248156',
+    'https://images.unsplash.com/photo-1520880867055-1e30d1cb001c',
+    'https://images.unsplash.com/photo-1504384308090-c894fdcc538d',
+    'https://images.unsplash.com/photo-1515377905703-c4788e51af15',
+    'https://images.unsplash.com/photo-1499951360447-b19be8fe80f5',
+]
+
+# Parents are written before children so foreign keys hold at every flush
+TABLE_ORDER = ['users', 'spaces', 'space_images', 'bookings', 'payments', 'reviews']
+
+class BulkWriter:
+    """Buffers rows per table and writes them in batches, tracking rows per second."""
+
+    def __init__(self, connection, batch_size, use_copy):
+        self.connection = connection
+        self.batch_size = batch_size
+        self.use_copy = use_copy
+        self.tables = db.metadata.tables
+        self.buffers = {name: [] for name in TABLE_ORDER}
+        self.rows = dict.fromkeys(TABLE_ORDER, 0)
+        self.seconds = dict.fromkeys(TABLE_ORDER, 0.0)
+
+    def add(self, table, row):
+        buffer = self.buffers[table]
+        buffer.append(row)
+        if len(buffer) >= self.batch_size:
+            # Flush everything this table may reference first
+            for name in TABLE_ORDER[:TABLE_ORDER.index(table) + 1]:
+                self.flush(name)
+
+    def flush(self, table):
+        rows = self.buffers[table]
+        if not rows:
+            return
+        start = time.perf_counter()
+        if self.use_copy:
+            self._copy(table, rows)
+        else:
+            self.connection.execute(self.tables[table].insert(), rows)
+        self.connection.commit()
+        self.seconds[table] += time.perf_counter() - start
+        self.rows[table] += len(rows)
+        self.buffers[table] = []
+
+    def _copy(self, table, rows):
+        columns = list(rows[0])
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for row in rows:
+            writer.writerow(['' if row[column] is None else row[column] for column in columns])
+        buffer.seek(0)
+        cursor = self.connection.connection.cursor()
+        cursor.copy_expert(f"COPY {table} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)", buffer)
+
+    def close(self):
+        for table in TABLE_ORDER:
+            self.flush(table)
+
+def power_law_weights(rng, count, alpha):
+    """Pareto distributed weights: a few large values, a long tail of small ones."""
+    return [rng.paretovariate(alpha) for _ in range(count)]
+
+BCRYPT_ALPHABET = './ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789'
+
+def bcrypt_salt(rng, rounds=12):
+    """A bcrypt salt drawn from rng; bcrypt.gensalt() reads os.urandom and cannot be seeded."""
+    # 22 characters encode 128 bits, so the last one only carries its top two bits
+    body = ''.join(rng.choice(BCRYPT_ALPHABET) for _ in range(21)) + rng.choice('.Oeu')
+    return f'$2b${rounds:02d}${body}'.encode()
+
+def next_ids(connection):
+    """First free id per table, so the generator can append to an existing database."""
+    return {
+        table: (connection.execute(select(func.max(db.metadata.tables[table].c.id))).scalar() or 0) + 1
+        for table in TABLE_ORDER
+    }
+
+def seed(writer, rng, ids, args):
+    now = args.anchor
+    password_hash = bcrypt.hashpw(b'Password123', bcrypt_salt(rng)).decode()  # shared, bcrypt is slow
+
+    # Users: ~5% owners, the rest clients
+    owner_ids, client_ids = [], []
+    for user_id in range(ids['users'], ids['users'] + args.users):
+        role = 'owner' if rng.random() < args.owner_share else 'client'
+        (owner_ids if role == 'owner' else client_ids).append(user_id)
+        created_at = now - timedelta(seconds=rng.randint(0, 3 * 365 * 24 * 3600))
+        writer.add('users', {
+            'id': user_id,
+            'email': f'user{user_id}@example.com',
+            'password_hash': password_hash,
+            'first_name': rng.choice(FIRST_NAMES),
+            'last_name': rng.choice(LAST_NAMES),
+            'role': role,
+            'is_verified': rng.random() < 0.8,
+            'phone': f'2547{rng.randint(0, 99999999):08d}',
+            'bio': None,
+            'avatar_url': None,
+            'created_at': created_at,
+            'updated_at': created_at
+        })
+    if not owner_ids or not client_ids:
+        raise SystemExit('need both owners and clients, adjust --users or --owner-share')
+
+    # Spaces: owners with power-law portfolio sizes, Zipf-skewed cities
+    owner_weights = power_law_weights(rng, len(owner_ids), 1.2)
+    city_weights = [1 / rank for rank in range(1, len(CITIES) + 1)]
+    space_owners = rng.choices(owner_ids, weights=owner_weights, k=args.spaces)
+    space_cities = rng.choices(CITIES, weights=city_weights, k=args.spaces)
+    spaces = []
+    image_id = ids['space_images']
+    for offset in range(args.spaces):
+        space_id = ids['spaces'] + offset
+        price = round(rng.lognormvariate(7, 0.6) / 50) * 50 + 100
+        urls = rng.sample(IMAGE_URLS, rng.randint(1, 4))
+        urls = [f'{url}?auto=format&fit=crop&w=800&q=80&sig={space_id}-{i}' for i, url in enumerate(urls)]
+        created_at = now - timedelta(seconds=rng.randint(0, 2 * 365 * 24 * 3600))
+        spaces.append((space_id, price))
+        writer.add('spaces', {
+            'id': space_id,
+            'name': f'{rng.choice(LAST_NAMES)} {rng.choice(SPACE_KINDS)}',
+            'description': f'{rng.choice(SPACE_KINDS)} in {space_cities[offset]}, ideal for '
+                           f'{rng.choice(PURPOSES).lower()}.',
+            'address': f'{rng.randint(1, 999)} {rng.choice(LAST_NAMES)} Road',
+            'city': space_cities[offset],
+            'price_per_hour': float(price),
+            'capacity': rng.choice([2, 4, 6, 8, 10, 12, 20, 30, 50, 100, 200]),
+            'owner_id': space_owners[offset],
+            'is_available': rng.random() < 0.9,
+            'primary_image_url': urls[0],
+            'created_at': created_at,
+            'updated_at': created_at
+        })
+        for i, url in enumerate(urls):
+            writer.add('space_images', {
+                'id': image_id,
+                'space_id': space_id,
+                'image_url': url,
+                'content_hash': None,
+                'status': 'ready',
+                'is_primary': i == 0,
+                'created_at': created_at
+            })
+            image_id += 1
+
+    # Bookings: split by power-law popularity, laid out back to back per space
+    window_start = now.replace(minute=0, second=0) - timedelta(days=args.history_days)
+    window_hours = (args.history_days + args.future_days) * 24
+    popularity = power_law_weights(rng, len(spaces), 1.1)
+    total_weight = sum(popularity)
+    booking_id, payment_id, review_id = ids['bookings'], ids['payments'], ids['reviews']
+    for (space_id, price), weight in zip(spaces, popularity):
+        count = min(round(args.bookings * weight / total_weight), window_hours // 2)
+        if not count:
+            continue
+        # One booking somewhere inside each of `count` equal slots, so none can overlap
+        slot_hours = window_hours // count
+        for slot in range(count):
+            hours = rng.randint(1, max(1, min(8, slot_hours * 3 // 5)))
+            start = window_start + timedelta(hours=slot * slot_hours + rng.randint(0, slot_hours - hours))
+            end = start + timedelta(hours=hours)
+
+            if end <= now:
+                status = 'cancelled' if rng.random() < 0.08 else 'completed'
+            else:
+                status = rng.choices(['confirmed', 'pending', 'cancelled'], weights=[70, 22, 8])[0]
+            paid = status in ('completed', 'confirmed') and rng.random() < 0.95
+            payment_status = 'paid' if paid else ('refunded' if status == 'cancelled' and rng.random() < 0.3
+                                                  else 'pending')
+            user_id = rng.choice(client_ids)
+            created_at = start - timedelta(hours=rng.randint(1, 24 * 30))
+            writer.add('bookings', {
+                'id': booking_id,
+                'space_id': space_id,
+                'user_id': user_id,
+                'start_time': start,
+                'end_time': end,
+                'total_price': float(price * hours),
+                'purpose': rng.choice(PURPOSES),
+                'status': status,
+                'payment_status': payment_status,
+                'created_at': created_at,
+                'updated_at': created_at
+            })
+            if payment_status != 'pending':
+                writer.add('payments', {
+                    'id': payment_id,
+                    'booking_id': booking_id,
+                    'amount': float(price * hours),
+                    'payment_method': 'mpesa',
+                    'transaction_id': f"{rng.choice(string.ascii_uppercase)}{booking_id:09d}"
+                                      f"{''.join(rng.choices(string.ascii_uppercase, k=2))}",
+                    'status': 'refunded' if payment_status == 'refunded' else 'completed',
+                    'created_at': created_at,
+                    'updated_at': created_at
+                })
+                payment_id += 1
+            if status == 'completed' and rng.random() < args.review_share:
+                reviewed_at = min(end + timedelta(hours=rng.randint(1, 72)), now)
+                # A few reviews are edited later
+                edited_at = reviewed_at
+                if rng.random() < 0.1:
+                    edited_at += timedelta(hours=rng.randint(1, 24 * 14))
+                writer.add('reviews', {
+                    'id': review_id,
+                    'user_id': user_id,
+                    'space_id': space_id,
+                    'rating': rng.choices([1, 2, 3, 4, 5], weights=[3, 4, 12, 35, 46])[0],
+                    'comment': rng.choice(['Great space', 'Would book again', 'Clean and quiet',
+                                           'A bit noisy', 'Exactly as described', 'Good value']),
+                    'created_at': reviewed_at,
+                    'updated_at': min(edited_at, now)
+                })
+                review_id += 1
+            booking_id += 1
+
+def reset_sequences(connection):
+    """Explicit ids leave PostgreSQL sequences behind; move them past the new rows."""
+    if connection.dialect.name != 'postgresql':
+        return
+    for table in TABLE_ORDER:
+        connection.execute(text(
+            f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), "
+            f"(SELECT COALESCE(MAX(id), 1) FROM {table}))"
+        ))
+    connection.commit()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--users', type=int, default=100000)
+    parser.add_argument('--spaces', type=int, default=20000)
+    parser.add_argument('--bookings', type=int, default=1000000, help='approximate total')
+    parser.add_argument('--owner-share', type=float, default=0.05)
+    parser.add_argument('--review-share', type=float, default=0.3, help='completed bookings reviewed')
+    parser.add_argument('--history-days', type=int, default=730)
+    parser.add_argument('--future-days', type=int, default=90)
+    parser.add_argument('--batch-size', type=int, default=10000)
+    parser.add_argument('--method', choices=['auto', 'executemany', 'copy'], default='auto',
+                        help='auto uses COPY on PostgreSQL')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--anchor', type=datetime.fromisoformat, default=datetime(2025, 1, 1),
+                        help='"now" of the dataset (ISO datetime); history and future days are counted from it')
+    args = parser.parse_args()
+
+    app = create_app()
+    with app.app_context():
+        with db.engine.connect() as connection:
+            use_copy = args.method == 'copy' or (args.method == 'auto' and connection.dialect.name == 'postgresql')
+            writer = BulkWriter(connection, args.batch_size, use_copy)
+            started = time.perf_counter()
+            seed(writer, random.Random(args.seed), next_ids(connection), args)
+            writer.close()
+            reset_sequences(connection)
+            elapsed = time.perf_counter() - started
+
+    total = sum(writer.rows.values())
+    print(f"{'table':<14}{'rows':>12}{'insert s':>10}{'rows/s':>12}")
+    for table in TABLE_ORDER:
+        seconds = writer.seconds[table]
+        rate = writer.rows[table] / seconds if seconds else 0
+        print(f'{table:<14}{writer.rows[table]:>12,}{seconds:>10.1f}{rate:>12,.0f}')
+    print(f"{'total':<14}{total:>12,}{elapsed:>10.1f}{total / elapsed:>12,.0f}  (including generation)")
+
+if __name__ == '__main__':
+    main()
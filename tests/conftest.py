@@ -0,0 +1,89 @@
+from datetime import datetime, timedelta
+
+import pytest
+from flask_jwt_extended import create_access_token
+
+from config import TestingConfig
+from app import create_app, db
+from app.models.booking import Booking, Payment
+from app.models.review import Review
+from app.models.space import Space, SpaceImage
+from app.models.user import User
+
+pytest_plugins = ['app.utils.pytest_plugin']
+
+@pytest.fixture
+def make_app(tmp_path):
+    """Build an app on a fresh SQLite file; keyword arguments override config."""
+    def make_app(**overrides):
+        config = type('TestConfig', (TestingConfig,), {
+            'SQLALCHEMY_DATABASE_URI': f"sqlite:///{tmp_path / 'spacer.db'}",
+            'SWAGGER_ENABLED': False,
+            'PROFILING_ENABLED': False,
+            'IMAGE_SPOOL_DIR': str(tmp_path / 'spool'),
+            'MEDIA_ROOT': str(tmp_path / 'media'),
+            **overrides
+        })
+        app = create_app(config)
+        with app.app_context():
+            db.create_all()
+        return app
+    return make_app
+
+@pytest.fixture
+def app(make_app):
+    return make_app()
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+def create_user(role, email=None):
+    user = User(email=email or f'{role}-{User.query.count()}@example.com',
+                first_name='Test', last_name='User', role=role)
+    user.set_password('Password123')
+    db.session.add(user)
+    db.session.flush()
+    return user
+
+def auth_headers(app, user_id):
+    with app.app_context():
+        return {'Authorization': f'Bearer {create_access_token(identity=str(user_id))}'}
+
+@pytest.fixture
+def seeded(app):
+    """
+    Ids of an admin, two owners with three spaces each and two clients with
+    bookings, payments and reviews on every space: enough rows that a query
+    issued per row shows up in the counts.
+    """
+    with app.app_context():
+        admin = create_user('admin')
+        owners = [create_user('owner') for _ in range(2)]
+        clients = [create_user('client') for _ in range(2)]
+        start = datetime(2030, 1, 1, 9)
+        spaces = []
+        for owner in owners:
+            for i in range(3):
+                space = Space(name=f'Space {i}', description='A space', address='1 Test Rd', city='Nairobi',
+                              price_per_hour=100.0, capacity=10, owner_id=owner.id)
+                space.images = [SpaceImage(image_url=f'https://img.example.com/{owner.id}-{i}-{n}.jpg',
+                                           is_primary=n == 0) for n in range(2)]
+                db.session.add(space)
+                spaces.append(space)
+        db.session.flush()
+        for n, space in enumerate(spaces):
+            for client in clients:
+                booking = Booking(space_id=space.id, user_id=client.id,
+                                  start_time=start + timedelta(days=n), end_time=start + timedelta(days=n, hours=2),
+                                  total_price=200.0, purpose='Meeting', status='confirmed', payment_status='paid')
+                booking.payment = Payment(amount=200.0, payment_method='mpesa', status='completed')
+                db.session.add(booking)
+                db.session.add(Review(space_id=space.id, user_id=client.id, rating=4, comment='Good'))
+        db.session.commit()
+        return {
+            'admin': admin.id,
+            'owners': [owner.id for owner in owners],
+            'clients': [client.id for client in clients],
+            'spaces': [space.id for space in spaces]
+        }
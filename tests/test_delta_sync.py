@@ -0,0 +1,97 @@
+"""
+Delta sync on the spaces and bookings listings: changed rows, tombstones
+(including those of rows deleted by cascade), scoping per owner and client,
+and the retention window of the deletion log.
+"""
+from datetime import datetime, timedelta
+
+import pytest
+
+from conftest import auth_headers
+from app import db
+from app.models.booking import Booking
+from app.models.deletion_log import DeletionLog
+from app.models.space import Space
+from app.utils.delta_sync import prune_deletion_log
+
+@pytest.fixture
+def doomed(app, seeded):
+    """A space of the first owner with one booking by the first client, ready to delete."""
+    with app.app_context():
+        space = Space(name='Doomed', description='A space', address='1 Test Rd', city='Nairobi',
+                      price_per_hour=100.0, capacity=10, owner_id=seeded['owners'][0])
+        space.bookings = [Booking(user_id=seeded['clients'][0], start_time=datetime(2031, 1, 1, 9),
+                                  end_time=datetime(2031, 1, 1, 11), total_price=200.0, purpose='Meeting')]
+        db.session.add(space)
+        db.session.commit()
+        return {'space': space.id, 'booking': space.bookings[0].id}
+
+def delta(client, path, since, headers=None):
+    response = client.get(path, query_string={'updated_since': since}, headers=headers)
+    assert response.status_code == 200, response.get_json()
+    return response.get_json()
+
+def test_bootstrap_returns_everything(client, seeded):
+    body = delta(client, '/api/spaces/', '1970-01-01')
+    assert sorted(space['id'] for space in body['spaces']) == sorted(seeded['spaces'])
+    assert body['deleted'] == []
+    assert body['high_water_mark']
+
+def test_cascade_deletes_leave_tombstones(app, client, seeded, doomed):
+    since = (datetime.utcnow() - timedelta(minutes=1)).isoformat()
+    owner = auth_headers(app, seeded['owners'][0])
+    response = client.delete(f"/api/spaces/{doomed['space']}", headers=owner)
+    assert response.status_code == 200
+
+    assert delta(client, '/api/spaces/', since)['deleted'] == [doomed['space']]
+    assert delta(client, '/api/spaces/my-spaces', since, owner)['deleted'] == [doomed['space']]
+    client_headers = auth_headers(app, seeded['clients'][0])
+    assert delta(client, '/api/bookings/', since, client_headers)['deleted'] == [doomed['booking']]
+    assert delta(client, '/api/bookings/', since, owner)['deleted'] == [doomed['booking']]
+
+def test_deltas_are_scoped(app, client, seeded, doomed):
+    since = (datetime.utcnow() - timedelta(minutes=1)).isoformat()
+    client.delete(f"/api/spaces/{doomed['space']}", headers=auth_headers(app, seeded['owners'][0]))
+
+    other_owner = auth_headers(app, seeded['owners'][1])
+    body = delta(client, '/api/spaces/my-spaces', since, other_owner)
+    assert {space['owner_id'] for space in body['spaces']} == {seeded['owners'][1]}
+    assert body['deleted'] == []
+    assert delta(client, '/api/bookings/', since, other_owner)['deleted'] == []
+
+    other_client = auth_headers(app, seeded['clients'][1])
+    body = delta(client, '/api/bookings/', since, other_client)
+    assert {booking['user_id'] for booking in body['bookings']} == {seeded['clients'][1]}
+    assert body['deleted'] == []
+
+def test_updated_since_with_utc_offset(app, client, seeded):
+    with app.app_context():
+        Space.query.filter_by(id=seeded['spaces'][0]).update({'updated_at': datetime(2030, 1, 1, 12)})
+        db.session.commit()
+    # 14:30+03:00 is 11:30 UTC, before the update; 15:30+03:00 is after it
+    before = delta(client, '/api/spaces/', '2030-01-01T14:30:00+03:00')
+    assert [space['id'] for space in before['spaces']] == [seeded['spaces'][0]]
+    assert delta(client, '/api/spaces/', '2030-01-01T15:30:00+03:00')['spaces'] == []
+
+def test_filters_cannot_be_combined_with_delta(client, seeded):
+    response = client.get('/api/spaces/?city=Nairobi&updated_since=1970-01-01')
+    assert response.status_code == 400
+
+def test_since_older_than_retention_needs_full_sync(app, client, seeded):
+    since = (datetime.utcnow() - timedelta(days=app.config['DELETION_LOG_RETENTION_DAYS'] + 1)).isoformat()
+    assert client.get('/api/spaces/', query_string={'updated_since': since}).status_code == 410
+    response = client.get('/api/bookings/', query_string={'updated_since': since},
+                          headers=auth_headers(app, seeded['admin']))
+    assert response.status_code == 410
+
+def test_prune_drops_expired_tombstones(app):
+    now = datetime.utcnow()
+    retention = timedelta(days=app.config['DELETION_LOG_RETENTION_DAYS'])
+    with app.app_context():
+        db.session.add_all([
+            DeletionLog(table_name='spaces', row_id=1, deleted_at=now - retention - timedelta(hours=1)),
+            DeletionLog(table_name='spaces', row_id=2, deleted_at=now - retention + timedelta(hours=1))
+        ])
+        db.session.commit()
+        assert prune_deletion_log(now) == 1
+        assert [row_id for row_id, in db.session.query(DeletionLog.row_id)] == [2]
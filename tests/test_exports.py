@@ -0,0 +1,24 @@
+"""
+Admin exports stream every row, and are refused where the worker would be
+killed part way through.
+"""
+import csv
+import io
+
+from conftest import auth_headers, create_user
+from app import db
+
+def test_export_csv(app, client, seeded):
+    response = client.get('/api/admin/export/bookings?format=csv', headers=auth_headers(app, seeded['admin']))
+    assert response.status_code == 200
+    rows = list(csv.DictReader(io.StringIO(response.get_data(as_text=True))))
+    assert len(rows) == len(seeded['spaces']) * len(seeded['clients'])
+
+def test_export_disabled(make_app):
+    app = make_app(EXPORTS_ENABLED=False)
+    with app.app_context():
+        admin = create_user('admin')
+        db.session.commit()
+        admin_id = admin.id
+    response = app.test_client().get('/api/admin/export/bookings', headers=auth_headers(app, admin_id))
+    assert response.status_code == 503
@@ -0,0 +1,14 @@
+"""
+/metrics is hidden unless a bearer token is configured.
+"""
+
+def test_metrics_hidden_without_token(client):
+    assert client.get('/metrics').status_code == 404
+
+def test_metrics_require_token(make_app):
+    client = make_app(METRICS_AUTH_TOKEN='secret').test_client()
+    assert client.get('/metrics').status_code == 401
+    assert client.get('/metrics', headers={'Authorization': 'Bearer wrong'}).status_code == 401
+    response = client.get('/metrics', headers={'Authorization': 'Bearer secret'})
+    assert response.status_code == 200
+    assert b'http_request' in response.data
@@ -0,0 +1,35 @@
+"""
+Owners and authors can act on their own rows.
+
+The JWT identity is the user id as a string, so comparing it with an integer
+column without converting it locks every non-admin user out.
+"""
+from conftest import auth_headers
+from app import db
+from app.models.review import Review
+
+def test_owner_updates_own_space(app, client, seeded):
+    headers = auth_headers(app, seeded['owners'][0])
+    response = client.put(f"/api/spaces/{seeded['spaces'][0]}", json={'name': 'Renamed'}, headers=headers)
+    assert response.status_code == 200
+
+def test_owner_cannot_update_other_space(app, client, seeded):
+    headers = auth_headers(app, seeded['owners'][1])
+    response = client.put(f"/api/spaces/{seeded['spaces'][0]}", json={'name': 'Renamed'}, headers=headers)
+    assert response.status_code == 403
+
+def test_author_updates_and_deletes_own_review(app, client, seeded):
+    with app.app_context():
+        review_id = db.session.query(Review.id).filter_by(user_id=seeded['clients'][0]).first()[0]
+    headers = auth_headers(app, seeded['clients'][0])
+    response = client.put(f'/api/reviews/{review_id}', json={'rating': 5}, headers=headers)
+    assert response.status_code == 200
+    response = client.delete(f'/api/reviews/{review_id}', headers=headers)
+    assert response.status_code == 200
+
+def test_user_reads_own_profile(app, client, seeded):
+    user_id = seeded['clients'][0]
+    response = client.get(f'/api/users/{user_id}', headers=auth_headers(app, user_id))
+    assert response.status_code == 200
+    response = client.get(f"/api/users/{seeded['clients'][1]}", headers=auth_headers(app, user_id))
+    assert response.status_code == 403
@@ -0,0 +1,50 @@
+"""
+Query budgets for the hot endpoints.
+
+The seeded data has several rows per table, so a query issued per space,
+booking or image pushes a request over its budget and fails the test.
+"""
+import pytest
+
+from conftest import auth_headers
+
+def test_list_spaces(client, seeded, query_budget):
+    # count, page of spaces, images of the page
+    with query_budget(3):
+        response = client.get('/api/spaces/')
+    assert response.status_code == 200
+    assert len(response.get_json()['spaces']) == len(seeded['spaces'])
+
+def test_list_spaces_card_view(client, seeded, query_budget):
+    with query_budget(2):
+        response = client.get('/api/spaces/?view=card')
+    assert response.status_code == 200
+
+def test_list_spaces_with_images_field(client, seeded, query_budget):
+    with query_budget(3):
+        response = client.get('/api/spaces/?fields=id,name,images')
+    assert response.status_code == 200
+
+def test_get_space(client, seeded, query_budget):
+    # ETag validator, space, images
+    with query_budget(3):
+        response = client.get(f"/api/spaces/{seeded['spaces'][0]}")
+    assert response.status_code == 200
+    assert len(response.get_json()['images']) == 2
+
+@pytest.mark.parametrize('role', ['admin', 'owners', 'clients'])
+def test_list_bookings(app, client, seeded, query_budget, role):
+    user_id = seeded[role] if role == 'admin' else seeded[role][0]
+    headers = auth_headers(app, user_id)
+    # current user, bookings
+    with query_budget(2):
+        response = client.get('/api/bookings/', headers=headers)
+    assert response.status_code == 200
+    assert response.get_json()
+
+def test_admin_stats(app, client, seeded, query_budget):
+    headers = auth_headers(app, seeded['admin'])
+    # current user, three counts, payments
+    with query_budget(5):
+        response = client.get('/api/admin/stats', headers=headers)
+    assert response.status_code == 200
@@ -0,0 +1,12 @@
+"""Every hot-path query from benchmarks/query_plans.py must use its index."""
+from benchmarks.query_plans import explain, hot_queries
+from app import db
+
+def test_hot_queries_use_their_indexes(app):
+    missing = []
+    with app.app_context(), db.engine.connect() as connection:
+        for description, index, statement in hot_queries():
+            plan = explain(connection, statement)
+            if index not in plan:
+                missing.append(f'{description}: expected {index}\n  {plan}')
+    assert not missing, 'Queries missing their index:\n' + '\n'.join(missing)
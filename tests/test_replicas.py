@@ -0,0 +1,100 @@
+"""
+Read routing between a primary and one replica, both SQLite files.
+
+The replica is a copy of the primary whose space name differs, so each
+response shows which database served it.
+"""
+import pytest
+from flask import g
+from sqlalchemy import insert, select, update
+
+from conftest import auth_headers, create_user
+from app import db
+from app.models.space import Space
+from app.utils.http_cache import cache_control
+from app.utils.replicas import ReplicaSet
+
+PRIMARY_NAME = 'Primary copy'
+REPLICA_NAME = 'Replica copy'
+
+@pytest.fixture
+def replica_app(make_app, tmp_path):
+    return make_app(SQLALCHEMY_REPLICA_URIS=[f"sqlite:///{tmp_path / 'replica.db'}"])
+
+@pytest.fixture
+def ids(replica_app):
+    """Seed the primary, copy it to the replica and rename the replica's space."""
+    with replica_app.app_context():
+        admin = create_user('admin')
+        owner = create_user('owner')
+        space = Space(name=PRIMARY_NAME, description='A space', address='1 Test Rd', city='Nairobi',
+                      price_per_hour=100.0, capacity=10, owner_id=owner.id)
+        db.session.add(space)
+        db.session.commit()
+        ids = {'admin': admin.id, 'space': space.id}
+
+        primary, replica = db.engines[None], db.engines['replica_0']
+        db.metadata.create_all(replica)
+        with primary.connect() as source, replica.begin() as target:
+            for table in db.metadata.sorted_tables:
+                rows = [row._asdict() for row in source.execute(select(table))]
+                if rows:
+                    target.execute(insert(table), rows)
+            target.execute(update(Space.__table__).values(name=REPLICA_NAME))
+    return ids
+
+def space_names(client, **kwargs):
+    response = client.get('/api/spaces/', **kwargs)
+    assert response.status_code == 200
+    return [space['name'] for space in response.get_json()['spaces']]
+
+def stored_name(app, bind_key, space_id):
+    with app.app_context():
+        with db.engines[bind_key].connect() as connection:
+            return connection.execute(
+                select(Space.__table__.c.name).where(Space.__table__.c.id == space_id)
+            ).scalar()
+
+def test_get_reads_from_replica(replica_app, ids):
+    assert space_names(replica_app.test_client()) == [REPLICA_NAME]
+
+def test_write_goes_to_primary_and_writer_sticks(replica_app, ids):
+    headers = auth_headers(replica_app, ids['admin'])
+    writer = replica_app.test_client()
+    response = writer.put(f"/api/spaces/{ids['space']}", json={'name': 'Renamed'}, headers=headers)
+    assert response.status_code == 200
+    assert stored_name(replica_app, None, ids['space']) == 'Renamed'
+    assert stored_name(replica_app, 'replica_0', ids['space']) == REPLICA_NAME
+
+    # Sticky by cookie, by user id without the cookie, and not for anyone else
+    assert space_names(writer, headers=headers) == ['Renamed']
+    assert space_names(replica_app.test_client(), headers=headers) == ['Renamed']
+    assert space_names(replica_app.test_client()) == [REPLICA_NAME]
+
+def test_lagging_replica_is_skipped(replica_app, ids, monkeypatch):
+    monkeypatch.setattr(ReplicaSet, 'replica_lag', lambda self, engine: self.max_lag + 1)
+    assert space_names(replica_app.test_client()) == [PRIMARY_NAME]
+
+def test_cache_miss_reads_from_primary(replica_app, ids):
+    # A lagging replica must not fill the cache with rows from before a write
+    response = replica_app.test_client().get(f"/api/spaces/{ids['space']}")
+    assert response.status_code == 200
+    assert response.get_json()['name'] == PRIMARY_NAME
+
+def test_sticky_cookie_is_never_public(replica_app, ids):
+    # A GET that writes sets the sticky cookie; shared caches must not store it
+    @cache_control(max_age=60)
+    def touch_space():
+        g.db_wrote = True
+        return {}
+    replica_app.add_url_rule('/test/touch', 'touch_space', touch_space)
+
+    response = replica_app.test_client().get('/test/touch')
+    assert 'Set-Cookie' in response.headers
+    assert response.headers['Cache-Control'] == 'private, no-cache'
+
+def test_delta_reads_from_primary(replica_app, ids):
+    # A mark handed out over a lagging replica would skip the rows it lacks
+    response = replica_app.test_client().get('/api/spaces/?updated_since=1970-01-01')
+    assert response.status_code == 200
+    assert [space['name'] for space in response.get_json()['spaces']] == [PRIMARY_NAME]